@@ -1,7 +1,7 @@
-from django.contrib.humanize.templatetags.humanize import naturaltime
 from django.db import IntegrityError
 from rest_framework import serializers
 from .models import Approval
+from craft_api.serializers import TimestampField
 
 
 class ApprovalSerializer(serializers.ModelSerializer):
@@ -12,14 +12,11 @@ class ApprovalSerializer(serializers.ModelSerializer):
     """
     owner = serializers.ReadOnlyField(source='owner.username')
     approved_profile = serializers.SerializerMethodField()
-    created_on = serializers.SerializerMethodField()
+    created_on = TimestampField()
 
     def get_approved_profile(self, obj):
         return obj.profile.owner.username
 
-    def get_created_on(self, obj):
-        return naturaltime(obj.created_on)
-
     class Meta:
         model = Approval
         fields = [
@@ -1,13 +1,26 @@
+from django.db.models import Count, Max
 from rest_framework import generics, permissions, filters, serializers
 from django_filters.rest_framework import DjangoFilterBackend
 from craft_api.permissions import IsOwnerOrReadOnly
+from craft_api.conditional import (
+    ConditionalListMixin, ConditionalRetrieveMixin
+)
+from craft_api.timestamps import TimestampFormatMixin
+from craft_api.users import USERNAMES_VERSION_LABEL
 from .models import Approval
 from .serializers import ApprovalSerializer
 
 
-class ApprovalList(generics.ListCreateAPIView):
+class ApprovalList(
+        TimestampFormatMixin, ConditionalListMixin,
+        generics.ListCreateAPIView
+):
     """
     List and create approvals when logged in.
+    Supports conditional GET requests with ETag when ISO-8601
+    timestamps are requested. Approvals are never edited, so the
+    ETag changes with the filtered approvals' count and latest
+    creation, and any username change.
     """
     serializer_class = ApprovalSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
@@ -29,6 +42,11 @@ class ApprovalList(generics.ListCreateAPIView):
         'profile__owner',
         'owner',
     ]
+    validator_aggregates = {
+        'count': Count('pk'),
+        'created_on': Max('created_on'),
+    }
+    validator_versions = (USERNAMES_VERSION_LABEL,)
 
     def perform_create(self, serializer):
         if self.request.user == serializer.validated_data['profile'].owner:
@@ -38,10 +56,18 @@ class ApprovalList(generics.ListCreateAPIView):
         serializer.save(owner=self.request.user)
 
 
-class ApprovalDetail(generics.RetrieveDestroyAPIView):
+class ApprovalDetail(
+        TimestampFormatMixin, ConditionalRetrieveMixin,
+        generics.RetrieveDestroyAPIView
+):
     """
     Get an approval's details and delete it if owner by user and logged in.
+    Supports conditional GET requests with ETag when ISO-8601
+    timestamps are requested.
     """
     permission_classes = [IsOwnerOrReadOnly]
     serializer_class = ApprovalSerializer
-    queryset = Approval.objects.all()
+    queryset = Approval.objects.select_related('owner', 'profile__owner')
+    validator_fields = (
+        'created_on', 'owner__username', 'profile__owner__username',
+    )
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.22 on 2026-10-17 23:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', '-created_on', '-id'], name='comment_post_created_idx'),
+        ),
+    ]
@@ -1,6 +1,38 @@
+from django.conf import settings
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.models import User
 from posts.models import Post
+from posts.trending import removed_score_change, score_change
+from craft_api.querysets import OwnerProfileQuerySet
+
+
+class CommentQuerySet(OwnerProfileQuerySet):
+    """
+    QuerySet for the Comment model.
+    """
+    def latest_per_post(self, post_ids, count):
+        """
+        Filters to the newest 'count' comments of each of the posts,
+        ranked with ROW_NUMBER() in a subquery of the same query.
+        Window functions need SQLite 3.25 or PostgreSQL.
+        """
+        post_ids = list(post_ids)
+        if not post_ids:
+            return self.none()
+        placeholders = ', '.join(['%s'] * len(post_ids))
+        return self.filter(pk__in=RawSQL(
+            "SELECT id FROM ("
+            "SELECT id, ROW_NUMBER() OVER ("
+            "PARTITION BY post_id ORDER BY created_on DESC, id DESC"
+            f") AS position FROM {self.model._meta.db_table} "
+            f"WHERE post_id IN ({placeholders})"
+            ") ranked WHERE position <= %s",
+            post_ids + [count],
+        ))
 
 
 class Comment(models.Model):
@@ -9,6 +41,8 @@ class Comment(models.Model):
     'post' via the Post FK.
     Ordering set to '-created_on' to see the newest comment first,
     like a text conversation.
+    Indexed on (post, -created_on, -id) so a post's comment thread is
+    read in order without sorting.
     """
     owner = models.ForeignKey(User, on_delete=models.CASCADE)
     post = models.ForeignKey(Post, on_delete=models.CASCADE)
@@ -16,8 +50,46 @@ class Comment(models.Model):
     created_on = models.DateTimeField(auto_now_add=True)
     updated_on = models.DateTimeField(auto_now=True)
 
+    objects = CommentQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_on']
+        indexes = [
+            models.Index(
+                fields=['post', '-created_on', '-id'],
+                name='comment_post_created_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.content
+
+
+def increment_comments_count(sender, instance, created, **kwargs):
+    """
+    Increments the post's stored comments_count and trending_score
+    when a comment is created.
+    """
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(
+            comments_count=F('comments_count') + 1,
+            **score_change(settings.TRENDING_COMMENT_WEIGHT)
+        )
+
+
+def decrement_comments_count(sender, instance, **kwargs):
+    """
+    Decrements the post's stored comments_count and trending_score
+    when a comment is deleted, never below zero should the count have
+    drifted.
+    """
+    Post.objects.filter(pk=instance.post_id).update(
+        comments_count=Greatest(F('comments_count') - 1, 0),
+        **removed_score_change(
+            settings.TRENDING_COMMENT_WEIGHT, instance.created_on
+        )
+    )
+
+
+post_save.connect(increment_comments_count, sender=Comment)
+post_delete.connect(decrement_comments_count, sender=Comment)
@@ -1,6 +1,6 @@
-from django.contrib.humanize.templatetags.humanize import naturaltime
 from rest_framework import serializers
 from .models import Comment
+from craft_api.serializers import ImageVariantsField, TimestampField
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -9,30 +9,28 @@ class CommentSerializer(serializers.ModelSerializer):
     'is_owner' checks if the request user owns the profile.
     User 'profile_id' and 'profile_image' fields also included as read only,
     when comment list returned.
+    Timestamps are natural times unless ISO-8601 ones are requested.
     """
     owner = serializers.ReadOnlyField(source='owner.username')
     is_owner = serializers.SerializerMethodField()
     profile_id = serializers.ReadOnlyField(source='owner.profile.id')
     profile_image = serializers.ReadOnlyField(source='owner.profile.image.url')
-    created_on = serializers.SerializerMethodField()
-    updated_on = serializers.SerializerMethodField()
+    profile_image_variants = ImageVariantsField(
+        source='owner.profile.image_variants'
+    )
+    created_on = TimestampField()
+    updated_on = TimestampField()
 
     def get_is_owner(self, obj):
         request = self.context['request']
         return request.user == obj.owner
 
-    def get_created_on(self, obj):
-        return naturaltime(obj.created_on)
-
-    def get_updated_on(self, obj):
-        return naturaltime(obj.updated_on)
-
     class Meta:
         model = Comment
         fields = [
             'id', 'owner', 'post', 'content', 'created_on',
             'updated_on', 'is_owner', 'profile_id',
-            'profile_image',
+            'profile_image', 'profile_image_variants',
         ]
 
 
@@ -41,4 +39,4 @@ class CommentDetailSerializer(CommentSerializer):
     Serializer for the Comment model.
     Only used in Comment detail view.
     """
-    post = serializers.ReadOnlyField(source='post.id')
+    post = serializers.ReadOnlyField(source='post_id')
@@ -1,8 +1,11 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from ..models import Comment
 from posts.models import Post
+from craft_api.tests.mixins import QueryCountMixin
 
 
 class CommentListAPITestCase(APITestCase):
@@ -151,3 +154,101 @@ class CommentDetailTests(APITestCase):
         response = self.client.delete(f'/comments/{self.comment.id}/')
 
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class CommentQueryCountTest(QueryCountMixin, APITestCase):
+    """
+    Test case checking the comment endpoints load owner and profile
+    data in a constant number of queries.
+    """
+    def setUp(self):
+        """
+        Setup the test object instances
+        """
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpassword'
+        )
+        self.post = Post.objects.create(owner=self.user, title='Test post')
+        self.client.force_authenticate(user=self.user)
+
+    def create_comments(self, count):
+        """
+        Creates 'count' comments, each owned by a new user.
+        """
+        for _ in range(count):
+            Comment.objects.create(
+                owner=self.create_user(), post=self.post, content='comment'
+            )
+
+    def test_comment_list_query_count_is_constant(self):
+        """
+        Checks listing 8 comments costs the same queries as listing 2.
+        """
+        self.create_comments(2)
+        _, small_page = self.count_queries('/comments/')
+
+        self.create_comments(6)
+        _, full_page = self.count_queries('/comments/')
+
+        self.assertEqual(small_page, full_page)
+
+    def test_comment_detail_query_count(self):
+        """
+        Checks a comment detail with ISO-8601 timestamps and its ETag
+        are served from a single query for the comment.
+        """
+        self.create_comments(1)
+        comment = Comment.objects.get()
+
+        self.assertEqual(
+            self.count_queries(f'/comments/{comment.pk}/?timestamps=iso')[1],
+            1
+        )
+
+
+class CommentCursorPaginationTest(APITestCase):
+    """
+    Testcase for the cursor pagination mode of the CommentList view.
+    """
+    def setUp(self):
+        """
+        Set up a post with a long comment thread, and another post.
+        """
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpassword'
+        )
+        self.post = Post.objects.create(owner=self.user, title='Test post')
+        other_post = Post.objects.create(owner=self.user, title='Other')
+        for i in range(25):
+            Comment.objects.create(
+                owner=self.user, post=self.post, content=f'comment {i}'
+            )
+        Comment.objects.create(
+            owner=self.user, post=other_post, content='other comment'
+        )
+
+    def test_cursor_pagination_walks_post_thread(self):
+        """
+        Checks following the 'next' links in cursor mode returns the
+        post's comments once, newest first, with the same queries on
+        every page and no total count.
+        """
+        url = f'/comments/?post={self.post.pk}&pagination=cursor'
+        comment_ids = []
+        page_queries = set()
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            self.assertNotIn('count', response.data)
+            page_queries.add(len(context.captured_queries))
+            comment_ids += [c['id'] for c in response.data['results']]
+            url = response.data['next']
+
+        expected = list(
+            Comment.objects.filter(post=self.post)
+            .order_by('-created_on', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(comment_ids, expected)
+        self.assertEqual(len(page_queries), 1)
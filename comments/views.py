@@ -1,17 +1,35 @@
+from django.db.models import Count, Max, Q
+from django.db.models.fields.json import KeyTextTransform
 from rest_framework import generics, permissions, filters
 from django_filters.rest_framework import DjangoFilterBackend
 from craft_api.permissions import IsOwnerOrReadOnly
+from craft_api.conditional import (
+    ConditionalListMixin, ConditionalRetrieveMixin
+)
+from craft_api.pagination import PageNumberOrCursorPagination
+from craft_api.timestamps import TimestampFormatMixin
+from craft_api.users import USERNAMES_VERSION_LABEL
 from .models import Comment
 from .serializers import CommentSerializer, CommentDetailSerializer
 
 
-class CommentList(generics.ListCreateAPIView):
+class CommentList(
+        TimestampFormatMixin, ConditionalListMixin,
+        generics.ListCreateAPIView
+):
     """
     List and create comments if user is logged in.
+    Use 'pagination=cursor' with the 'post' filter to page through a
+    post's comment thread at the same cost on every page.
+    Supports conditional GET requests with ETag when ISO-8601
+    timestamps are requested. The ETag changes with the filtered
+    comments' count and latest edit, their owners' latest profile
+    edit and built image variants, and any username change.
     """
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    queryset = Comment.objects.all().order_by('-created_on')
+    pagination_class = PageNumberOrCursorPagination
+    queryset = Comment.objects.with_owner_profile().order_by('-created_on')
     filter_backends = [
         filters.OrderingFilter,
         filters.SearchFilter,
@@ -28,16 +46,37 @@ class CommentList(generics.ListCreateAPIView):
         'post',
         'post__owner',
     ]
+    validator_aggregates = {
+        'count': Count('pk'),
+        'updated_on': Max('updated_on'),
+        'profile_updated_on': Max('owner__profile__updated_on'),
+        'built_images': Count('pk', filter=Q(
+            owner__profile__image=KeyTextTransform(
+                'source', 'owner__profile__image_variants'
+            )
+        )),
+    }
+    validator_versions = (USERNAMES_VERSION_LABEL,)
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
 
-class CommentDetail(generics.RetrieveUpdateDestroyAPIView):
+class CommentDetail(
+        TimestampFormatMixin, ConditionalRetrieveMixin,
+        generics.RetrieveUpdateDestroyAPIView
+):
     """
     Display comment details, update comment data of delete it, if
     user is owner and logged in.
+    Supports conditional GET requests with ETag and Last-Modified
+    when ISO-8601 timestamps are requested.
     """
     permission_classes = [IsOwnerOrReadOnly]
     serializer_class = CommentDetailSerializer
-    queryset = Comment.objects.all()
+    queryset = Comment.objects.with_owner_profile()
+    validator_fields = (
+        'updated_on', 'owner__username', 'owner__profile__updated_on',
+        'owner__profile__image_variants',
+    )
+    last_modified_fields = ('updated_on', 'owner__profile__updated_on')
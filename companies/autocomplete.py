@@ -0,0 +1,174 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from django.apps import apps
+from django.conf import settings
+from craft_api.cache import bump_version, get_versions
+
+AUTOCOMPLETE_LIMIT = 10
+
+
+def index_keys(name, location):
+    """
+    Returns the lower case keys a company is found by: its full name
+    and location, and each word in them.
+    """
+    keys = set()
+    for text in (name, location):
+        text = (text or '').lower().strip()
+        if text:
+            keys.add(text)
+            keys.update(text.split())
+    return keys
+
+
+class CompanyAutocompleteIndex:
+    """
+    In-process prefix index of company names and locations.
+    'keys' is a sorted list of (key, company id) pairs, so the
+    companies with a key starting with a prefix are a contiguous run
+    found by bisection. 'companies' holds the id, name, location and
+    employee_count returned for each company.
+    Each process holds its own copy, loaded from the database on
+    first use and kept current by the Company and Profile signals of
+    that process. Creating, renaming or deleting a company also bumps
+    a version in the shared cache, which each process checks at most
+    every AUTOCOMPLETE_VERSION_CHECK_SECONDS, reloading its copy once
+    it changed. Employee counts changed by other processes are only
+    picked up by such a reload.
+    """
+    version_label = 'companies.autocomplete'
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """
+        Empties the index, so it is reloaded on next use.
+        """
+        self.loaded = False
+        self.version = None
+        self.checked_at = 0
+        self.keys = []
+        self.companies = {}
+
+    def current_version(self):
+        key = f'{self.version_label}:version'
+        return get_versions([key])[key]
+
+    def load(self):
+        """
+        Reads every company and sorts their keys once.
+        """
+        Company = apps.get_model('companies', 'Company')
+        self.clear()
+        self.version = self.current_version()
+        self.checked_at = time.monotonic()
+        companies = Company.objects.values(
+            'id', 'name', 'location', 'employee_count'
+        )
+        for company in companies:
+            self.companies[company['id']] = company
+            self.keys.extend(
+                (key, company['id'])
+                for key in index_keys(company['name'], company['location'])
+            )
+        self.keys.sort()
+        self.loaded = True
+
+    def refresh(self):
+        """
+        Loads the index if it is not loaded, or if another process
+        changed the companies since the last version check.
+        """
+        if not self.loaded:
+            self.load()
+            return
+        now = time.monotonic()
+        interval = settings.AUTOCOMPLETE_VERSION_CHECK_SECONDS
+        if now - self.checked_at < interval:
+            return
+        self.checked_at = now
+        if self.current_version() != self.version:
+            self.load()
+
+    def add(self, company):
+        self.companies[company['id']] = company
+        for key in index_keys(company['name'], company['location']):
+            insort(self.keys, (key, company['id']))
+
+    def discard(self, company_id):
+        company = self.companies.pop(company_id, None)
+        if company is None:
+            return None
+        for key in index_keys(company['name'], company['location']):
+            position = bisect_left(self.keys, (key, company_id))
+            if self.keys[position:position + 1] == [(key, company_id)]:
+                del self.keys[position]
+        return company
+
+    def invalidate(self):
+        """
+        Marks the other processes' indexes stale.
+        """
+        bump_version(self.version_label)
+
+    def update_company(self, company, renamed):
+        """
+        Adds or re-indexes a saved Company. 'renamed' is True when it
+        was created or its name or location changed, which other
+        processes must reload for.
+        """
+        with self.lock:
+            if self.loaded:
+                previous = self.discard(company.pk)
+                self.add({
+                    'id': company.pk,
+                    'name': company.name,
+                    'location': company.location,
+                    'employee_count': (
+                        previous['employee_count'] if previous else 0
+                    ),
+                })
+        if renamed:
+            self.invalidate()
+
+    def remove_company(self, company_id):
+        with self.lock:
+            self.discard(company_id)
+        self.invalidate()
+
+    def change_employee_count(self, company_id, change):
+        with self.lock:
+            company = self.companies.get(company_id)
+            if company is not None:
+                company['employee_count'] += change
+
+    def search(self, prefix, limit=AUTOCOMPLETE_LIMIT):
+        """
+        Returns up to 'limit' companies with a name, location or word
+        starting with 'prefix', most employees first.
+        """
+        prefix = prefix.lower().strip()
+        if not prefix:
+            return []
+        with self.lock:
+            self.refresh()
+            matches = set()
+            position = bisect_left(self.keys, (prefix,))
+            while position < len(self.keys):
+                key, company_id = self.keys[position]
+                if not key.startswith(prefix):
+                    break
+                matches.add(company_id)
+                position += 1
+            companies = [dict(self.companies[pk]) for pk in matches]
+        return heapq.nsmallest(limit, companies, key=lambda company: (
+            -company['employee_count'], company['name'].lower(),
+            company['id'],
+        ))
+
+
+autocomplete_index = CompanyAutocompleteIndex()
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from companies.models import Company, CompanyFacet
+
+
+def rebuild_company_facets(company_model, facet_model):
+    """
+    Replaces every CompanyFacet row with counts aggregated from the
+    Company and Profile tables.
+    Returns the number of facet rows created.
+    """
+    facets = []
+    for dimension in ('location', 'type'):
+        counts = company_model.objects.exclude(
+            **{f'{dimension}__isnull': True}
+        ).exclude(
+            **{dimension: ''}
+        ).order_by().values_list(dimension).annotate(count=Count('pk'))
+        facets += [
+            facet_model(dimension=dimension, value=value, count=count)
+            for value, count in counts
+        ]
+    employees = company_model.objects.annotate(
+        count=Count('current_employee')
+    ).filter(count__gt=0).order_by().values_list('pk', 'count')
+    facets += [
+        facet_model(dimension='employer', value=str(pk), count=count)
+        for pk, count in employees
+    ]
+    facet_model.objects.all().delete()
+    facet_model.objects.bulk_create(facets, batch_size=500)
+    return len(facets)
+
+
+class Command(BaseCommand):
+    """
+    Backfills or repairs the CompanyFacet rollup from the Company and
+    Profile tables.
+    """
+    help = 'Rebuild the company location, type and employer facets.'
+
+    def handle(self, *args, **options):
+        created = rebuild_company_facets(Company, CompanyFacet)
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {created} company facets.')
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.22 on 2026-10-17 23:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_company_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='updated_on',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
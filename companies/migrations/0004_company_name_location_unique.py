@@ -0,0 +1,53 @@
+# Generated by Django 3.2.22 on 2026-10-17 23:31
+
+from django.db import migrations
+from django.db.models.functions import Lower
+
+
+def merge_duplicate_companies(apps, schema_editor):
+    """
+    Merges companies sharing a name and location, ignoring case, into
+    the oldest of them, moving their employees over, so the unique
+    index can be created.
+    Names are lowered by the database, as the index does.
+    """
+    Company = apps.get_model('companies', 'Company')
+    Profile = apps.get_model('profiles', 'Profile')
+    kept = {}
+    duplicates = {}
+    rows = Company.objects.annotate(
+        lower_name=Lower('name'), lower_location=Lower('location')
+    ).order_by('pk').values_list('pk', 'lower_name', 'lower_location')
+    for pk, name, location in rows:
+        keep = kept.setdefault((name, location), pk)
+        if keep != pk:
+            duplicates.setdefault(keep, []).append(pk)
+    for keep, pks in duplicates.items():
+        Profile.objects.filter(employer__in=pks).update(employer=keep)
+        Company.objects.filter(pk__in=pks).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0003_company_updated_on'),
+        ('profiles', '0002_profile_employer'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            merge_duplicate_companies, migrations.RunPython.noop
+        ),
+        # Django 3.2 has no expression based UniqueConstraint, so the
+        # case insensitive index is created in SQL and is not part of
+        # the model state. SQLite drops it whenever a later migration
+        # rebuilds companies_company, e.g. to add or alter a column,
+        # and that migration must create it again, as 0006 does.
+        # Replace it with UniqueConstraint(Lower('name'),
+        # Lower('location')) once on Django 4.0 or later.
+        migrations.RunSQL(
+            'CREATE UNIQUE INDEX company_name_location_uniq '
+            'ON companies_company (LOWER(name), LOWER(location))',
+            'DROP INDEX company_name_location_uniq',
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 3.2.22 on 2026-10-17 23:36
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_facets(apps, schema_editor):
+    """
+    Counts the companies by location and type, and the employees of
+    each company, as the rebuild_company_facets command does.
+    """
+    Company = apps.get_model('companies', 'Company')
+    CompanyFacet = apps.get_model('companies', 'CompanyFacet')
+    Profile = apps.get_model('profiles', 'Profile')
+    facets = []
+    for dimension in ('location', 'type'):
+        counts = Company.objects.exclude(
+            **{f'{dimension}__isnull': True}
+        ).exclude(
+            **{dimension: ''}
+        ).order_by().values_list(dimension).annotate(count=Count('pk'))
+        facets += [
+            CompanyFacet(dimension=dimension, value=value, count=count)
+            for value, count in counts
+        ]
+    employees = Profile.objects.exclude(
+        employer=None
+    ).order_by().values_list('employer').annotate(count=Count('pk'))
+    facets += [
+        CompanyFacet(dimension='employer', value=str(pk), count=count)
+        for pk, count in employees
+    ]
+    CompanyFacet.objects.bulk_create(facets, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0004_company_name_location_unique'),
+        ('profiles', '0002_profile_employer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('location', 'Location'), ('type', 'Type'), ('employer', 'Employer')], max_length=10)),
+                ('value', models.CharField(max_length=100)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['dimension', '-count', 'value'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='companyfacet',
+            index=models.Index(fields=['dimension', '-count', 'value'], name='facet_dimension_count_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='companyfacet',
+            unique_together={('dimension', 'value')},
+        ),
+        migrations.RunPython(backfill_facets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 3.2.22 on 2026-10-17 23:39
+
+from django.db import migrations, models
+from django.db.models import F, Func, OuterRef, Subquery
+
+
+def backfill_employee_count(apps, schema_editor):
+    Company = apps.get_model('companies', 'Company')
+    Profile = apps.get_model('profiles', 'Profile')
+    employees = Profile.objects.filter(employer=OuterRef('pk'))
+    Company.objects.update(employee_count=Subquery(
+        employees.order_by().annotate(
+            count=Func(F('pk'), function='COUNT')
+        ).values('count')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0005_companyfacet'),
+        ('profiles', '0002_profile_employer'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='employee_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['employee_count'], name='company_employee_count_idx'),
+        ),
+        migrations.RunPython(
+            backfill_employee_count, migrations.RunPython.noop
+        ),
+        # SQLite rebuilds the table to add the column, dropping the
+        # index from 0004 which is not part of the model state.
+        migrations.RunSQL(
+            'CREATE UNIQUE INDEX IF NOT EXISTS company_name_location_uniq '
+            'ON companies_company (LOWER(name), LOWER(location))',
+            migrations.RunSQL.noop,
+        ),
+    ]
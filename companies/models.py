@@ -1,5 +1,9 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.contrib.auth.models import User
+from .autocomplete import autocomplete_index
 
 
 class Company(models.Model):
@@ -7,15 +11,211 @@ class Company(models.Model):
     Company model, related to 'owner' via the User FK.
     Ordering set to 'name' to enable easy searching
     when in list view.
+    'employee_count' is the number of profiles employed by the
+    company, kept current by the Profile signals below.
+    'name' and 'location' are unique together, ignoring case, by the
+    company_name_location_uniq index. It is created in SQL, so a
+    migration which rebuilds the table on SQLite must recreate it.
     """
     name = models.CharField(max_length=100)
     owner = models.ForeignKey(User, on_delete=models.CASCADE)
     location = models.CharField(max_length=100, blank=True)
     type = models.CharField(max_length=100, blank=True, null=True)
     created_on = models.DateTimeField(auto_now_add=True)
+    updated_on = models.DateTimeField(auto_now=True)
+    employee_count = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ['name']
+        indexes = [
+            models.Index(
+                fields=['employee_count'], name='company_employee_count_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        """
+        Saves an existing company without writing 'employee_count',
+        which is only changed by F() updates from the Profile signals.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'employee_count'
+            ]
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Records the name, location and type a company was loaded with,
+        so changes to them can be told apart on save.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_facets = facet_values(instance)
+        instance.loaded_name_location = (instance.name, instance.location)
+        return instance
+
+
+class CompanyFacet(models.Model):
+    """
+    CompanyFacet model, a rollup row counting the companies with a
+    'location' or 'type' value, or the employees of the company whose
+    id is the 'employer' value.
+    Kept current by the Company and Profile signals below.
+    """
+    LOCATION = 'location'
+    TYPE = 'type'
+    EMPLOYER = 'employer'
+    DIMENSIONS = [
+        (LOCATION, 'Location'),
+        (TYPE, 'Type'),
+        (EMPLOYER, 'Employer'),
+    ]
+    dimension = models.CharField(max_length=10, choices=DIMENSIONS)
+    value = models.CharField(max_length=100)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['dimension', '-count', 'value']
+        unique_together = ['dimension', 'value']
+        indexes = [
+            models.Index(
+                fields=['dimension', '-count', 'value'],
+                name='facet_dimension_count_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension} {self.value}: {self.count}"
+
+
+def facet_values(company):
+    """
+    Returns the (dimension, value) facets a company counts towards.
+    Blank locations and types are not counted.
+    """
+    facets = set()
+    if company.location:
+        facets.add((CompanyFacet.LOCATION, company.location))
+    if company.type:
+        facets.add((CompanyFacet.TYPE, company.type))
+    return facets
+
+
+def change_facet(dimension, value, change):
+    """
+    Adds 'change' to the count of a facet, creating it if needed and
+    deleting it once its count reaches zero.
+    """
+    facets = CompanyFacet.objects.filter(dimension=dimension, value=value)
+    if change > 0:
+        CompanyFacet.objects.bulk_create(
+            [CompanyFacet(dimension=dimension, value=value)],
+            ignore_conflicts=True,
+        )
+        facets.update(count=F('count') + change)
+    else:
+        facets.filter(count__gt=0).update(count=F('count') + change)
+        facets.filter(count__lte=0).delete()
+
+
+def company_facets_changed(sender, instance, created, **kwargs):
+    """
+    Moves a saved company between the location and type facets it
+    was loaded with and its current ones.
+    """
+    if not created and not hasattr(instance, 'loaded_facets'):
+        return
+    previous = getattr(instance, 'loaded_facets', set())
+    current = facet_values(instance)
+    for dimension, value in previous - current:
+        change_facet(dimension, value, -1)
+    for dimension, value in current - previous:
+        change_facet(dimension, value, 1)
+    instance.loaded_facets = current
+
+
+def company_facets_deleted(sender, instance, **kwargs):
+    """
+    Removes a deleted company from its facets, and drops its employer
+    facet as its employees' employer is cleared.
+    """
+    for dimension, value in facet_values(instance):
+        change_facet(dimension, value, -1)
+    CompanyFacet.objects.filter(
+        dimension=CompanyFacet.EMPLOYER, value=str(instance.pk)
+    ).delete()
+
+
+def change_employee_count(company_id, change):
+    """
+    Adds 'change' to a company's stored, indexed and faceted employee
+    counts, never letting the stored count drop below zero.
+    """
+    Company.objects.filter(pk=company_id).update(
+        employee_count=Greatest(F('employee_count') + change, 0)
+    )
+    autocomplete_index.change_employee_count(company_id, change)
+    change_facet(CompanyFacet.EMPLOYER, str(company_id), change)
+
+
+def record_name_location_change(sender, instance, **kwargs):
+    """
+    Sets 'name_location_changed' on a company before it is saved, for
+    the save signals, and records its new name and location.
+    """
+    current = (instance.name, instance.location)
+    instance.name_location_changed = (
+        getattr(instance, 'loaded_name_location', None) != current
+    )
+    instance.loaded_name_location = current
+
+
+def index_company(sender, instance, created, **kwargs):
+    """
+    Adds or re-indexes a saved company in the autocomplete index.
+    """
+    autocomplete_index.update_company(
+        instance, created or instance.name_location_changed
+    )
+
+
+def unindex_company(sender, instance, **kwargs):
+    """
+    Removes a deleted company from the autocomplete index.
+    """
+    autocomplete_index.remove_company(instance.pk)
+
+
+def employer_changed(sender, instance, created, **kwargs):
+    """
+    Moves a profile between its old and new employer's employee
+    counts, using the employer it was loaded with.
+    """
+    if not created and not hasattr(instance, 'loaded_employer_id'):
+        return
+    previous = getattr(instance, 'loaded_employer_id', None)
+    if previous != instance.employer_id:
+        if previous is not None:
+            change_employee_count(previous, -1)
+        if instance.employer_id is not None:
+            change_employee_count(instance.employer_id, 1)
+    instance.loaded_employer_id = instance.employer_id
+
+
+def employee_deleted(sender, instance, **kwargs):
+    if instance.employer_id is not None:
+        change_employee_count(instance.employer_id, -1)
+
+
+pre_save.connect(record_name_location_change, sender=Company)
+post_save.connect(index_company, sender=Company)
+post_delete.connect(unindex_company, sender=Company)
+post_save.connect(company_facets_changed, sender=Company)
+post_delete.connect(company_facets_deleted, sender=Company)
+post_save.connect(employer_changed, sender='profiles.Profile')
+post_delete.connect(employee_deleted, sender='profiles.Profile')
@@ -1,7 +1,9 @@
+from io import StringIO
+from django.core.management import call_command
 from django.test import TestCase
 from rest_framework import status
 from django.contrib.auth.models import User
-from ..models import Company
+from ..models import Company, CompanyFacet
 
 
 class CompanyModelTest(TestCase):
@@ -60,3 +62,46 @@ class CompanyModelTest(TestCase):
 
         company = Company.objects.get(name='Testing Co')
         self.assertEqual(company.owner, self.user)
+
+    def test_employee_count_follows_profile_employer(self):
+        """
+        Checks the stored employee_count changes as profiles join and
+        leave the company, or are deleted.
+        """
+        employee = User.objects.create_user(
+            username='employee', password='testpassword'
+        )
+        employee.profile.employer = self.company
+        employee.profile.save()
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.employee_count, 1)
+
+        self.company.name = 'Renamed Company'
+        self.company.save()
+        self.user.profile.employer = self.company
+        self.user.profile.save()
+        employee.delete()
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.employee_count, 1)
+
+        self.user.profile.employer = None
+        self.user.profile.save()
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.employee_count, 0)
+
+    def test_rebuild_company_facets_command(self):
+        """
+        Checks the rebuild_company_facets command repairs drifted and
+        missing facet rows.
+        """
+        CompanyFacet.objects.all().delete()
+        CompanyFacet.objects.create(dimension='location', value='Gone')
+
+        call_command('rebuild_company_facets', stdout=StringIO())
+
+        self.assertEqual(
+            set(CompanyFacet.objects.values_list(
+                'dimension', 'value', 'count'
+            )),
+            {('location', 'Test Location', 1), ('type', 'Test Type', 1)}
+        )
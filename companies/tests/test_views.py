@@ -1,7 +1,15 @@
+from types import SimpleNamespace
+from unittest.mock import patch
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status, serializers
 from django.contrib.auth.models import User
+from django.db import IntegrityError, connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from ..models import Company
+from ..views import CompanyList
+from craft_api.cache import bump_version
+from ..autocomplete import autocomplete_index
 
 
 class CompanyListTests(APITestCase):
@@ -103,6 +111,56 @@ class CompanyListTests(APITestCase):
         )
 
 
+    def test_duplicate_check_ignores_case(self):
+        """
+        Checks a company differing only in case is a duplicate, and the
+        database index rejects one created directly.
+        """
+        Company.objects.create(
+            name='Test Company', location='Test Location', owner=self.user
+            )
+        data = {'name': 'TEST company', 'location': 'test location'}
+        response = self.client.post('/companies/', data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Company.objects.create(
+                name='test company', location='TEST LOCATION', owner=self.user
+                )
+
+    def test_validate_company_is_one_query(self):
+        """
+        Checks the owner's company count and duplicates are checked in
+        a single query.
+        """
+        view = CompanyList()
+        view.request = SimpleNamespace(user=self.user)
+
+        with CaptureQueriesContext(connection) as context:
+            view.validate_company('New Company', 'New Location')
+
+        self.assertEqual(len(context.captured_queries), 1)
+
+    def test_duplicate_rejected_by_index_returns_error_message(self):
+        """
+        Checks a duplicate which slips past validation, as a concurrent
+        create would, gets the duplicate company error.
+        """
+        Company.objects.create(
+            name='Test Company', location='Test Location', owner=self.user
+            )
+        data = {'name': 'Test Company', 'location': 'Test Location'}
+        with patch.object(CompanyList, 'validate_company'):
+            response = self.client.post('/companies/', data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            str(response.data[0]),
+            "A company with the title 'Test Company'"
+            " and location 'Test Location' already exists."
+        )
+
+
 class CompanyDetailTests(APITestCase):
     """
     TestCase for CompanyDetail view, include:
@@ -172,3 +230,206 @@ class CompanyDetailTests(APITestCase):
             )
         response = self.client.delete(f'/companies/{self.company.id}/')
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_update_to_duplicate_company_rejected(self):
+        """
+        Checks updating a company to another's name and location
+        returns a 400_BAD_REQUEST.
+        """
+        Company.objects.create(
+            name='Other Company', location='Test Location', owner=self.user
+            )
+
+        response = self.client.patch(
+            f'/companies/{self.company.id}/', {'name': 'other company'}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CompanyAutocompleteTests(APITestCase):
+    """
+    TestCase for the CompanyAutocomplete view and its index.
+    """
+    def setUp(self):
+        """
+        Set up companies in an empty, unloaded index.
+        """
+        autocomplete_index.clear()
+        self.user = User.objects.create_user(
+            username='testuser', password='testpassword'
+            )
+        self.oak = Company.objects.create(
+            name='Oak Workshop', location='Leeds', owner=self.user
+            )
+        self.oakley = Company.objects.create(
+            name='Oakley Joinery', location='York', owner=self.user
+            )
+        Company.objects.create(
+            name='Pine Studio', location='Oakham', owner=self.user
+            )
+        self.user.profile.employer = self.oakley
+        self.user.profile.save()
+
+    def search(self, text):
+        """
+        Returns the names of the companies found for 'text'.
+        """
+        response = self.client.get('/companies/autocomplete/', {'q': text})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [company['name'] for company in response.data]
+
+    def test_autocomplete_matches_name_and_location_prefixes(self):
+        """
+        Checks prefixes of names, locations and their words match, most
+        employees first, without a database query once loaded.
+        """
+        self.search('oak')
+
+        with CaptureQueriesContext(connection) as context:
+            names = self.search('oak')
+
+        self.assertEqual(len(context.captured_queries), 0)
+        self.assertEqual(
+            names, ['Oakley Joinery', 'Oak Workshop', 'Pine Studio']
+        )
+        self.assertEqual(self.search('join'), ['Oakley Joinery'])
+        self.assertEqual(self.search('lee'), ['Oak Workshop'])
+
+    def test_autocomplete_follows_company_and_employer_changes(self):
+        """
+        Checks renamed and deleted companies and employee moves are
+        reflected in the index.
+        """
+        self.search('oak')
+
+        self.oak.name = 'Elm Workshop'
+        self.oak.save()
+        self.assertEqual(self.search('elm'), ['Elm Workshop'])
+        self.assertNotIn('Elm Workshop', self.search('oak'))
+
+        profile = User.objects.get(pk=self.user.pk).profile
+        profile.employer = self.oak
+        profile.save()
+        response = self.client.get('/companies/autocomplete/', {'q': 'elm'})
+        self.assertEqual(response.data[0]['employee_count'], 1)
+
+        self.oakley.delete()
+        self.assertEqual(self.search('york'), [])
+
+    @override_settings(AUTOCOMPLETE_VERSION_CHECK_SECONDS=0)
+    def test_autocomplete_reloads_after_another_process_writes(self):
+        """
+        Checks a change which only bumped the shared version, as one
+        made in another process does, is served on the next search.
+        """
+        self.search('oak')
+
+        Company.objects.filter(pk=self.oak.pk).update(name='Elm Workshop')
+        bump_version(autocomplete_index.version_label)
+
+        self.assertEqual(self.search('elm'), ['Elm Workshop'])
+
+    @override_settings(AUTOCOMPLETE_VERSION_CHECK_SECONDS=60)
+    def test_autocomplete_checks_version_once_per_interval(self):
+        """
+        Checks the shared version is not read again within the check
+        interval.
+        """
+        self.search('oak')
+
+        Company.objects.filter(pk=self.oak.pk).update(name='Elm Workshop')
+        bump_version(autocomplete_index.version_label)
+
+        self.assertEqual(self.search('elm'), [])
+
+    def test_employer_changes_keep_other_indexes_loaded(self):
+        """
+        Checks employee moves and company edits keeping the name and
+        location update the index without bumping the shared version.
+        """
+        self.search('oak')
+        version = autocomplete_index.current_version()
+
+        self.user.profile.employer = self.oak
+        self.user.profile.save()
+        self.oak.type = 'Joinery'
+        self.oak.save()
+
+        self.assertEqual(autocomplete_index.current_version(), version)
+        self.assertEqual(
+            self.search('oak'),
+            ['Oak Workshop', 'Oakley Joinery', 'Pine Studio']
+        )
+
+
+class CompanyFacetsTests(APITestCase):
+    """
+    TestCase for the CompanyFacets view and the rollup behind it.
+    """
+    def setUp(self):
+        """
+        Set up companies across two locations, one with an employee.
+        """
+        self.user = User.objects.create_user(
+            username='testuser', password='testpassword'
+            )
+        self.leeds = Company.objects.create(
+            name='Oak Workshop', location='Leeds', type='Joinery',
+            owner=self.user
+            )
+        Company.objects.create(
+            name='Elm Workshop', location='Leeds', owner=self.user
+            )
+        self.york = Company.objects.create(
+            name='Ash Workshop', location='York', type='Joinery',
+            owner=self.user
+            )
+        self.user.profile.employer = self.leeds
+        self.user.profile.save()
+
+    def get_facets(self):
+        """
+        Returns the facets response data.
+        """
+        response = self.client.get('/companies/facets/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_facets_count_companies_and_employees(self):
+        """
+        Checks companies are counted per location and type, and
+        employees per company, with one query per dimension.
+        """
+        with CaptureQueriesContext(connection) as context:
+            facets = self.get_facets()
+
+        self.assertEqual(len(context.captured_queries), 3)
+        self.assertEqual(facets['location'], [
+            {'value': 'Leeds', 'count': 2}, {'value': 'York', 'count': 1},
+        ])
+        self.assertEqual(facets['type'], [{'value': 'Joinery', 'count': 2}])
+        self.assertEqual(
+            facets['employer'], [{'value': self.leeds.pk, 'count': 1}]
+        )
+
+    def test_facets_follow_company_and_employer_changes(self):
+        """
+        Checks moving and deleting companies and employees updates the
+        facet counts.
+        """
+        company = Company.objects.get(pk=self.york.pk)
+        company.location = 'Leeds'
+        company.type = ''
+        company.save()
+        profile = User.objects.get(pk=self.user.pk).profile
+        profile.employer = company
+        profile.save()
+        self.leeds.delete()
+
+        facets = self.get_facets()
+        self.assertEqual(facets['location'], [{'value': 'Leeds', 'count': 2}])
+        self.assertEqual(facets['type'], [])
+        self.assertEqual(
+            facets['employer'], [{'value': company.pk, 'count': 1}]
+        )
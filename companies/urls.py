@@ -3,5 +3,7 @@ from companies import views
 
 urlpatterns = [
     path('companies/', views.CompanyList.as_view()),
+    path('companies/autocomplete/', views.CompanyAutocomplete.as_view()),
+    path('companies/facets/', views.CompanyFacets.as_view()),
     path('companies/<int:pk>/', views.CompanyDetail.as_view()),
 ]
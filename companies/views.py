@@ -1,14 +1,41 @@
-from django.db.models import Count
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, Value
+from django.db.models.functions import Lower
 from rest_framework import (
     serializers,
     permissions,
     generics,
     filters
 )
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Company
+from .models import Company, CompanyFacet
+from .autocomplete import autocomplete_index, AUTOCOMPLETE_LIMIT
 from .serializers import CompanySerializer
 from craft_api.permissions import IsOwnerOrReadOnly
+from craft_api.conditional import ConditionalRetrieveMixin
+
+
+def matching_companies(company_title, company_location):
+    """
+    Returns the companies with the title and location, ignoring case
+    as the company_name_location_uniq index does.
+    """
+    return Company.objects.annotate(
+        name_lower=Lower('name'), location_lower=Lower('location')
+    ).filter(
+        name_lower=Lower(Value(company_title)),
+        location_lower=Lower(Value(company_location)),
+    )
+
+
+def duplicate_company_error(company_title, company_location):
+    return serializers.ValidationError(
+        f"A company with the title '{company_title}'"
+        f" and location '{company_location}' already exists."
+    )
 
 
 class CompanyList(generics.ListCreateAPIView):
@@ -19,9 +46,7 @@ class CompanyList(generics.ListCreateAPIView):
     """
     serializer_class = CompanySerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    queryset = Company.objects.annotate(
-        employee_count=Count('current_employee', distinct=True)
-    ).order_by('name')
+    queryset = Company.objects.order_by('name')
     filter_backends = [
         filters.OrderingFilter,
         filters.SearchFilter,
@@ -44,76 +69,136 @@ class CompanyList(generics.ListCreateAPIView):
 
     def validate_company(self, company_title, company_location):
         """
-        Validates Company creation.
+        Validates Company creation, with one query which also locks
+        the owner's row until the company is saved.
         If company is already in the list a ValidationError is raised.
         If owner already has 3 companies in the list a ValidationError
         is raised.
         """
-        companies_count = Company.objects.filter(
-            owner=self.request.user).count()
+        companies_count, existing_company = User.objects.select_for_update(
+            of=('self',)
+        ).filter(pk=self.request.user.pk).annotate(
+            companies_count=F('profile__stats__companies_count'),
+            existing_company=Exists(
+                matching_companies(company_title, company_location)
+            ),
+        ).values_list('companies_count', 'existing_company').get()
 
-        if companies_count >= 3:
+        if (companies_count or 0) >= 3:
             raise serializers.ValidationError(
                 "You have reached the max profile limit of 3 companies."
             )
 
-        existing_company = Company.objects.filter(
-            name=company_title,
-            location=company_location
-        ).first()
-
         if existing_company:
-            raise serializers.ValidationError(
-                f"A company with the title '{company_title}'"
-                f" and location '{company_location}' already exists."
-            )
+            raise duplicate_company_error(company_title, company_location)
 
     def perform_create(self, serializer):
         """
         Creates a company but first validates the company input.
         """
         company_title = serializer.validated_data.get('name')
-        company_location = serializer.validated_data.get('location')
-        self.validate_company(company_title, company_location)
+        company_location = serializer.validated_data.get('location', '')
+        with transaction.atomic():
+            self.validate_company(company_title, company_location)
+            try:
+                serializer.save(owner=self.request.user)
+            except IntegrityError:
+                raise duplicate_company_error(
+                    company_title, company_location
+                )
+
 
-        serializer.save(owner=self.request.user)
+class CompanyAutocomplete(APIView):
+    """
+    Lists the companies with a name, location or word in them
+    starting with the 'q' parameter, most employees first.
+    Served from the in-process autocomplete index, which reads its
+    version from the shared cache at most every
+    AUTOCOMPLETE_VERSION_CHECK_SECONDS. Use 'limit' to request fewer
+    than AUTOCOMPLETE_LIMIT companies.
+    """
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
+    def get(self, request):
+        try:
+            limit = int(request.query_params['limit'])
+        except (KeyError, ValueError):
+            limit = AUTOCOMPLETE_LIMIT
+        limit = min(max(limit, 1), AUTOCOMPLETE_LIMIT)
+        return Response(autocomplete_index.search(
+            request.query_params.get('q', ''), limit
+        ))
 
-class CompanyDetail(generics.RetrieveUpdateDestroyAPIView):
+
+class CompanyFacets(APIView):
+    """
+    Lists the number of companies per location and type, and of
+    employees per company id, largest first.
+    Read from the CompanyFacet rollup with one indexed query per
+    dimension. Use 'limit' to request up to 100 values per dimension,
+    the default is 20.
+    """
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    default_limit = 20
+    max_limit = 100
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params['limit'])
+        except (KeyError, ValueError):
+            limit = self.default_limit
+        limit = min(max(limit, 1), self.max_limit)
+        facets = {}
+        for dimension, _ in CompanyFacet.DIMENSIONS:
+            values = CompanyFacet.objects.filter(
+                dimension=dimension
+            ).order_by('-count', 'value').values('value', 'count')[:limit]
+            facets[dimension] = list(values)
+        for facet in facets[CompanyFacet.EMPLOYER]:
+            facet['value'] = int(facet['value'])
+        return Response(facets)
+
+
+class CompanyDetail(
+        ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """
     Lists all company details.
     Allows the company instance owner to edit the details, as well
     as delete the company instance.
+    Supports conditional GET requests with ETag.
     """
     serializer_class = CompanySerializer
     permission_classes = [IsOwnerOrReadOnly]
-    queryset = Company.objects.annotate(
-        employee_count=Count('current_employee', distinct=True)
-    ).order_by('created_on')
+    queryset = Company.objects.select_related('owner').order_by('created_on')
+    validator_fields = ('updated_on', 'owner__username', 'employee_count')
 
-    def validate_company_update(self, company_title, company_location):
+    def validate_company_update(
+        self, company, company_title, company_location
+    ):
         """
         Validates Company update.
         If a company with the same title and location exists,
         a ValidationError is raised.
         """
-        existing_company = Company.objects.exclude(
-            pk=self.get_object().pk).filter(
-                name=company_title, location=company_location
-            ).first()
-
-        if existing_company:
-            raise serializers.ValidationError(
-                f"A company with the title '{company_title}'"
-                f" and location '{company_location}' already exists."
-            )
+        if matching_companies(company_title, company_location).exclude(
+            pk=company.pk
+        ).exists():
+            raise duplicate_company_error(company_title, company_location)
 
     def perform_update(self, serializer):
         """
         Updates a company but first validates the company input.
         """
-        company_title = serializer.validated_data.get('name')
-        company_location = serializer.validated_data.get('location')
-        self.validate_company_update(company_title, company_location)
+        company = serializer.instance
+        company_title = serializer.validated_data.get('name', company.name)
+        company_location = serializer.validated_data.get(
+            'location', company.location
+        )
+        self.validate_company_update(company, company_title, company_location)
 
-        serializer.save()
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError:
+            raise duplicate_company_error(company_title, company_location)
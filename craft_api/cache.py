@@ -0,0 +1,161 @@
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+
+def get_versions(keys):
+    """
+    Returns {key: version} for the version 'keys', starting any
+    missing one at the current time in nanoseconds, so a version lost
+    from the cache never reuses the number of an older one.
+    """
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return versions
+
+
+def versioned_keys(label, pks):
+    """
+    Returns {pk: key} of the cache keys of the instances' current
+    representations, built from the model wide and each instance's
+    version.
+    """
+    model_key = f'{label}:version'
+    keys = {pk: f'{label}:{pk}:version' for pk in pks}
+    versions = get_versions([model_key, *keys.values()])
+    return {
+        pk: f'{label}:{pk}:{versions[model_key]}:{versions[key]}'
+        for pk, key in keys.items()
+    }
+
+
+def versioned_key(label, pk):
+    """
+    Returns the cache key of the instance's current representation.
+    """
+    return versioned_keys(label, [pk])[pk]
+
+
+def bump_version(label, pk=None):
+    """
+    Invalidates the cached representation of one instance, or of
+    every instance of the model when 'pk' is None.
+    The version is bumped again once the transaction commits, so a
+    read racing the write cannot cache the old rows as current.
+    """
+    key = f'{label}:version' if pk is None else f'{label}:{pk}:version'
+
+    def incr():
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Not cached, the next read starts a new version.
+            pass
+
+    incr()
+    transaction.on_commit(incr)
+
+
+class CachedRetrieveMixin:
+    """
+    Detail view mixin serving the viewer independent part of the
+    representation from the cache, keyed by the versioned_key of the
+    requested object. Writes which change the representation must
+    call bump_version for it.
+    'viewer_fields' are left out of the cached data and set on every
+    request by 'get_viewer_fields()'.
+    A cache hit skips get_object, so object permissions must allow
+    every safe request.
+    The cache must be shared by every process serving the API, see
+    CACHES in settings.py, or a write only invalidates the copy in
+    the process which made it.
+    """
+    viewer_fields = ()
+
+    def get_viewer_fields(self, data):
+        return {}
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        key = versioned_key(
+            self.get_queryset().model._meta.label_lower,
+            self.kwargs[lookup_url_kwarg],
+        )
+        data = cache.get(key)
+        if data is None:
+            data = self.get_serializer(self.get_object()).data
+            cache.set(
+                key,
+                {
+                    field: value for field, value in data.items()
+                    if field not in self.viewer_fields
+                },
+                settings.CACHED_RETRIEVE_TIMEOUT,
+            )
+            return Response(data)
+        data.update(self.get_viewer_fields(data))
+        return Response(data)
+
+
+class CachedListMixin:
+    """
+    List view mixin serving each item's viewer independent
+    representation from the cache, under the same versioned_key as
+    CachedRetrieveMixin.
+    The page is chosen by a query on the filtered primary keys only,
+    and only the items missing from the cache are loaded and
+    serialized, with one query and without their viewer fields.
+    'viewer_fields' are left out of the cached data and set on every
+    request by 'get_viewer_fields()', which receives the whole page.
+    """
+    viewer_fields = ()
+
+    def get_viewer_fields(self, items):
+        """
+        Returns {pk: fields} of the viewer's fields for the page.
+        """
+        return {}
+
+    def get_cache_serializer(self, instances):
+        """
+        Returns a list serializer for 'instances' without the
+        'viewer_fields', which are not cached and so never resolved.
+        """
+        serializer = self.get_serializer(instances, many=True)
+        for field in self.viewer_fields:
+            serializer.child.fields.pop(field, None)
+        return serializer
+
+    def get_cached_items(self, pks):
+        """
+        Returns the cached representations of 'pks', in order,
+        serializing and caching those which are missing.
+        """
+        keys = versioned_keys(self.get_queryset().model._meta.label_lower, pks)
+        cached = cache.get_many(keys.values())
+        items = {pk: cached[key] for pk, key in keys.items() if key in cached}
+        missing = [pk for pk in pks if pk not in items]
+        if missing:
+            instances = self.get_queryset().filter(pk__in=missing)
+            fresh = {}
+            for data in self.get_cache_serializer(instances).data:
+                items[data['id']] = fresh[keys[data['id']]] = data
+            cache.set_many(fresh, settings.CACHED_RETRIEVE_TIMEOUT)
+        return [dict(items[pk]) for pk in pks if pk in items]
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        pks = queryset.values_list('pk', flat=True)
+        page = self.paginate_queryset(pks)
+        items = self.get_cached_items(list(pks if page is None else page))
+        viewer_fields = self.get_viewer_fields(items)
+        for item in items:
+            item.update(viewer_fields.get(item['id'], {}))
+        if page is not None:
+            return self.get_paginated_response(items)
+        return Response(items)
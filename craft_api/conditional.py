@@ -0,0 +1,166 @@
+import json
+from hashlib import sha1
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+from .cache import get_versions
+
+
+def version_etag(version):
+    """
+    Returns the ETag of a 'version' string.
+    """
+    return quote_etag(sha1(version.encode()).hexdigest())
+
+
+class ConditionalRetrieveMixin:
+    """
+    Detail view mixin adding ETag and Last-Modified validators, so a
+    client already holding the current representation gets a 304
+    without the object being serialized.
+    The validators are the 'validator_fields' of the object, which
+    should cover every stored value the representation depends on,
+    plus any viewer specific fields. The viewer's id is always part
+    of the ETag.
+    They are read from the object retrieve() loads anyway, so a 200
+    costs no extra query. Views which avoid loading the object, such
+    as cached ones, set 'etag_from_data' to hash the response data
+    instead, so the ETag always matches the body served.
+    Last-Modified is only sent when 'last_modified_fields' is set, for
+    representations which only change when one of those timestamps
+    does, and is the latest of them. It is not sent with
+    'etag_from_data'.
+    """
+    validator_fields = ('updated_on',)
+    last_modified_fields = ()
+    etag_from_data = False
+
+    def use_validators(self):
+        """
+        Returns False if the response should not be validated, e.g.
+        as it depends on the current time.
+        """
+        return True
+
+    def get_validator_fields(self):
+        return self.validator_fields
+
+    def get_validator_row(self, instance, fields):
+        """
+        Returns the values of 'fields' on 'instance', following
+        relations the same way as values_list().
+        """
+        row = []
+        for field in fields:
+            value = instance
+            for attribute in field.split('__'):
+                value = getattr(value, attribute, None)
+                if value is None:
+                    break
+            row.append(value)
+        return tuple(row)
+
+    def get_etag(self, version):
+        """
+        Returns the ETag of the viewer's 'version' of the
+        representation.
+        """
+        return version_etag(version)
+
+    def get_data_etag(self, data):
+        """
+        Returns the ETag of the response 'data'.
+        """
+        return self.get_etag(json.dumps(
+            [self.request.user.pk, data],
+            sort_keys=True, cls=DjangoJSONEncoder,
+        ))
+
+    def get_validators(self, instance):
+        """
+        Returns the (etag, last_modified) of 'instance'.
+        """
+        fields = self.get_validator_fields()
+        row = self.get_validator_row(instance, fields)
+        version = repr((self.request.user.pk,) + tuple(row))
+        etag = self.get_etag(version)
+        timestamps = [
+            row[fields.index(field)] for field in self.last_modified_fields
+        ]
+        timestamps = [timestamp for timestamp in timestamps if timestamp]
+        last_modified = None
+        if timestamps:
+            last_modified = int(max(timestamps).timestamp())
+        return etag, last_modified
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.use_validators():
+            return super().retrieve(request, *args, **kwargs)
+        if self.etag_from_data:
+            response = super().retrieve(request, *args, **kwargs)
+            etag = self.get_data_etag(response.data)
+            last_modified = None
+            response = get_conditional_response(
+                request, etag=etag
+            ) or response
+        else:
+            instance = self.get_object()
+            etag, last_modified = self.get_validators(instance)
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            ) or Response(self.get_serializer(instance).data)
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ('Cookie', 'Authorization'))
+        return response
+
+
+class ConditionalListMixin:
+    """
+    List view mixin adding an ETag validator, so a client already
+    holding the current page gets a 304 without the page being read
+    or serialized.
+    The ETag covers the viewer, the request's path with its filter,
+    ordering and page parameters, and the 'validator_aggregates' of
+    the filtered queryset, read with one query. They should change
+    whenever a row is added to or removed from the list, or changes
+    its representation, e.g. a count and the latest 'updated_on'.
+    Changes no aggregate sees bump one of the shared
+    'validator_versions', see craft_api/cache.py.
+    """
+    validator_aggregates = {}
+    validator_versions = ()
+
+    def use_validators(self):
+        """
+        Returns False if the response should not be validated, e.g.
+        as it depends on the current time.
+        """
+        return True
+
+    def get_list_etag(self, queryset):
+        """
+        Returns the ETag of the viewer's page of 'queryset'.
+        """
+        aggregates = queryset.aggregate(**self.validator_aggregates)
+        keys = [f'{label}:version' for label in self.validator_versions]
+        versions = get_versions(keys) if keys else {}
+        return version_etag(repr((
+            self.request.user.pk,
+            self.request.get_full_path(),
+            sorted(aggregates.items()),
+            sorted(versions.items()),
+        )))
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_validators():
+            return super().list(request, *args, **kwargs)
+        etag = self.get_list_etag(self.filter_queryset(self.get_queryset()))
+        response = get_conditional_response(
+            request, etag=etag
+        ) or super().list(request, *args, **kwargs)
+        response['ETag'] = etag
+        patch_vary_headers(response, ('Cookie', 'Authorization'))
+        return response
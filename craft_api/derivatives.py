@@ -0,0 +1,162 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from PIL import Image, ImageOps
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import get_storage_class
+from django.db import connection, transaction
+from .cache import bump_version
+
+_executor = None
+
+
+def get_derivative_storage():
+    """
+    Returns the storage derivatives are written to, configured by
+    IMAGE_DERIVATIVE_STORAGE and IMAGE_DERIVATIVE_STORAGE_OPTIONS.
+    """
+    storage_class = get_storage_class(settings.IMAGE_DERIVATIVE_STORAGE)
+    return storage_class(**settings.IMAGE_DERIVATIVE_STORAGE_OPTIONS)
+
+
+def supported_formats():
+    """
+    Returns the configured derivative formats Pillow is able to write.
+    """
+    Image.init()
+    return [
+        image_format for image_format in settings.IMAGE_DERIVATIVE_FORMATS
+        if image_format.upper() in Image.SAVE
+    ]
+
+
+def generate_derivatives(image_file, prefix, storage):
+    """
+    Writes a resized copy of the image for every size and format in
+    IMAGE_DERIVATIVE_SIZES and IMAGE_DERIVATIVE_FORMATS.
+    Returns the derivative urls as {size: {format: url}}, and the
+    names the storage saved them under, which may differ from the
+    names asked for, e.g. Cloudinary adds a random suffix.
+    """
+    sizes = {}
+    names = []
+    with Image.open(image_file) as original:
+        original = ImageOps.exif_transpose(original)
+        if original.mode not in ('RGB', 'RGBA'):
+            original = original.convert('RGBA')
+        for size_name, max_side in settings.IMAGE_DERIVATIVE_SIZES.items():
+            resized = original.copy()
+            resized.thumbnail((max_side, max_side))
+            sizes[size_name] = {}
+            for image_format in supported_formats():
+                buffer = BytesIO()
+                resized.save(buffer, image_format.upper())
+                name = storage.save(
+                    f'{prefix}/{size_name}.{image_format}',
+                    ContentFile(buffer.getvalue()),
+                )
+                names.append(name)
+                sizes[size_name][image_format] = storage.url(name)
+    return sizes, names
+
+
+def delete_derivatives(names, storage):
+    """
+    Deletes derivatives by the names generate_derivatives returned.
+    """
+    for name in names:
+        storage.delete(name)
+
+
+def build_derivatives(model_label, pk, image_name):
+    """
+    Generates the derivatives of an instance's image and stores their
+    urls on its 'image_variants' field, invalidating any cached
+    representation of the instance, then deletes the derivatives of
+    the previous image.
+    Does nothing if the image was replaced in the meantime.
+    """
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk, image=image_name).first()
+    if instance is None:
+        return
+    prefix = f'{model._meta.model_name}/{pk}'
+    storage = get_derivative_storage()
+    with instance.image.open('rb') as image_file:
+        sizes, names = generate_derivatives(image_file, prefix, storage)
+    updated = model.objects.filter(pk=pk, image=image_name).update(
+        image_variants={'source': image_name, 'sizes': sizes, 'names': names}
+    )
+    if not updated:
+        delete_derivatives(names, storage)
+        return
+    bump_version(model._meta.label_lower, pk)
+    delete_derivatives(instance.image_variants.get('names', []), storage)
+
+
+def missing_derivatives(model):
+    """
+    Yields (pk, image name) for each instance of 'model' with an
+    uploaded image whose derivatives were never stored, e.g. because
+    its queued build was lost when the process restarted.
+    """
+    default_image = model._meta.get_field('image').default
+    rows = model.objects.exclude(image='').exclude(
+        image=default_image
+    ).values_list('pk', 'image', 'image_variants')
+    for pk, image_name, variants in rows.iterator():
+        if variants.get('source') != image_name:
+            yield pk, image_name
+
+
+def run_build_derivatives(*args):
+    """
+    Worker thread entry point, closing the thread's own database
+    connection once done.
+    """
+    try:
+        build_derivatives(*args)
+    finally:
+        connection.close()
+
+
+def queue_derivatives(model_label, pk, image_name):
+    """
+    Builds the derivatives in a background thread, or inline when
+    IMAGE_DERIVATIVES_ASYNC is False.
+    Queued builds are lost if the process exits first, and are picked
+    up again by the build_image_derivatives command.
+    """
+    global _executor
+    args = (model_label, pk, image_name)
+    if not settings.IMAGE_DERIVATIVES_ASYNC:
+        build_derivatives(*args)
+        return
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.IMAGE_DERIVATIVE_WORKERS,
+            thread_name_prefix='image-derivatives',
+        )
+    _executor.submit(run_build_derivatives, *args)
+
+
+def schedule_derivatives(sender, instance, **kwargs):
+    """
+    post_save handler queueing derivatives for a newly uploaded image
+    once the transaction commits.
+    Default images are skipped and their stale variants cleared.
+    """
+    image_name = instance.image.name
+    if instance.image_variants.get('source') == image_name:
+        return
+    default_image = instance._meta.get_field('image').default
+    if not image_name or image_name == default_image:
+        if instance.image_variants:
+            sender.objects.filter(pk=instance.pk).update(image_variants={})
+        return
+    transaction.on_commit(
+        lambda: queue_derivatives(
+            sender._meta.label, instance.pk, image_name
+        )
+    )
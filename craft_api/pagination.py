@@ -0,0 +1,158 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    PageNumberPagination,
+)
+from rest_framework.settings import api_settings
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination over ('-created_on', '-id').
+    The cursor position holds the created_on and id of a row, so pages
+    are fetched with an indexed (created_on, id) range filter instead
+    of an OFFSET scan. Rows sharing a timestamp, such as bulk imports,
+    are never skipped or repeated, and no total count is calculated.
+    The ordering is fixed, so an 'ordering' parameter is rejected.
+    """
+    ordering = ('-created_on', '-id')
+    position_separator = '|'
+
+    def get_ordering(self, request, queryset, view):
+        if api_settings.ORDERING_PARAM in request.query_params:
+            raise ValidationError({
+                api_settings.ORDERING_PARAM: [
+                    'Ordering cannot be changed in cursor pagination.'
+                ]
+            })
+        return self.ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.request = request
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            reverse, position = False, None
+        else:
+            # Positions are unique, so offsets are never needed.
+            self.cursor = self.cursor._replace(offset=0)
+            reverse, position = self.cursor.reverse, self.cursor.position
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [
+                field[1:] if field.startswith('-') else '-' + field
+                for field in ordering
+            ]
+        results = self.get_page_rows(
+            queryset, ordering, position, self.page_size + 1
+        )
+        self.page = results[:self.page_size]
+        following = None
+        if len(results) > len(self.page):
+            following = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = following is not None
+            self.next_position = position
+            self.previous_position = following
+        else:
+            self.has_next = following is not None
+            self.has_previous = position is not None
+            self.next_position = following
+            self.previous_position = position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_page_rows(self, queryset, ordering, position, limit):
+        """
+        Returns the first 'limit' rows of 'queryset' after 'position'
+        in 'ordering'.
+        """
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = self.filter_after(queryset, ordering, position)
+        return list(queryset[:limit])
+
+    def filter_after(self, queryset, ordering, position):
+        """
+        Filters 'queryset' to the rows after 'position' in 'ordering',
+        e.g. created_on < x OR (created_on = x AND id < y).
+        """
+        values = position.split(self.position_separator)
+        if len(values) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        keyset = None
+        for field, value in reversed(list(zip(ordering, values))):
+            name = field.lstrip('-')
+            lookup = '__lt' if field.startswith('-') else '__gt'
+            after = Q(**{name + lookup: value})
+            if keyset is not None:
+                after |= Q(**{name: value}) & keyset
+            keyset = after
+        try:
+            return queryset.filter(keyset)
+        except (ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for field in ordering:
+            value = getattr(instance, field.lstrip('-'))
+            if hasattr(value, 'isoformat'):
+                value = value.isoformat()
+            values.append(str(value))
+        return self.position_separator.join(values)
+
+
+class PageNumberOrCursorPagination(BasePagination):
+    """
+    Uses page number pagination by default, so existing clients keep
+    their 'count' and page links.
+    Switches to KeysetCursorPagination when the request carries a
+    'cursor' or 'pagination=cursor' query parameter, for infinite
+    scroll clients.
+    """
+    page_number_class = PageNumberPagination
+    cursor_class = KeysetCursorPagination
+
+    def use_cursor(self, request):
+        """
+        Returns True if the client asked for cursor pagination.
+        """
+        return (
+            self.cursor_class.cursor_query_param in request.query_params
+            or request.query_params.get('pagination') == 'cursor'
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_cursor(request):
+            self.paginator = self.cursor_class()
+        else:
+            self.paginator = self.page_number_class()
+        page = self.paginator.paginate_queryset(queryset, request, view)
+        self.display_page_controls = self.paginator.display_page_controls
+        return page
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_html_context(self):
+        return self.paginator.get_html_context()
+
+    def to_html(self):
+        return self.paginator.to_html()
@@ -0,0 +1,31 @@
+from django.db import models
+from django.db.models import IntegerField, Subquery
+
+
+class OwnerProfileQuerySet(models.QuerySet):
+    """
+    Shared QuerySet for models serialized with their owner's
+    username and profile fields.
+    'owner_related' lists the relations the serializer reads, so they
+    are joined into the main query instead of loaded row by row.
+    """
+    owner_related = ('owner__profile',)
+
+    def with_owner_profile(self):
+        """
+        Joins the owner, their profile and any further relations
+        listed in 'owner_related'.
+        """
+        return self.select_related(*self.owner_related)
+
+
+class SubqueryCount(Subquery):
+    """
+    Counts the rows of a queryset filtered on an OuterRef, as a
+    correlated subquery instead of a joined Count aggregate.
+    """
+    template = '(SELECT COUNT(*) FROM (%(subquery)s) _count)'
+    output_field = IntegerField()
+
+    def __init__(self, queryset, **extra):
+        super().__init__(queryset.order_by().values('pk'), **extra)
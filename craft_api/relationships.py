@@ -0,0 +1,46 @@
+from followers.models import Follower
+from approvals.models import Approval
+from likes.models import Like
+
+
+def profile_relationships(user, profile_ids):
+    """
+    Resolves the user's relationship to each of the given profiles
+    in at most two queries, one on Follower and one on Approval.
+    Returns {profile_id: {'following_id': id, 'approval_id': id}},
+    with None where there is no follow or approval.
+    """
+    relationships = {
+        pk: {'following_id': None, 'approval_id': None}
+        for pk in profile_ids
+    }
+    if not user.is_authenticated or not relationships:
+        return relationships
+    follows = Follower.objects.filter(
+        owner=user, followed__profile__in=relationships
+    ).values_list('followed__profile', 'pk')
+    for profile_id, following_id in follows:
+        relationships[profile_id]['following_id'] = following_id
+    approvals = Approval.objects.filter(
+        owner=user, profile__in=relationships
+    ).values_list('profile', 'pk')
+    for profile_id, approval_id in approvals:
+        relationships[profile_id]['approval_id'] = approval_id
+    return relationships
+
+
+def post_likes(user, post_ids):
+    """
+    Resolves the user's like of each of the given posts in at most
+    one query on Like.
+    Returns {post_id: {'like_id': id}}, with None where there is no like.
+    """
+    likes = {pk: {'like_id': None} for pk in post_ids}
+    if not user.is_authenticated or not likes:
+        return likes
+    rows = Like.objects.filter(
+        owner=user, post__in=likes
+    ).values_list('post', 'pk')
+    for post_id, like_id in rows:
+        likes[post_id]['like_id'] = like_id
+    return likes
@@ -0,0 +1,56 @@
+import re
+from django.db.models import FloatField, Value
+from django.template import loader
+from rest_framework import filters
+
+
+def search_terms(text):
+    """
+    Splits user input into plain word tokens, dropping any query
+    syntax characters.
+    """
+    return re.findall(r'\w+', text or '')
+
+
+def no_matches(queryset):
+    """
+    Returns an empty 'queryset' carrying the 'search_rank' annotation,
+    for searches which can match nothing.
+    """
+    return queryset.none().annotate(
+        search_rank=Value(0.0, output_field=FloatField())
+    )
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    Base filter for the 'search' query parameter backed by a search
+    index. Subclasses implement 'search()'.
+    The match runs inside the query, so other filters and pagination
+    see every result.
+    Results are ordered by relevance unless an 'ordering' parameter
+    is given.
+    """
+    def search(self, queryset, text):
+        """
+        Returns 'queryset' filtered to the matches for 'text' and
+        annotated with their 'search_rank', higher for better matches.
+        """
+        raise NotImplementedError
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        if not text.strip():
+            return queryset
+        queryset = self.search(queryset, text)
+        if filters.OrderingFilter.ordering_param in request.query_params:
+            return queryset
+        return queryset.order_by('-search_rank', '-pk')
+
+    def to_html(self, request, queryset, view):
+        # The index sets the searched fields, not 'search_fields'.
+        context = {
+            'param': self.search_param,
+            'term': request.query_params.get(self.search_param, ''),
+        }
+        return loader.get_template(self.template).render(context)
@@ -1,5 +1,33 @@
+from django.contrib.humanize.templatetags.humanize import naturaltime
 from rest_framework import serializers
+from rest_framework.settings import ISO_8601
 from dj_rest_auth.serializers import UserDetailsSerializer
+from .timestamps import iso_timestamps_requested
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """
+    Read only field for a model's 'image_variants', returning the
+    resized image urls as {size: {format: url}}.
+    Empty until the derivatives have been generated.
+    """
+    def to_representation(self, value):
+        return value.get('sizes', {})
+
+
+class TimestampField(serializers.ReadOnlyField):
+    """
+    Read only datetime field, returned as a natural time such as
+    '2 minutes ago', or as a stable ISO-8601 string when the request
+    asks for ISO timestamps.
+    """
+    iso_field = serializers.DateTimeField(format=ISO_8601)
+
+    def to_representation(self, value):
+        request = self.context.get('request')
+        if request is not None and iso_timestamps_requested(request):
+            return self.iso_field.to_representation(value)
+        return naturaltime(value)
 
 
 class UserSerializer(UserDetailsSerializer):
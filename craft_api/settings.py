@@ -27,6 +27,20 @@ DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Resized post and profile images, see craft_api/derivatives.py.
+# Written to Cloudinary alongside the uploads they are made from.
+# Pillow 8.2 cannot write AVIF, so only WebP copies are made.
+IMAGE_DERIVATIVE_STORAGE = DEFAULT_FILE_STORAGE
+IMAGE_DERIVATIVE_STORAGE_OPTIONS = {}
+IMAGE_DERIVATIVE_SIZES = {
+    'thumbnail': 150,
+    'small': 480,
+    'medium': 1080,
+}
+IMAGE_DERIVATIVE_FORMATS = ['webp']
+IMAGE_DERIVATIVES_ASYNC = True
+IMAGE_DERIVATIVE_WORKERS = 2
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [(
         'rest_framework.authentication.SessionAuthentication'
@@ -54,6 +68,63 @@ REST_AUTH_SERIALIZERS = {
     'USER_DETAILS_SERIALIZER': 'craft_api.serializers.UserSerializer'
 }
 
+# Authors with more followers than this are not fanned out to their
+# followers' timelines on write, their posts are read into feeds instead.
+TIMELINE_FANOUT_LIMIT = 1000
+# Number of recent posts copied into a timeline when a user is followed.
+TIMELINE_BACKFILL_SIZE = 100
+
+# Trending post scores, see posts/trending.py.
+TRENDING_LIKE_WEIGHT = 1.0
+TRENDING_COMMENT_WEIGHT = 2.0
+TRENDING_HALF_LIFE_HOURS = 24
+TRENDING_LIMIT = 10
+
+# Newest comments embedded per post with 'include=comments_preview'.
+COMMENTS_PREVIEW_SIZE = 3
+
+# Cached profile representations, see craft_api/cache.py. Every
+# gunicorn worker must share the cache for a bump_version in one to
+# reach the others, so production needs a memcached server at
+# MEMCACHED_LOCATION, used through pymemcache. Without one nothing is
+# cached, except in DEV where the single runserver process keeps a
+# local memory cache. Tests use a local memory cache, see
+# craft_api/test_runner.py.
+if 'MEMCACHED_LOCATION' in os.environ:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': os.environ.get('MEMCACHED_LOCATION'),
+        }
+    }
+elif 'DEV' in os.environ:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        }
+    }
+CACHED_RETRIEVE_TIMEOUT = 60 * 60
+TEST_RUNNER = 'craft_api.test_runner.CraftTestRunner'
+
+# How often each process checks the shared version of its company
+# autocomplete index, see companies/autocomplete.py.
+AUTOCOMPLETE_VERSION_CHECK_SECONDS = 5
+
+# People you may know, see suggestions/models.py.
+SUGGESTION_MUTUAL_WEIGHT = 1.0
+SUGGESTION_COLLEAGUE_WEIGHT = 2.0
+SUGGESTION_LIMIT = 20
+# Follows and employer changes reaching more users than this only
+# update the mover's own suggestions, the rest wait for the next
+# build_suggestions run.
+SUGGESTION_FANOUT_LIMIT = 1000
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/3.2/howto/deployment/checklist/
 
@@ -98,6 +169,8 @@ INSTALLED_APPS = [
     'likes',
     'approvals',
     'followers',
+    'timelines',
+    'suggestions',
 ]
 
 SITE_ID = 1
@@ -0,0 +1,36 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+
+class QueryCountMixin:
+    """
+    Helpers for API tests checking an endpoint's query count does not
+    grow with the number of rows it returns.
+    """
+    user_total = 0
+
+    def create_user(self, employer=None):
+        """
+        Creates the next numbered user, 'user1', 'user2' and so on,
+        employed by 'employer' if given.
+        """
+        self.user_total += 1
+        user = User.objects.create_user(
+            username=f'user{self.user_total}', password='testpassword'
+        )
+        if employer is not None:
+            user.profile.employer = employer
+            user.profile.save()
+        return user
+
+    def count_queries(self, url):
+        """
+        Returns the response and number of queries of a GET request to
+        'url', checking it succeeded.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(context.captured_queries)
@@ -0,0 +1,223 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from posts.models import Post
+from likes.models import Like
+from comments.models import Comment
+from companies.models import Company
+from followers.models import Follower
+from approvals.models import Approval
+from profiles.models import Profile
+
+
+class ConditionalRetrieveTest(APITestCase):
+    """
+    Testcase for the ETag and Last-Modified support on detail views.
+    """
+    def setUp(self):
+        """
+        Setup a logged in user, and their post, comment and company.
+        """
+        self.user = User.objects.create_user(
+            username='testuser', password='testpassword'
+        )
+        self.other_user = User.objects.create_user(
+            username='otheruser', password='testpassword'
+        )
+        self.post = Post.objects.create(owner=self.user, title='Test Post')
+        self.comment = Comment.objects.create(
+            owner=self.user, post=self.post, content='Test comment'
+        )
+        self.company = Company.objects.create(
+            owner=self.user, name='Test Company', location='Test Location'
+        )
+        self.client.force_authenticate(self.user)
+
+    def revalidate(self, url, etag):
+        """
+        Returns the response to a GET request carrying 'etag'.
+        """
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_matching_etag_returns_not_modified(self):
+        """
+        Checks each detail view answers a matching ETag with a 304
+        from a single query.
+        """
+        urls = [
+            f'/posts/{self.post.pk}/',
+            f'/comments/{self.comment.pk}/?timestamps=iso',
+            f'/profiles/{self.user.profile.pk}/',
+            f'/companies/{self.company.pk}/',
+        ]
+        for url in urls:
+            etag = self.client.get(url)['ETag']
+            with CaptureQueriesContext(connection) as context:
+                response = self.revalidate(url, etag)
+
+            self.assertEqual(
+                response.status_code, status.HTTP_304_NOT_MODIFIED
+            )
+            self.assertEqual(len(context.captured_queries), 1)
+
+    def test_etag_changes_with_counts_and_viewer(self):
+        """
+        Checks a new like, and a different viewer, invalidate the ETag.
+        """
+        url = f'/posts/{self.post.pk}/'
+        etag = self.client.get(url)['ETag']
+
+        Like.objects.create(owner=self.user, post=self.post)
+        response = self.revalidate(url, etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['likes_count'], 1)
+
+        self.client.force_authenticate(self.other_user)
+        response = self.revalidate(url, response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_profile_etag_changes_with_follow(self):
+        """
+        Checks following a profile invalidates its ETag.
+        """
+        url = f'/profiles/{self.other_user.profile.pk}/'
+        etag = self.client.get(url)['ETag']
+
+        Follower.objects.create(owner=self.user, followed=self.other_user)
+
+        self.assertEqual(
+            self.revalidate(url, etag).status_code, status.HTTP_200_OK
+        )
+
+    def test_comment_if_modified_since(self):
+        """
+        Checks a comment with ISO-8601 timestamps sends Last-Modified
+        and honours If-Modified-Since.
+        """
+        url = f'/comments/{self.comment.pk}/?timestamps=iso'
+        last_modified = self.client.get(url)['Last-Modified']
+
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_natural_timestamps_are_not_validated(self):
+        """
+        Checks a comment with natural times, which change as time
+        passes, gets no ETag, while one with ISO-8601 timestamps,
+        requested by header, does.
+        """
+        url = f'/comments/{self.comment.pk}/'
+
+        self.assertNotIn('ETag', self.client.get(url))
+        response = self.client.get(url, HTTP_X_TIMESTAMP_FORMAT='iso')
+        self.assertIn('ETag', response)
+        self.assertIn('X-Timestamp-Format', response['Vary'])
+        self.assertEqual(
+            response.data['created_on'],
+            self.comment.created_on.isoformat().replace('+00:00', 'Z')
+        )
+
+    def test_missing_object_returns_not_found(self):
+        """
+        Checks a missing object still returns a 404.
+        """
+        response = self.client.get('/posts/999/', HTTP_IF_NONE_MATCH='"x"')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ConditionalListTest(APITestCase):
+    """
+    Testcase for the ETag support on the comment and approval lists.
+    """
+    def setUp(self):
+        """
+        Setup a logged in user with a commented post.
+        """
+        self.user = User.objects.create_user(
+            username='testuser', password='testpassword'
+        )
+        self.other_user = User.objects.create_user(
+            username='otheruser', password='testpassword'
+        )
+        self.post = Post.objects.create(owner=self.user, title='Test Post')
+        self.comment = Comment.objects.create(
+            owner=self.user, post=self.post, content='Test comment'
+        )
+        self.client.force_authenticate(self.user)
+        self.url = f'/comments/?post={self.post.pk}&timestamps=iso'
+
+    def assertModified(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response['ETag']
+
+    def test_matching_etag_returns_not_modified(self):
+        """
+        Checks each list answers a matching ETag with a 304 from a
+        single aggregate query, after the 'post' filter looks up the
+        post.
+        """
+        Approval.objects.create(
+            owner=self.user, profile=self.other_user.profile
+        )
+        urls = {self.url: 2, '/approvals/?timestamps=iso': 1}
+        for url, queries in urls.items():
+            etag = self.client.get(url)['ETag']
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+            self.assertEqual(
+                response.status_code, status.HTTP_304_NOT_MODIFIED
+            )
+            self.assertEqual(len(context.captured_queries), queries)
+
+    def test_etag_changes_with_the_thread(self):
+        """
+        Checks new, edited and deleted comments, owner profile edits,
+        built image variants and username changes invalidate the ETag.
+        """
+        etag = self.client.get(self.url)['ETag']
+
+        comment = Comment.objects.create(
+            owner=self.other_user, post=self.post, content='Reply'
+        )
+        etag = self.assertModified(self.url, etag)
+        comment.content = 'Edited reply'
+        comment.save()
+        etag = self.assertModified(self.url, etag)
+        self.comment.delete()
+        etag = self.assertModified(self.url, etag)
+        profile = self.other_user.profile
+        profile.name = 'Other'
+        profile.save()
+        etag = self.assertModified(self.url, etag)
+        Profile.objects.filter(pk=profile.pk).update(
+            image_variants={'source': profile.image.name, 'sizes': {}}
+        )
+        etag = self.assertModified(self.url, etag)
+        self.other_user.username = 'renamed'
+        self.other_user.save()
+        self.assertModified(self.url, etag)
+
+    def test_etag_covers_filters_and_viewer(self):
+        """
+        Checks other filters, pages and viewers get their own ETag.
+        """
+        etag = self.client.get(self.url)['ETag']
+
+        self.assertModified(f'{self.url}&search=other', etag)
+        self.client.force_authenticate(self.other_user)
+        self.assertModified(self.url, etag)
+
+    def test_natural_timestamps_are_not_validated(self):
+        """
+        Checks lists with natural times get no ETag.
+        """
+        self.assertNotIn('ETag', self.client.get('/comments/'))
+        self.assertNotIn('ETag', self.client.get('/approvals/'))
@@ -0,0 +1,131 @@
+import tempfile
+from PIL import Image
+from django.core.files.storage import FileSystemStorage
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase
+from ..derivatives import (
+    delete_derivatives, generate_derivatives, missing_derivatives
+)
+from posts.models import Post
+
+
+@override_settings(
+    IMAGE_DERIVATIVE_SIZES={'thumbnail': 150, 'small': 480},
+    IMAGE_DERIVATIVE_FORMATS=['webp'],
+)
+class GenerateDerivativesTest(TestCase):
+    """
+    Testcase for generate_derivatives.
+    """
+    def setUp(self):
+        """
+        Setup a temporary local storage.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage = FileSystemStorage(
+            location=self.directory.name, base_url='/derivatives/'
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_writes_each_size_and_format(self):
+        """
+        Checks a resized copy is stored for every size and format, and
+        its url returned.
+        """
+        with open('posts/tests/test_images/test_valid.png', 'rb') as image:
+            sizes, names = generate_derivatives(
+                image, 'post/1', self.storage
+            )
+
+        self.assertEqual(sizes, {
+            'thumbnail': {'webp': '/derivatives/post/1/thumbnail.webp'},
+            'small': {'webp': '/derivatives/post/1/small.webp'},
+        })
+        self.assertEqual(names, ['post/1/thumbnail.webp', 'post/1/small.webp'])
+        with self.storage.open('post/1/thumbnail.webp') as thumbnail:
+            self.assertEqual(Image.open(thumbnail).size, (150, 94))
+
+    def test_deletes_by_saved_names(self):
+        """
+        Checks derivatives saved under names the storage changed are
+        deleted by the names it returned.
+        """
+        with open('posts/tests/test_images/test_valid.png', 'rb') as image:
+            _, old_names = generate_derivatives(image, 'post/1', self.storage)
+            image.seek(0)
+            _, names = generate_derivatives(image, 'post/1', self.storage)
+
+        self.assertNotEqual(names, old_names)
+        delete_derivatives(old_names, self.storage)
+
+        self.assertFalse(any(map(self.storage.exists, old_names)))
+        self.assertTrue(all(map(self.storage.exists, names)))
+
+
+class ScheduleDerivativesTest(APITestCase):
+    """
+    Testcase for queueing derivatives when an image is saved, and
+    exposing their urls.
+    """
+    def setUp(self):
+        """
+        Setup a user and post.
+        """
+        self.user = User.objects.create_user(
+            username='testuser', password='testpassword'
+        )
+        self.post = Post.objects.create(owner=self.user, title='Test Post')
+
+    def test_new_image_queues_derivatives(self):
+        """
+        Checks a new image queues a build once the save commits.
+        """
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.post.image = 'images/test.png'
+            self.post.save()
+
+        self.assertEqual(len(callbacks), 1)
+
+    def test_default_image_not_queued(self):
+        """
+        Checks saving a post with the default image queues nothing.
+        """
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.post.save()
+
+        self.assertEqual(callbacks, [])
+
+    def test_missing_derivatives(self):
+        """
+        Checks only uploaded images without stored derivatives are
+        listed for rebuilding.
+        """
+        built = Post.objects.create(owner=self.user, title='Built')
+        Post.objects.filter(pk=built.pk).update(
+            image='images/built.png',
+            image_variants={'source': 'images/built.png', 'sizes': {}},
+        )
+        Post.objects.filter(pk=self.post.pk).update(image='images/lost.png')
+        Post.objects.create(owner=self.user, title='Default image')
+
+        self.assertEqual(
+            list(missing_derivatives(Post)),
+            [(self.post.pk, 'images/lost.png')]
+        )
+
+    def test_variant_urls_serialized(self):
+        """
+        Checks the post and profile image variants are returned.
+        """
+        sizes = {'thumbnail': {'webp': '/derivatives/post/1/thumbnail.webp'}}
+        Post.objects.filter(pk=self.post.pk).update(
+            image_variants={'source': 'images/test.png', 'sizes': sizes}
+        )
+
+        response = self.client.get(f'/posts/{self.post.pk}/')
+
+        self.assertEqual(response.data['image_variants'], sizes)
+        self.assertEqual(response.data['profile_image_variants'], {})
@@ -0,0 +1,139 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import SkipFile
+from django.test import RequestFactory, TestCase
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from ..uploads import (
+    ImageUploadLimitHandler,
+    MAX_IMAGE_SIZE,
+    IMAGE_SIZE_ERROR,
+    IMAGE_WIDTH_ERROR,
+    IMAGE_HEIGHT_ERROR,
+    read_image_dimensions,
+)
+from posts.models import Post
+
+
+class ImageUploadLimitHandlerTest(TestCase):
+    """
+    Testcase for the ImageUploadLimitHandler.
+    """
+    def setUp(self):
+        """
+        Setup a handler for an 'image' upload.
+        """
+        self.request = RequestFactory().post('/posts/')
+        self.handler = ImageUploadLimitHandler(self.request)
+        self.handler.new_file('image', 'test.png', 'image/png', None)
+
+    def test_reads_dimensions_from_header(self):
+        """
+        Checks dimensions are read from the first bytes of an image.
+        """
+        with open('posts/tests/test_images/test_valid.png', 'rb') as image:
+            header = image.read(1024)
+        self.assertEqual(read_image_dimensions(header), (640, 400))
+
+    def test_oversized_stream_skipped(self):
+        """
+        Checks the file is skipped once the byte limit is crossed.
+        """
+        with self.assertRaises(SkipFile):
+            self.handler.receive_data_chunk(b'0' * 1024, MAX_IMAGE_SIZE)
+
+        self.assertEqual(
+            self.request.upload_errors, {'image': [IMAGE_SIZE_ERROR]}
+        )
+
+    def test_other_fields_passed_through(self):
+        """
+        Checks files in other fields are not inspected.
+        """
+        self.handler.new_file('document', 'test.txt', 'text/plain', None)
+        chunk = b'0' * 1024
+
+        self.assertEqual(
+            self.handler.receive_data_chunk(chunk, MAX_IMAGE_SIZE), chunk
+        )
+
+
+class ImageUploadLimitViewTest(APITestCase):
+    """
+    Testcase for the upload limits on the post and profile views.
+    """
+    def setUp(self):
+        """
+        Setup a logged in user.
+        """
+        self.user = User.objects.create_user(
+            username='testuser', password='testpassword'
+        )
+        self.client.force_authenticate(self.user)
+
+    def upload(self, url, image_name, method='post'):
+        """
+        Sends an image to 'url' as a multipart form.
+        """
+        with open(f'posts/tests/test_images/{image_name}', 'rb') as image:
+            return getattr(self.client, method)(
+                url, {'title': 'Test Post', 'image': image},
+                format='multipart'
+            )
+
+    def test_oversized_post_image_rejected(self):
+        """
+        Checks an image over 2MB is rejected with the serializer's message.
+        """
+        with open('posts/tests/test_images/test_valid.png', 'rb') as image:
+            content = image.read()
+        image = SimpleUploadedFile(
+            'large.png', content.ljust(MAX_IMAGE_SIZE + 1, b'0'),
+            'image/png'
+        )
+
+        response = self.client.post(
+            '/posts/', {'title': 'Test Post', 'image': image},
+            format='multipart'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['image'], [IMAGE_SIZE_ERROR])
+        self.assertEqual(Post.objects.count(), 0)
+
+    def test_large_request_without_image_accepted(self):
+        """
+        Checks a body over 2MB without an image is not rejected with
+        the image size error.
+        """
+        document = SimpleUploadedFile(
+            'notes.txt', b'0' * (MAX_IMAGE_SIZE + 1), 'text/plain'
+        )
+
+        response = self.client.post(
+            '/posts/', {'title': 'Test Post', 'document': document},
+            format='multipart'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Post.objects.count(), 1)
+
+    def test_wide_post_image_rejected(self):
+        """
+        Checks an image over 4096px wide is rejected from its header.
+        """
+        response = self.upload('/posts/', 'test_wide.png')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['image'], [IMAGE_WIDTH_ERROR])
+
+    def test_high_profile_image_rejected(self):
+        """
+        Checks an image over 4096px high is rejected on profile update.
+        """
+        response = self.upload(
+            f'/profiles/{self.user.profile.pk}/', 'test_high.png', 'put'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['image'], [IMAGE_HEIGHT_ERROR])
@@ -1,6 +1,13 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from followers.models import Follower
+from approvals.models import Approval
+from likes.models import Like
+from posts.models import Post
+from ..views import RELATIONSHIP_ID_LIMIT
 from ..settings import (
     JWT_AUTH_COOKIE,
     JWT_AUTH_REFRESH_COOKIE,
@@ -69,3 +76,89 @@ class CraftApiViewsTest(APITestCase):
         self.assertEqual(
             response.cookies[JWT_AUTH_REFRESH_COOKIE]['max-age'], 0
         )
+
+
+class RelationshipsRouteTest(APITestCase):
+    """
+    Tests for the relationships_route bulk relationship status view.
+    """
+    def setUp(self):
+        """
+        Setup a viewer who follows and approves one profile and likes
+        one post.
+        """
+        self.viewer = User.objects.create_user(
+            username='viewer', password='testpassword'
+        )
+        self.other = User.objects.create_user(
+            username='other', password='testpassword'
+        )
+        self.liked = Post.objects.create(owner=self.other, title='Liked')
+        self.unliked = Post.objects.create(owner=self.other, title='Unliked')
+        self.following = Follower.objects.create(
+            owner=self.viewer, followed=self.other
+        )
+        self.approval = Approval.objects.create(
+            owner=self.viewer, profile=self.other.profile
+        )
+        self.like = Like.objects.create(owner=self.viewer, post=self.liked)
+        self.url = (
+            f'/relationships/?profiles={self.other.profile.pk},'
+            f'{self.viewer.profile.pk}&posts={self.liked.pk},'
+            f'{self.unliked.pk}'
+        )
+
+    def test_relationships_resolved_in_three_queries(self):
+        """
+        Checks the viewer's follows, approvals and likes are returned
+        using one query each.
+        """
+        self.client.force_authenticate(user=self.viewer)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(context.captured_queries), 3)
+        profiles = response.data['profiles']
+        self.assertEqual(
+            profiles[self.other.profile.pk],
+            {
+                'following_id': self.following.id,
+                'approval_id': self.approval.id,
+            }
+        )
+        self.assertEqual(
+            profiles[self.viewer.profile.pk],
+            {'following_id': None, 'approval_id': None}
+        )
+        self.assertEqual(
+            response.data['posts'],
+            {
+                self.liked.pk: {'like_id': self.like.id},
+                self.unliked.pk: {'like_id': None},
+            }
+        )
+
+    def test_logged_out_relationships_are_null(self):
+        """
+        Checks a logged out user gets null ids without any queries.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(context.captured_queries), 0)
+        self.assertIsNone(response.data['posts'][self.liked.pk]['like_id'])
+
+    def test_too_many_or_invalid_ids_rejected(self):
+        """
+        Checks more than RELATIONSHIP_ID_LIMIT ids, or non integer ids,
+        return a 400_BAD_REQUEST.
+        """
+        ids = ','.join(str(pk) for pk in range(RELATIONSHIP_ID_LIMIT + 1))
+
+        response = self.client.get(f'/relationships/?posts={ids}')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get('/relationships/?profiles=1,a')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
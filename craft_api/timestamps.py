@@ -0,0 +1,34 @@
+from django.utils.cache import patch_vary_headers
+
+TIMESTAMP_FORMAT_PARAM = 'timestamps'
+TIMESTAMP_FORMAT_HEADER = 'X-Timestamp-Format'
+
+
+def iso_timestamps_requested(request):
+    """
+    Returns True if the request asks for ISO-8601 timestamps, with a
+    'timestamps=iso' query parameter or 'X-Timestamp-Format: iso'
+    header.
+    """
+    value = request.query_params.get(TIMESTAMP_FORMAT_PARAM) or (
+        request.headers.get(TIMESTAMP_FORMAT_HEADER, '')
+    )
+    return value.lower() == 'iso'
+
+
+class TimestampFormatMixin:
+    """
+    View mixin for serializers with TimestampField fields.
+    Adds the timestamp format header to Vary, and only sends
+    ConditionalRetrieveMixin and ConditionalListMixin validators for
+    ISO-8601 responses, as natural times change as time passes.
+    """
+    def use_validators(self):
+        return iso_timestamps_requested(self.request)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        patch_vary_headers(response, (TIMESTAMP_FORMAT_HEADER,))
+        return response
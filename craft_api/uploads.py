@@ -0,0 +1,110 @@
+from io import BytesIO
+from PIL import Image
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from rest_framework import serializers
+
+MAX_IMAGE_SIZE = 1024 * 1024 * 2
+MAX_IMAGE_DIMENSION = 4096
+# Bytes of an image read while looking for its dimensions.
+HEADER_LIMIT = 1024 * 64
+
+IMAGE_SIZE_ERROR = 'Image size larger than 2MB!'
+IMAGE_WIDTH_ERROR = 'Image width larger than 4096px!'
+IMAGE_HEIGHT_ERROR = 'Image height larger than 4096px!'
+
+
+def read_image_dimensions(header):
+    """
+    Returns the (width, height) of an image from its first bytes,
+    without decoding any pixel data.
+    Returns None if the header is incomplete or not an image.
+    """
+    try:
+        return Image.open(BytesIO(header)).size
+    except Image.DecompressionBombError:
+        return (MAX_IMAGE_DIMENSION + 1, MAX_IMAGE_DIMENSION + 1)
+    except Exception:
+        # Pillow raises assorted errors for a truncated header.
+        return None
+
+
+class ImageUploadLimitHandler(FileUploadHandler):
+    """
+    Upload handler which rejects an oversized image while it streams
+    in, before it is buffered to memory or a temporary file.
+    Only the image field is limited, the rest of the request is left
+    to Django's DATA_UPLOAD_MAX_MEMORY_SIZE.
+    Runs ahead of Django's default handlers and passes accepted
+    chunks on to them.
+    Errors are recorded on 'request.upload_errors' in the same form
+    as the serializer validation errors.
+    """
+    def __init__(self, request=None, image_field='image'):
+        super().__init__(request)
+        self.image_field = image_field
+        request.upload_errors = {}
+
+    def reject(self, message):
+        self.request.upload_errors[self.image_field] = [message]
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.checking = field_name == self.image_field
+        self.header = b''
+        self.dimensions_checked = False
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.checking:
+            return raw_data
+        if start + len(raw_data) > MAX_IMAGE_SIZE:
+            self.reject(IMAGE_SIZE_ERROR)
+            raise SkipFile()
+        if not self.dimensions_checked:
+            self.check_dimensions(raw_data)
+        return raw_data
+
+    def check_dimensions(self, raw_data):
+        """
+        Reads the image dimensions once enough of the header arrived.
+        Leaves images with an unreadable header to the serializer.
+        """
+        self.header += raw_data
+        dimensions = read_image_dimensions(self.header)
+        if dimensions is None:
+            if len(self.header) >= HEADER_LIMIT:
+                self.dimensions_checked = True
+            return
+        self.dimensions_checked = True
+        self.header = b''
+        width, height = dimensions
+        if width > MAX_IMAGE_DIMENSION:
+            self.reject(IMAGE_WIDTH_ERROR)
+            raise SkipFile()
+        if height > MAX_IMAGE_DIMENSION:
+            self.reject(IMAGE_HEIGHT_ERROR)
+            raise SkipFile()
+
+    def file_complete(self, file_size):
+        # The following handlers build the uploaded file.
+        return None
+
+
+class ImageUploadLimitMixin:
+    """
+    View mixin installing ImageUploadLimitHandler for the view's
+    'upload_image_field', and raising its errors as a ValidationError
+    before the serializer is built.
+    """
+    upload_image_field = 'image'
+
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers.insert(
+            0, ImageUploadLimitHandler(request, self.upload_image_field)
+        )
+        return super().initialize_request(request, *args, **kwargs)
+
+    def get_serializer(self, *args, **kwargs):
+        upload_errors = getattr(self.request, 'upload_errors', None)
+        if 'data' in kwargs and upload_errors:
+            raise serializers.ValidationError(upload_errors)
+        return super().get_serializer(*args, **kwargs)
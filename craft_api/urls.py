@@ -15,13 +15,14 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from .views import root_route, logout_route
+from .views import root_route, logout_route, relationships_route
 
 urlpatterns = [
     path('', root_route),
     path('admin/', admin.site.urls),
     path('api-auth/', include('rest_framework.urls')),
     path('dj-rest-auth/logout/', logout_route),
+    path('relationships/', relationships_route),
     path('dj-rest-auth/', include('dj_rest_auth.urls')),
     path(
         'dj-rest-auth/registration/', include('dj_rest_auth.registration.urls')
@@ -33,4 +34,6 @@ urlpatterns = [
     path('', include('likes.urls')),
     path('', include('approvals.urls')),
     path('', include('followers.urls')),
+    path('', include('timelines.urls')),
+    path('', include('suggestions.urls')),
 ]
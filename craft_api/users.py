@@ -0,0 +1,35 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_init, post_save
+from .cache import bump_version
+
+# Shared version bumped whenever a username changes, for the list
+# validators of representations showing usernames.
+USERNAMES_VERSION_LABEL = 'auth.user.usernames'
+
+
+def record_loaded_username(sender, instance, **kwargs):
+    """
+    Records the username a user was loaded or created with, so save
+    signals can tell whether it changed.
+    """
+    instance.loaded_username = instance.__dict__.get('username')
+
+
+def username_changed(user):
+    """
+    Returns True if the user's username differs from the one it was
+    loaded with.
+    """
+    return user.username != getattr(user, 'loaded_username', None)
+
+
+def bump_usernames_version(sender, instance, created, **kwargs):
+    """
+    Bumps USERNAMES_VERSION_LABEL when a user's username changed.
+    """
+    if not created and username_changed(instance):
+        bump_version(USERNAMES_VERSION_LABEL)
+
+
+post_init.connect(record_loaded_username, sender=User)
+post_save.connect(bump_usernames_version, sender=User)
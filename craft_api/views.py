@@ -1,5 +1,7 @@
 from rest_framework.decorators import api_view
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from .relationships import profile_relationships, post_likes
 from .settings import (
     JWT_AUTH_COOKIE,
     JWT_AUTH_REFRESH_COOKIE,
@@ -20,6 +22,41 @@ def root_route(request):
     )
 
 
+RELATIONSHIP_ID_LIMIT = 200
+
+
+def parse_ids(request, param):
+    """
+    Returns the set of integer ids in a comma separated query param,
+    raising a validation error for non integer or too many ids.
+    """
+    value = request.query_params.get(param, '')
+    try:
+        ids = {int(pk) for pk in value.split(',') if pk.strip()}
+    except ValueError:
+        raise ValidationError({param: ['Ids must be integers.']})
+    if len(ids) > RELATIONSHIP_ID_LIMIT:
+        raise ValidationError({
+            param: [f'No more than {RELATIONSHIP_ID_LIMIT} ids allowed.']
+        })
+    return ids
+
+
+@api_view()
+def relationships_route(request):
+    """
+    Returns the request user's following_id and approval_id for each
+    profile in the 'profiles' param and like_id for each post in the
+    'posts' param, e.g. /relationships/?profiles=1,2&posts=3
+    """
+    profile_ids = parse_ids(request, 'profiles')
+    post_ids = parse_ids(request, 'posts')
+    return Response({
+        'profiles': profile_relationships(request.user, profile_ids),
+        'posts': post_likes(request.user, post_ids),
+    })
+
+
 @api_view(["POST"])
 def logout_route(request):
     # Fix for DRF logout bug from Code Institutes
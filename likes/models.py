@@ -1,6 +1,11 @@
+from django.conf import settings
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.models import User
 from posts.models import Post
+from posts.trending import removed_score_change, score_change
 
 
 class Like(models.Model):
@@ -22,3 +27,33 @@ class Like(models.Model):
 
     def __str__(self):
         return f"{self.owner}, {self.post}"
+
+
+def increment_likes_count(sender, instance, created, **kwargs):
+    """
+    Increments the post's stored likes_count and trending_score
+    when a like is created.
+    """
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(
+            likes_count=F('likes_count') + 1,
+            **score_change(settings.TRENDING_LIKE_WEIGHT)
+        )
+
+
+def decrement_likes_count(sender, instance, **kwargs):
+    """
+    Decrements the post's stored likes_count and trending_score
+    when a like is deleted, never below zero should the count have
+    drifted.
+    """
+    Post.objects.filter(pk=instance.post_id).update(
+        likes_count=Greatest(F('likes_count') - 1, 0),
+        **removed_score_change(
+            settings.TRENDING_LIKE_WEIGHT, instance.created_on
+        )
+    )
+
+
+post_save.connect(increment_likes_count, sender=Like)
+post_delete.connect(decrement_likes_count, sender=Like)
@@ -0,0 +1,24 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from craft_api.derivatives import build_derivatives, missing_derivatives
+
+
+class Command(BaseCommand):
+    """
+    Builds the image derivatives of every post and profile missing
+    them, such as builds queued by a process which restarted before
+    running them. Safe to run on a schedule.
+    """
+    help = 'Build any missing post and profile image derivatives.'
+    model_labels = ['posts.Post', 'profiles.Profile']
+
+    def handle(self, *args, **options):
+        built = 0
+        for label in self.model_labels:
+            model = apps.get_model(label)
+            for pk, image_name in list(missing_derivatives(model)):
+                build_derivatives(label, pk, image_name)
+                built += 1
+        self.stdout.write(
+            self.style.SUCCESS(f'Built derivatives for {built} images.')
+        )
@@ -0,0 +1,77 @@
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from django.utils import timezone
+from posts.models import Post
+from posts.trending import decay_factor
+from likes.models import Like
+from comments.models import Comment
+
+# Scores below this are reset to zero so they drop out of the index.
+MIN_SCORE = 0.01
+
+
+class Command(BaseCommand):
+    """
+    Decays every post's trending_score. Intended to run on a schedule,
+    e.g. hourly with the default '--hours 1'.
+    """
+    help = 'Decay trending post scores, or rebuild them from activity.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours', type=float, default=1,
+            help='Hours elapsed since the previous run.',
+        )
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help='Recalculate all scores from recent likes and comments.',
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            updated = self.rebuild()
+        else:
+            updated = Post.objects.filter(trending_score__gt=0).update(
+                trending_score=F('trending_score') * decay_factor(
+                    options['hours']
+                )
+            )
+            Post.objects.filter(
+                trending_score__gt=0, trending_score__lt=MIN_SCORE
+            ).update(trending_score=0)
+        self.stdout.write(
+            self.style.SUCCESS(f'Updated trending scores of {updated} posts.')
+        )
+
+    def rebuild(self):
+        """
+        Scores each post from the likes and comments made within ten
+        half lives, each decayed by its age.
+        """
+        now = timezone.now()
+        since = now - timedelta(hours=settings.TRENDING_HALF_LIFE_HOURS * 10)
+        scores = defaultdict(float)
+        for model, weight in [
+            (Like, settings.TRENDING_LIKE_WEIGHT),
+            (Comment, settings.TRENDING_COMMENT_WEIGHT),
+        ]:
+            activity = model.objects.filter(
+                created_on__gte=since
+            ).values_list('post_id', 'created_on')
+            for post_id, created_on in activity.iterator():
+                age = (now - created_on).total_seconds() / 3600
+                scores[post_id] += weight * decay_factor(age)
+
+        Post.objects.exclude(pk__in=scores).update(trending_score=0)
+        Post.objects.bulk_update(
+            [
+                Post(pk=post_id, trending_score=score)
+                for post_id, score in scores.items()
+            ],
+            ['trending_score'],
+            batch_size=500,
+        )
+        return len(scores)
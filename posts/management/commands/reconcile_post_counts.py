@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from posts.models import Post
+from likes.models import Like
+from comments.models import Comment
+
+
+def count_subquery(model):
+    """
+    Returns a subquery counting the rows of 'model' related to the
+    outer post.
+    """
+    return Coalesce(
+        Subquery(
+            model.objects.filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(count=Count('pk'))
+            .values('count')
+        ),
+        0,
+    )
+
+
+def reconcile_post_counts(post_model, like_model, comment_model):
+    """
+    Recalculates the stored likes_count and comments_count of every
+    post in a single UPDATE statement.
+    Returns the number of posts updated.
+    """
+    return post_model.objects.update(
+        likes_count=count_subquery(like_model),
+        comments_count=count_subquery(comment_model),
+    )
+
+
+class Command(BaseCommand):
+    """
+    Backfills or repairs the stored Post counters from the
+    Like and Comment tables.
+    """
+    help = 'Recalculate the stored likes_count and comments_count on posts.'
+
+    def handle(self, *args, **options):
+        updated = reconcile_post_counts(Post, Like, Comment)
+        self.stdout.write(
+            self.style.SUCCESS(f'Reconciled counters for {updated} posts.')
+        )
@@ -0,0 +1,37 @@
+# Generated by Django 3.2.22 on 2026-10-17 23:00
+
+from django.db import migrations, models
+
+
+def backfill_counters(apps, schema_editor):
+    from posts.management.commands.reconcile_post_counts import (
+        reconcile_post_counts
+    )
+    reconcile_post_counts(
+        apps.get_model('posts', 'Post'),
+        apps.get_model('likes', 'Like'),
+        apps.get_model('comments', 'Comment'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0002_alter_post_title'),
+        ('likes', '0002_alter_like_unique_together'),
+        ('comments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
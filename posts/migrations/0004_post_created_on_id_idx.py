@@ -0,0 +1,17 @@
+# Generated by Django 3.2.22 on 2026-10-17 23:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_post_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-created_on', '-id'], name='post_created_on_id_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from posts.search import get_search_backend
+    backend = get_search_backend(schema_editor.connection)
+    Post = apps.get_model('posts', 'Post')
+    posts = Post.objects.values_list(
+        'id', 'title', 'content', 'owner__username'
+    )
+    with schema_editor.connection.cursor() as cursor:
+        backend.create(cursor)
+        for post_id, title, content, author in posts.iterator():
+            backend.index(cursor, post_id, title, content, author)
+
+
+def drop_search_index(apps, schema_editor):
+    from posts.search import get_search_backend
+    backend = get_search_backend(schema_editor.connection)
+    with schema_editor.connection.cursor() as cursor:
+        backend.drop(cursor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_post_created_on_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,5 +1,34 @@
 from django.db import models
+from django.db.models import F, FilteredRelation, Q
+from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.models import User
+from craft_api.querysets import OwnerProfileQuerySet
+from .search import index_post, remove_post
+from craft_api.derivatives import schedule_derivatives
+from craft_api.users import username_changed
+
+
+class PostQuerySet(OwnerProfileQuerySet):
+    """
+    QuerySet for the Post model.
+    The post serializer also reads the owner's employer location.
+    """
+    owner_related = ('owner__profile__employer',)
+
+    def with_like_id(self, user):
+        """
+        Annotates each post with 'like_id', the id of the given user's
+        like on the post, or None.
+        Resolved with a single LEFT JOIN on the like table, so the query
+        count does not grow with the number of posts.
+        """
+        if not user.is_authenticated:
+            return self
+        return self.annotate(
+            viewer_like=FilteredRelation(
+                'like', condition=Q(like__owner=user)
+            ),
+        ).annotate(like_id=F('viewer_like__id'))
 
 
 class Post(models.Model):
@@ -8,6 +37,13 @@ class Post(models.Model):
     Image default set to the site logo, if no image added.
     Ordering set to '-created_on' so the newest post
     is shown first.
+    'likes_count' and 'comments_count' are stored counters, kept
+    up to date by the Like and Comment signals.
+    'trending_score' weights likes and comments, and is decayed over
+    time by the decay_trending_scores command.
+    'image_variants' holds the urls of the resized copies of 'image'.
+    'fanned_out' is False when the author was too widely followed for
+    the post to be written to timelines, it is read into feeds instead.
     """
     owner = models.ForeignKey(User, on_delete=models.CASCADE)
     title = models.CharField(max_length=100)
@@ -17,9 +53,60 @@ class Post(models.Model):
     image = models.ImageField(
         upload_to='images/', default='../logo_nobg_aac6d9.png', blank=True
     )
+    likes_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
+    trending_score = models.FloatField(default=0)
+    image_variants = models.JSONField(default=dict, blank=True)
+    fanned_out = models.BooleanField(default=True)
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         ordering = ['-created_on']
+        indexes = [
+            models.Index(
+                fields=['-created_on', '-id'], name='post_created_on_id_idx'
+            ),
+            models.Index(
+                fields=['-trending_score', '-id'], name='post_trending_idx'
+            ),
+            models.Index(
+                fields=['owner', '-created_on', '-id'],
+                name='post_read_on_fetch_idx',
+                condition=Q(fanned_out=False),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.id} {self.title}"
+
+
+def update_search_index(sender, instance, **kwargs):
+    """
+    Re-indexes a post's title, content and author when it is saved.
+    """
+    index_post(instance)
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    """
+    Removes a deleted post from the search index.
+    """
+    remove_post(instance.pk)
+
+
+def reindex_author_posts(sender, instance, created, **kwargs):
+    """
+    Re-indexes a user's posts when their username has changed since
+    it was loaded.
+    """
+    if created or not username_changed(instance):
+        return
+    for post in Post.objects.filter(owner=instance).select_related('owner'):
+        index_post(post)
+
+
+post_save.connect(update_search_index, sender=Post)
+post_save.connect(schedule_derivatives, sender=Post)
+post_delete.connect(remove_from_search_index, sender=Post)
+post_save.connect(reindex_author_posts, sender=User)
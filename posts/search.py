@@ -0,0 +1,151 @@
+from django.db import connection
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from craft_api.search import (
+    FullTextSearchFilter, no_matches, search_terms
+)
+
+
+class SqlitePostSearchBackend:
+    """
+    Full text search for posts on SQLite, used in DEV mode.
+    Stores title, content and author in the 'posts_post_fts' FTS5
+    shadow table, keyed by post id as its rowid.
+    """
+    table = 'posts_post_fts'
+
+    def create(self, cursor):
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} "
+            "USING fts5(title, content, author, tokenize='porter unicode61')"
+        )
+
+    def drop(self, cursor):
+        cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+
+    def index(self, cursor, post_id, title, content, author):
+        self.remove(cursor, post_id)
+        cursor.execute(
+            f"INSERT INTO {self.table} (rowid, title, content, author) "
+            "VALUES (%s, %s, %s, %s)",
+            [post_id, title, content, author]
+        )
+
+    def remove(self, cursor, post_id):
+        cursor.execute(
+            f"DELETE FROM {self.table} WHERE rowid = %s", [post_id]
+        )
+
+    def filter(self, queryset, terms):
+        query = ' '.join(f'"{term}"*' for term in terms)
+        matches = RawSQL(
+            f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s",
+            [query]
+        )
+        # bm25() is lower for better matches.
+        rank = RawSQL(
+            f"SELECT -bm25({self.table}, 10.0, 1.0, 5.0) FROM {self.table} "
+            f"WHERE {self.table} MATCH %s AND rowid = posts_post.id",
+            [query], output_field=FloatField()
+        )
+        return queryset.filter(pk__in=matches).annotate(search_rank=rank)
+
+
+class PostgresPostSearchBackend:
+    """
+    Full text search for posts on PostgreSQL.
+    Stores a weighted tsvector of title, author and content in the
+    'search_vector' column of posts_post, served by a GIN index.
+    """
+    document = (
+        "setweight(to_tsvector('english', coalesce(%s, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(%s, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(%s, '')), 'B')"
+    )
+
+    def create(self, cursor):
+        cursor.execute(
+            "ALTER TABLE posts_post "
+            "ADD COLUMN IF NOT EXISTS search_vector tsvector"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS posts_post_search_vector_idx "
+            "ON posts_post USING gin (search_vector)"
+        )
+
+    def drop(self, cursor):
+        cursor.execute("DROP INDEX IF EXISTS posts_post_search_vector_idx")
+        cursor.execute(
+            "ALTER TABLE posts_post DROP COLUMN IF EXISTS search_vector"
+        )
+
+    def index(self, cursor, post_id, title, content, author):
+        cursor.execute(
+            f"UPDATE posts_post SET search_vector = {self.document} "
+            "WHERE id = %s",
+            [title, author, content, post_id]
+        )
+
+    def remove(self, cursor, post_id):
+        # The tsvector is stored on the post row and goes with it.
+        pass
+
+    def filter(self, queryset, terms):
+        query = ' & '.join(f'{term}:*' for term in terms)
+        matches = RawSQL(
+            "posts_post.search_vector @@ to_tsquery('english', %s)",
+            [query], output_field=BooleanField()
+        )
+        rank = RawSQL(
+            "ts_rank(posts_post.search_vector, to_tsquery('english', %s))",
+            [query], output_field=FloatField()
+        )
+        return queryset.filter(matches).annotate(search_rank=rank)
+
+
+def get_search_backend(db_connection=connection):
+    """
+    Returns the search backend for the database in use.
+    """
+    if db_connection.vendor == 'postgresql':
+        return PostgresPostSearchBackend()
+    return SqlitePostSearchBackend()
+
+
+def index_post(post):
+    """
+    Writes a post's title, content and author username to the index.
+    """
+    with connection.cursor() as cursor:
+        get_search_backend().index(
+            cursor, post.pk, post.title, post.content, post.owner.username
+        )
+
+
+def remove_post(post_id):
+    """
+    Removes a post from the index.
+    """
+    with connection.cursor() as cursor:
+        get_search_backend().remove(cursor, post_id)
+
+
+def search_posts(queryset, text):
+    """
+    Filters 'queryset' to the posts matching every word in 'text',
+    annotated with their 'search_rank', higher for better matches.
+    Each word also matches as a prefix.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return no_matches(queryset)
+    return get_search_backend().filter(queryset, terms)
+
+
+class PostSearchFilter(FullTextSearchFilter):
+    """
+    Filters posts on the 'search' query parameter using the full text
+    index over title, content and author.
+    """
+    def search(self, queryset, text):
+        return search_posts(queryset, text)
@@ -1,6 +1,52 @@
+from django.conf import settings
 from rest_framework import serializers
 from .models import Post
 from likes.models import Like
+from comments.models import Comment
+from comments.serializers import CommentSerializer
+from craft_api.serializers import ImageVariantsField
+from craft_api.uploads import (
+    MAX_IMAGE_SIZE,
+    MAX_IMAGE_DIMENSION,
+    IMAGE_SIZE_ERROR,
+    IMAGE_WIDTH_ERROR,
+    IMAGE_HEIGHT_ERROR,
+)
+
+
+def comments_preview_requested(request):
+    """
+    Returns True if the request has 'include=comments_preview'.
+    """
+    if request is None:
+        return False
+    include = request.query_params.get('include', '').split(',')
+    return 'comments_preview' in include
+
+
+class PostListSerializer(serializers.ListSerializer):
+    """
+    List serializer for the Post model.
+    When the view puts 'comments_preview' in the serializer context,
+    loads the newest COMMENTS_PREVIEW_SIZE comments of every post in
+    the list in one query, embedded as each post's 'comments_preview'.
+    The previews are handed to the child through the context of this
+    call, which it shares.
+    """
+    def to_representation(self, data):
+        posts = list(data.all() if hasattr(data, 'all') else data)
+        if self.context.get('comments_preview'):
+            comments = Comment.objects.latest_per_post(
+                [post.pk for post in posts], settings.COMMENTS_PREVIEW_SIZE
+            ).with_owner_profile().order_by('-created_on', '-id')
+            previews = {post.pk: [] for post in posts}
+            serialized = CommentSerializer(
+                comments, many=True, context=self.context
+            ).data
+            for comment in serialized:
+                previews[comment['post']].append(comment)
+            self.context['comments_previews'] = previews
+        return super().to_representation(posts)
 
 
 class PostSerializer(serializers.ModelSerializer):
@@ -13,10 +59,14 @@ class PostSerializer(serializers.ModelSerializer):
     is_owner = serializers.SerializerMethodField()
     profile_id = serializers.ReadOnlyField(source='owner.profile.id')
     profile_image = serializers.ReadOnlyField(source='owner.profile.image.url')
+    profile_image_variants = ImageVariantsField(
+        source='owner.profile.image_variants'
+    )
     profile_job = serializers.ReadOnlyField(source='owner.profile.job')
     profile_location = serializers.ReadOnlyField(
         source='owner.profile.employer.location'
         )
+    image_variants = ImageVariantsField()
     like_id = serializers.SerializerMethodField()
     comments_count = serializers.ReadOnlyField()
     likes_count = serializers.ReadOnlyField()
@@ -25,18 +75,12 @@ class PostSerializer(serializers.ModelSerializer):
         """
         Validates uploaded image size.
         """
-        if value.size > 1024 * 1024 * 2:
-            raise serializers.ValidationError(
-                'Image size larger than 2MB!'
-            )
-        if value.image.width > 4096:
-            raise serializers.ValidationError(
-                'Image width larger than 4096px!'
-            )
-        if value.image.height > 4096:
-            raise serializers.ValidationError(
-                'Image height larger than 4096px!'
-            )
+        if value.size > MAX_IMAGE_SIZE:
+            raise serializers.ValidationError(IMAGE_SIZE_ERROR)
+        if value.image.width > MAX_IMAGE_DIMENSION:
+            raise serializers.ValidationError(IMAGE_WIDTH_ERROR)
+        if value.image.height > MAX_IMAGE_DIMENSION:
+            raise serializers.ValidationError(IMAGE_HEIGHT_ERROR)
         return value
 
     def get_is_owner(self, obj):
@@ -44,19 +88,34 @@ class PostSerializer(serializers.ModelSerializer):
         return request.user == obj.owner
 
     def get_like_id(self, obj):
+        """
+        Reads the 'like_id' annotation added by PostQuerySet.with_like_id,
+        falling back to a lookup for posts loaded without it.
+        """
         user = self.context['request'].user
         if user.is_authenticated:
+            if hasattr(obj, 'like_id'):
+                return obj.like_id
             like = Like.objects.filter(
                 owner=user, post=obj
             ).first()
             return like.id if like else None
         return None
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        previews = self.context.get('comments_previews')
+        if previews is not None:
+            data['comments_preview'] = previews.get(instance.pk, [])
+        return data
+
     class Meta:
         model = Post
+        list_serializer_class = PostListSerializer
         fields = [
             'id', 'owner', 'title', 'content', 'created_on',
-            'updated_on', 'image', 'is_owner', 'profile_id',
-            'profile_image', 'profile_job', 'profile_location',
-            'like_id', 'comments_count', 'likes_count',
+            'updated_on', 'image', 'image_variants', 'is_owner',
+            'profile_id', 'profile_image', 'profile_image_variants',
+            'profile_job', 'profile_location', 'like_id', 'comments_count',
+            'likes_count',
         ]
@@ -1,6 +1,12 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.contrib.auth.models import User
+from django.utils import timezone
 from ..models import Post
+from likes.models import Like
+from comments.models import Comment
 
 
 class PostModelTest(TestCase):
@@ -35,3 +41,161 @@ class PostModelTest(TestCase):
         """
         post = Post.objects.get(id=self.post.id)
         self.assertEqual(str(post), f'{post.id} {post.title}')
+
+
+class PostCounterTest(TestCase):
+    """
+    Testcase for the stored likes_count and comments_count on Post.
+    """
+    def setUp(self):
+        """
+        Setup test model instances
+        """
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpassword'
+            )
+        self.post = Post.objects.create(
+            owner=self.user,
+            title='Test Post',
+            content='This is a test post'
+            )
+
+    def test_like_updates_likes_count(self):
+        """
+        Checks likes_count is incremented when a like is created and
+        decremented when it is deleted.
+        """
+        like = Like.objects.create(owner=self.user, post=self.post)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+        like.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+
+    def test_comment_updates_comments_count(self):
+        """
+        Checks comments_count is incremented when a comment is created and
+        decremented when it is deleted.
+        """
+        comment = Comment.objects.create(
+            owner=self.user, post=self.post, content='Test comment'
+            )
+        Comment.objects.create(
+            owner=self.user, post=self.post, content='Another comment'
+            )
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 2)
+
+        comment.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 1)
+
+    def test_drifted_counts_do_not_go_below_zero(self):
+        """
+        Checks deleting a like or comment leaves a count which has
+        drifted to zero at zero.
+        """
+        like = Like.objects.create(owner=self.user, post=self.post)
+        comment = Comment.objects.create(
+            owner=self.user, post=self.post, content='Test comment'
+            )
+        Post.objects.filter(pk=self.post.pk).update(
+            likes_count=0, comments_count=0
+        )
+
+        like.delete()
+        comment.delete()
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+        self.assertEqual(self.post.comments_count, 0)
+
+    def test_reconcile_post_counts_command(self):
+        """
+        Checks the reconcile_post_counts command repairs counters
+        which have drifted from the Like and Comment tables.
+        """
+        Like.objects.create(owner=self.user, post=self.post)
+        Post.objects.filter(pk=self.post.pk).update(
+            likes_count=5, comments_count=3
+        )
+
+        call_command('reconcile_post_counts', stdout=StringIO())
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+        self.assertEqual(self.post.comments_count, 0)
+
+
+class PostTrendingScoreTest(TestCase):
+    """
+    Testcase for the stored trending_score on Post.
+    """
+    def setUp(self):
+        """
+        Setup test model instances
+        """
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpassword'
+            )
+        self.post = Post.objects.create(owner=self.user, title='Test Post')
+
+    @override_settings(TRENDING_LIKE_WEIGHT=1.0, TRENDING_COMMENT_WEIGHT=2.0)
+    def test_activity_updates_trending_score(self):
+        """
+        Checks likes and comments add their weight to the score and
+        deleting them removes it again.
+        """
+        like = Like.objects.create(owner=self.user, post=self.post)
+        Comment.objects.create(
+            owner=self.user, post=self.post, content='Test comment'
+            )
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.trending_score, 3.0)
+
+        like.delete()
+        self.post.refresh_from_db()
+        self.assertAlmostEqual(self.post.trending_score, 2.0, places=3)
+
+    @override_settings(TRENDING_LIKE_WEIGHT=1.0, TRENDING_HALF_LIFE_HOURS=24)
+    def test_deleting_old_activity_removes_decayed_weight(self):
+        """
+        Checks deleting a like made a half life ago removes only its
+        decayed weight from the score.
+        """
+        like = Like.objects.create(owner=self.user, post=self.post)
+        like.created_on = timezone.now() - timedelta(hours=24)
+        Post.objects.filter(pk=self.post.pk).update(trending_score=1.5)
+
+        like.delete()
+
+        self.post.refresh_from_db()
+        self.assertAlmostEqual(self.post.trending_score, 1.0, places=3)
+
+    @override_settings(TRENDING_HALF_LIFE_HOURS=24)
+    def test_decay_trending_scores_command(self):
+        """
+        Checks a half life of decay halves the score.
+        """
+        Post.objects.filter(pk=self.post.pk).update(trending_score=8.0)
+
+        call_command('decay_trending_scores', hours=24, stdout=StringIO())
+
+        self.post.refresh_from_db()
+        self.assertAlmostEqual(self.post.trending_score, 4.0)
+
+    @override_settings(TRENDING_LIKE_WEIGHT=1.0, TRENDING_COMMENT_WEIGHT=2.0)
+    def test_rebuild_trending_scores(self):
+        """
+        Checks --rebuild scores posts from their recent activity.
+        """
+        Like.objects.create(owner=self.user, post=self.post)
+        Post.objects.filter(pk=self.post.pk).update(trending_score=0)
+
+        call_command('decay_trending_scores', rebuild=True, stdout=StringIO())
+
+        self.post.refresh_from_db()
+        self.assertAlmostEqual(self.post.trending_score, 1.0, places=3)
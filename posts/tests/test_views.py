@@ -1,8 +1,16 @@
+from base64 import b64encode
 from rest_framework.test import APITestCase, APIClient
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework import status
 from ..models import Post
 from ..serializers import PostSerializer
+from likes.models import Like
+from companies.models import Company
+from comments.models import Comment
+from craft_api.tests.mixins import QueryCountMixin
 
 
 class PostListViewTest(APITestCase):
@@ -112,3 +120,445 @@ class PostDetailViewTest(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(Post.objects.filter(pk=self.post.pk).count(), 0)
+
+
+class PostLikeIdQueryTest(APITestCase):
+    """
+    Testcase for the batched viewer like lookup behind 'like_id'.
+    """
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpassword'
+            )
+        self.client.force_authenticate(user=self.user)
+
+    def create_liked_posts(self, count):
+        """
+        Creates 'count' posts, liking every other one.
+        """
+        for i in range(count):
+            post = Post.objects.create(owner=self.user, title=f'Post {i}')
+            if i % 2 == 0:
+                Like.objects.create(owner=self.user, post=post)
+
+    def count_like_queries(self):
+        """
+        Returns the response and number of queries touching the like
+        table for a post list request.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/posts/')
+        like_queries = [
+            query for query in context.captured_queries
+            if 'likes_like' in query['sql']
+        ]
+        return response, len(like_queries)
+
+    def test_like_id_resolved_in_list_query(self):
+        """
+        Checks like_id values are correct and the number of queries
+        reading the like table does not grow with the number of posts.
+        """
+        self.create_liked_posts(2)
+        _, small_page_queries = self.count_like_queries()
+
+        self.create_liked_posts(6)
+        response, full_page_queries = self.count_like_queries()
+
+        self.assertEqual(small_page_queries, full_page_queries)
+
+        likes = dict(Like.objects.values_list('post_id', 'id'))
+        for post in response.data['results']:
+            self.assertEqual(post['like_id'], likes.get(post['id']))
+
+
+class PostQueryCountTest(QueryCountMixin, APITestCase):
+    """
+    Testcase checking the post endpoints load owner, profile and
+    employer data in a constant number of queries.
+    """
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpassword'
+            )
+        self.company = Company.objects.create(
+            owner=self.user, name='Test Company', location='Test Location'
+            )
+        self.client.force_authenticate(user=self.user)
+
+    def create_posts(self, count):
+        """
+        Creates 'count' posts, each owned by a new employed user.
+        """
+        for _ in range(count):
+            owner = self.create_user(employer=self.company)
+            Post.objects.create(owner=owner, title=f'Post {self.user_total}')
+
+    def test_post_list_query_count_is_constant(self):
+        """
+        Checks listing 8 posts costs the same queries as listing 2.
+        """
+        self.create_posts(2)
+        _, small_page = self.count_queries('/posts/')
+
+        self.create_posts(6)
+        _, full_page = self.count_queries('/posts/')
+
+        self.assertEqual(small_page, full_page)
+
+    def test_post_detail_query_count(self):
+        """
+        Checks a post detail and its ETag are served from a single
+        query for the post.
+        """
+        self.create_posts(1)
+        post = Post.objects.get()
+
+        self.assertEqual(self.count_queries(f'/posts/{post.pk}/')[1], 1)
+
+
+class PostCursorPaginationTest(APITestCase):
+    """
+    Testcase for the cursor pagination mode of the PostList view.
+    """
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpassword'
+            )
+        for i in range(15):
+            Post.objects.create(owner=self.user, title=f'Post {i}')
+
+    def test_page_number_pagination_is_default(self):
+        """
+        Checks the post list still returns a total count by default.
+        """
+        response = self.client.get('/posts/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 15)
+
+    def test_cursor_pagination_walks_every_post(self):
+        """
+        Checks following the 'next' links in cursor mode returns every
+        post once, newest first, without a total count.
+        """
+        response = self.client.get('/posts/?pagination=cursor')
+        self.assertNotIn('count', response.data)
+
+        post_ids = [post['id'] for post in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            post_ids += [post['id'] for post in response.data['results']]
+
+        expected = list(
+            Post.objects.order_by('-created_on', '-id')
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(post_ids, expected)
+
+    def test_cursor_pagination_with_shared_timestamps(self):
+        """
+        Checks posts sharing a created_on are neither skipped nor
+        repeated when walking forward, then back through the pages.
+        """
+        Post.objects.update(created_on=timezone.now())
+        expected = list(
+            Post.objects.order_by('-created_on', '-id')
+            .values_list('id', flat=True)
+        )
+
+        response = self.client.get('/posts/?pagination=cursor')
+        pages = [[post['id'] for post in response.data['results']]]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            pages.append([post['id'] for post in response.data['results']])
+        self.assertEqual(sum(pages, []), expected)
+
+        while response.data['previous']:
+            response = self.client.get(response.data['previous'])
+            pages.pop()
+            self.assertEqual(
+                [post['id'] for post in response.data['results']],
+                pages[-1]
+            )
+
+    def test_cursor_pagination_rejects_ordering(self):
+        """
+        Checks an 'ordering' parameter in cursor mode returns a 400
+        instead of being silently ignored.
+        """
+        response = self.client.get(
+            '/posts/?pagination=cursor&ordering=likes_count'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_cursor_position(self):
+        """
+        Checks a cursor with a malformed position returns a 404.
+        """
+        cursor = b64encode(b'p=yesterday%7Cx').decode('ascii')
+
+        response = self.client.get(f'/posts/?cursor={cursor}')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PostSearchTest(APITestCase):
+    """
+    Testcase for the full text search on the PostList view.
+    """
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.user = User.objects.create_user(
+            username='woodworker',
+            password='testpassword'
+            )
+        self.title_match = Post.objects.create(
+            owner=self.user, title='Oak table', content='Finished today'
+            )
+        self.content_match = Post.objects.create(
+            owner=self.user, title='Workshop', content='Sanding oak boards'
+            )
+        self.no_match = Post.objects.create(
+            owner=self.user, title='Pine shelf', content='Quick build'
+            )
+
+    def search(self, text):
+        """
+        Returns the ids of the posts found for 'text'.
+        """
+        response = self.client.get('/posts/', {'search': text})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [post['id'] for post in response.data['results']]
+
+    def test_search_ranks_title_matches_first(self):
+        """
+        Checks content is searched and title matches rank higher.
+        """
+        self.assertEqual(
+            self.search('oak'),
+            [self.title_match.id, self.content_match.id]
+        )
+
+    def test_search_matches_author_prefix(self):
+        """
+        Checks posts are found by a prefix of their author's username.
+        """
+        self.assertEqual(len(self.search('woodwork')), 3)
+
+    def test_search_follows_updates_and_deletes(self):
+        """
+        Checks the index is kept in sync when posts are edited,
+        deleted and when their author is renamed.
+        """
+        self.no_match.title = 'Oak shelf'
+        self.no_match.save()
+        self.assertIn(self.no_match.id, self.search('oak'))
+
+        self.title_match.delete()
+        self.assertNotIn(self.title_match.id, self.search('oak'))
+
+        self.user.username = 'carpenter'
+        self.user.save()
+        self.assertEqual(self.search('woodworker'), [])
+        self.assertEqual(len(self.search('carpenter')), 2)
+
+    def test_search_runs_before_other_filters(self):
+        """
+        Checks search results are filtered and counted in full, not
+        from a truncated list of matches.
+        """
+        other = User.objects.create_user(
+            username='other', password='testpassword'
+            )
+        other_match = Post.objects.create(owner=other, title='Oak bench')
+
+        response = self.client.get(
+            '/posts/', {'search': 'oak', 'owner__profile': other.profile.id}
+        )
+
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['id'], other_match.id)
+
+    def test_user_save_without_rename_skips_reindex(self):
+        """
+        Checks saving a user without changing their username, such as
+        on login, does not re-index their posts.
+        """
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = 'Wood'
+        with CaptureQueriesContext(connection) as context:
+            user.save()
+
+        self.assertFalse(any(
+            'posts_post_fts' in query['sql']
+            for query in context.captured_queries
+        ))
+
+    def test_search_ignores_query_syntax(self):
+        """
+        Checks search characters such as quotes do not cause errors.
+        """
+        self.assertEqual(self.search('"oak* OR'), [])
+
+
+class PostTrendingViewTest(APITestCase):
+    """
+    Testcase for the PostTrending view.
+    """
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpassword'
+            )
+        self.scores = [0.5, 4.0, 2.0]
+        self.posts = [
+            Post.objects.create(
+                owner=self.user, title=f'Post {i}', trending_score=score
+            )
+            for i, score in enumerate(self.scores)
+        ]
+
+    def test_trending_posts_ordered_by_score(self):
+        """
+        Checks posts are listed highest score first.
+        """
+        response = self.client.get('/posts/trending/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [post['id'] for post in response.data],
+            [self.posts[1].id, self.posts[2].id, self.posts[0].id]
+        )
+
+    def test_trending_posts_limit(self):
+        """
+        Checks the 'limit' parameter caps the number of posts.
+        """
+        response = self.client.get('/posts/trending/?limit=1')
+
+        self.assertEqual(len(response.data), 1)
+
+
+class PostCommentsPreviewTest(QueryCountMixin, APITestCase):
+    """
+    Testcase for the 'include=comments_preview' option of the PostList
+    view.
+    """
+    def setUp(self):
+        """
+        Set up posts with comment threads of different lengths.
+        """
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpassword'
+            )
+        self.client.force_authenticate(user=self.user)
+
+    def create_post(self, comment_count):
+        """
+        Creates a post with 'comment_count' comments.
+        """
+        post = Post.objects.create(owner=self.user, title='Test post')
+        for i in range(comment_count):
+            Comment.objects.create(
+                owner=self.user, post=post, content=f'comment {i}'
+            )
+        return post
+
+    def test_previews_hold_newest_comments_per_post(self):
+        """
+        Checks each post embeds its newest comments, newest first,
+        capped at COMMENTS_PREVIEW_SIZE.
+        """
+        long_thread = self.create_post(5)
+        short_thread = self.create_post(1)
+        no_thread = self.create_post(0)
+
+        with self.settings(COMMENTS_PREVIEW_SIZE=3):
+            response = self.client.get('/posts/?include=comments_preview')
+
+        previews = {
+            post['id']: [comment['id'] for comment in post['comments_preview']]
+            for post in response.data['results']
+        }
+        for post, size in [(long_thread, 3), (short_thread, 1)]:
+            expected = list(
+                Comment.objects.filter(post=post)
+                .order_by('-created_on', '-id')
+                .values_list('id', flat=True)[:size]
+            )
+            self.assertEqual(previews[post.id], expected)
+        self.assertEqual(previews[no_thread.id], [])
+
+    def test_previews_not_included_by_default(self):
+        """
+        Checks posts have no 'comments_preview' unless requested.
+        """
+        self.create_post(2)
+
+        response = self.client.get('/posts/')
+
+        self.assertNotIn('comments_preview', response.data['results'][0])
+
+    def test_post_list_varies_on_timestamp_format(self):
+        """
+        Checks the list, whose previews follow the timestamp format
+        header, says so in Vary.
+        """
+        self.create_post(1)
+
+        response = self.client.get(
+            '/posts/?include=comments_preview', HTTP_X_TIMESTAMP_FORMAT='iso'
+        )
+
+        self.assertIn('X-Timestamp-Format', response['Vary'])
+        self.assertTrue(
+            response.data['results'][0]['comments_preview'][0]['created_on']
+            .endswith('Z')
+        )
+
+    def test_previews_only_offered_by_post_list(self):
+        """
+        Checks other post lists, such as trending, ignore the option.
+        """
+        self.create_post(2)
+
+        response = self.client.get('/posts/trending/?include=comments_preview')
+
+        self.assertNotIn('comments_preview', response.data[0])
+
+    def test_previews_query_count_is_constant(self):
+        """
+        Checks previews for 6 posts cost the same queries as for 1.
+        """
+        self.create_post(4)
+        _, small_page = self.count_queries(
+            '/posts/?include=comments_preview'
+        )
+
+        for _ in range(5):
+            self.create_post(4)
+        _, full_page = self.count_queries(
+            '/posts/?include=comments_preview'
+        )
+
+        self.assertEqual(small_page, full_page)
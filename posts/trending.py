@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+
+def score_change(weight):
+    """
+    Returns the update() kwargs which add 'weight' to a post's
+    trending_score, never letting it drop below zero.
+    """
+    return {
+        'trending_score': Greatest(
+            F('trending_score') + weight, Value(0.0),
+            output_field=FloatField(),
+        )
+    }
+
+
+def removed_score_change(weight, created_on):
+    """
+    Returns the update() kwargs which take an item of 'weight' created
+    at 'created_on' back out of a post's trending_score. The score has
+    decayed since, so only the item's decayed contribution is removed.
+    """
+    hours = (timezone.now() - created_on).total_seconds() / 3600
+    return score_change(-weight * decay_factor(hours))
+
+
+def decay_factor(hours):
+    """
+    Returns the multiplier which decays a score by 'hours' worth of
+    TRENDING_HALF_LIFE_HOURS.
+    """
+    return 0.5 ** (hours / settings.TRENDING_HALF_LIFE_HOURS)
@@ -1,25 +1,39 @@
-from django.db.models import Count
+from django.conf import settings
 from rest_framework import generics, permissions, filters
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Post
-from .serializers import PostSerializer
+from .serializers import PostSerializer, comments_preview_requested
+from .search import PostSearchFilter
 from craft_api.permissions import IsOwnerOrReadOnly
+from craft_api.pagination import PageNumberOrCursorPagination
+from craft_api.uploads import ImageUploadLimitMixin
+from craft_api.conditional import ConditionalRetrieveMixin
+from craft_api.timestamps import TimestampFormatMixin
 
 
-class PostList(generics.ListCreateAPIView):
+class PostList(
+        TimestampFormatMixin, ImageUploadLimitMixin,
+        generics.ListCreateAPIView
+):
     """
     List all posts.
     Allows for the post creation within the 'post' method
+    Pass 'pagination=cursor' to page through the feed with cursors
+    instead of page numbers.
+    'search' results come from the full text index over title, content
+    and author, ranked by relevance.
+    Pass 'include=comments_preview' to embed each post's newest
+    comments. Only this view offers it, the other post lists such as
+    the timeline and trending ignore it. The previews' timestamps
+    follow the 'timestamps' parameter or X-Timestamp-Format header.
     """
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    queryset = Post.objects.annotate(
-        comments_count=Count('comment', distinct=True),
-        likes_count=Count('like', distinct=True)
-    ).order_by('-created_on')
+    pagination_class = PageNumberOrCursorPagination
+    queryset = Post.objects.with_owner_profile().order_by('-created_on')
     filter_backends = [
         filters.OrderingFilter,
-        filters.SearchFilter,
+        PostSearchFilter,
         DjangoFilterBackend,
     ]
     ordering_fields = [
@@ -27,29 +41,74 @@ class PostList(generics.ListCreateAPIView):
         'likes_count',
         'like__created_on',
     ]
-    search_fields = [
-        'owner__username',
-        'title',
-    ]
     filterset_fields = [
         'owner__followed__owner__profile',
         'like__owner__profile',
         'owner__profile',
     ]
 
+    def get_queryset(self):
+        return super().get_queryset().with_like_id(self.request.user)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['comments_preview'] = comments_preview_requested(
+            self.request
+        )
+        return context
+
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
 
-class PostDetail(generics.RetrieveUpdateDestroyAPIView):
+class PostDetail(
+        ConditionalRetrieveMixin, ImageUploadLimitMixin,
+        generics.RetrieveUpdateDestroyAPIView
+):
     """
     List all post details.
     Allows editing of a post if user is the owner, as well as
     deletions.
+    Supports conditional GET requests with ETag.
     """
     serializer_class = PostSerializer
     permission_classes = [IsOwnerOrReadOnly]
-    queryset = Post.objects.annotate(
-        comments_count=Count('comment', distinct=True),
-        likes_count=Count('like', distinct=True)
-    ).order_by('-created_on')
+    queryset = Post.objects.with_owner_profile().order_by('-created_on')
+    validator_fields = (
+        'updated_on', 'likes_count', 'comments_count', 'image_variants',
+        'owner__username', 'owner__profile__updated_on',
+        'owner__profile__image_variants',
+        'owner__profile__employer__updated_on',
+    )
+
+    def get_queryset(self):
+        return super().get_queryset().with_like_id(self.request.user)
+
+    def get_validator_fields(self):
+        if self.request.user.is_authenticated:
+            return self.validator_fields + ('like_id',)
+        return self.validator_fields
+
+
+class PostTrending(generics.ListAPIView):
+    """
+    List the top trending posts, highest trending_score first.
+    Use 'limit' to request up to 50 posts, the default is
+    TRENDING_LIMIT.
+    """
+    serializer_class = PostSerializer
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = None
+    max_limit = 50
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params['limit'])
+        except (KeyError, ValueError):
+            return settings.TRENDING_LIMIT
+        return min(max(limit, 1), self.max_limit)
+
+    def get_queryset(self):
+        return Post.objects.with_owner_profile().with_like_id(
+            self.request.user
+        ).order_by('-trending_score', '-id')[:self.get_limit()]
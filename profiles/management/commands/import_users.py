@@ -0,0 +1,173 @@
+import csv
+import json
+import multiprocessing
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from companies.models import Company, change_employee_count
+from profiles.models import Profile, ProfileStats
+from profiles.search import profile_document, index_profile
+
+
+def read_rows(path):
+    """
+    Returns the rows of a .csv file with a header line, or of a
+    .jsonl file with one JSON object per line, as dicts.
+    """
+    with open(path, newline='', encoding='utf-8') as file:
+        if path.endswith('.jsonl'):
+            return [json.loads(line) for line in file if line.strip()]
+        return list(csv.DictReader(file))
+
+
+def hash_password(password):
+    """
+    Returns the hashed password, or an unusable password when blank.
+    """
+    return make_password(password or None)
+
+
+class Command(BaseCommand):
+    """
+    Imports users and their profiles from a CSV or JSONL file.
+    Each row needs a 'username' and may have 'password', 'email',
+    'name', 'job', 'bio' and 'employer', a Company id.
+    Users, profiles and profile stats are inserted with bulk_create
+    in chunks, giving the same rows the create_profile and
+    create_profile_stats signals would, without a query per user.
+    Existing and repeated usernames are skipped.
+    """
+    help = 'Bulk import users and profiles from a .csv or .jsonl file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='The .csv or .jsonl file.')
+        parser.add_argument(
+            '--employer', type=int,
+            help='Company id employing rows without an employer.',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Number of users inserted per transaction.',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Number of processes hashing passwords.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            rows = read_rows(options['path'])
+        except (OSError, ValueError) as error:
+            raise CommandError(f'Could not read {options["path"]}: {error}')
+        rows = self.new_rows(rows)
+        companies = self.get_companies(rows, options['employer'])
+
+        passwords = [row.get('password') for row in rows]
+        if options['workers'] > 1:
+            # Workers are forked with the configured Django project.
+            context = multiprocessing.get_context('fork')
+            with ProcessPoolExecutor(
+                options['workers'], mp_context=context
+            ) as executor:
+                passwords = list(executor.map(
+                    hash_password, passwords, chunksize=100
+                ))
+        else:
+            passwords = [hash_password(password) for password in passwords]
+
+        size = options['chunk_size']
+        for start in range(0, len(rows), size):
+            self.import_chunk(
+                rows[start:start + size],
+                passwords[start:start + size],
+                companies,
+                options['employer'],
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f'Imported {len(rows)} users.')
+        )
+
+    def new_rows(self, rows):
+        """
+        Returns the rows whose username is not taken, warning about
+        the rest.
+        """
+        usernames = [row.get('username') for row in rows]
+        if not all(usernames):
+            raise CommandError('Every row needs a username.')
+        taken = set(User.objects.filter(
+            username__in=usernames
+        ).values_list('username', flat=True))
+        new_rows = []
+        for row in rows:
+            username = row['username']
+            if username in taken:
+                self.stderr.write(f'Skipping taken username {username}.')
+                continue
+            taken.add(username)
+            new_rows.append(row)
+        return new_rows
+
+    def get_companies(self, rows, default_employer):
+        """
+        Returns {id: Company} for every employer used by the rows.
+        """
+        ids = {int(row['employer']) for row in rows if row.get('employer')}
+        if default_employer:
+            ids.add(default_employer)
+        companies = Company.objects.in_bulk(ids)
+        missing = ids - set(companies)
+        if missing:
+            raise CommandError(
+                f'Unknown employer ids: {sorted(missing)}'
+            )
+        return companies
+
+    @transaction.atomic
+    def import_chunk(self, rows, passwords, companies, default_employer):
+        users = User.objects.bulk_create([
+            User(
+                username=row['username'],
+                email=row.get('email') or '',
+                password=password,
+            )
+            for row, password in zip(rows, passwords)
+        ])
+        # Only some databases set the pk of bulk created rows.
+        user_ids = dict(User.objects.filter(
+            username__in=[user.username for user in users]
+        ).values_list('username', 'pk'))
+        for user in users:
+            user.pk = user_ids[user.username]
+
+        profiles = []
+        for user, row in zip(users, rows):
+            employer = row.get('employer') or default_employer
+            profile = Profile(
+                owner=user,
+                name=row.get('name') or '',
+                job=row.get('job') or '',
+                bio=row.get('bio') or '',
+                employer=companies[int(employer)] if employer else None,
+            )
+            profile.search_document = profile_document(profile)
+            profiles.append(profile)
+        Profile.objects.bulk_create(profiles)
+        profile_ids = dict(Profile.objects.filter(
+            owner__in=user_ids.values()
+        ).values_list('owner', 'pk'))
+        ProfileStats.objects.bulk_create([
+            ProfileStats(profile_id=pk) for pk in profile_ids.values()
+        ])
+        for profile in profiles:
+            profile.pk = profile_ids[profile.owner_id]
+            index_profile(profile.pk, profile.search_document)
+        employees = Counter(
+            profile.employer_id for profile in profiles if profile.employer_id
+        )
+        for company_id, count in employees.items():
+            change_employee_count(company_id, count)
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef
+from craft_api.cache import bump_version
+from craft_api.querysets import SubqueryCount
+from profiles.models import Profile, ProfileStats
+from posts.models import Post
+from followers.models import Follower
+from approvals.models import Approval
+from companies.models import Company
+
+
+def reconcile_profile_stats():
+    """
+    Creates any missing ProfileStats rows, then recalculates every
+    count in a single UPDATE statement.
+    Returns the number of stats rows updated.
+    """
+    ProfileStats.objects.bulk_create(
+        [
+            ProfileStats(profile_id=pk)
+            for pk in Profile.objects.filter(
+                stats__isnull=True
+            ).values_list('pk', flat=True)
+        ],
+        batch_size=500,
+    )
+    profile = OuterRef('profile_id')
+    return ProfileStats.objects.update(
+        posts_count=SubqueryCount(
+            Post.objects.filter(owner__profile=profile)
+        ),
+        followers_count=SubqueryCount(
+            Follower.objects.filter(followed__profile=profile)
+        ),
+        following_count=SubqueryCount(
+            Follower.objects.filter(owner__profile=profile)
+        ),
+        approval_count=SubqueryCount(
+            Approval.objects.filter(profile=profile)
+        ),
+        companies_count=SubqueryCount(
+            Company.objects.filter(owner__profile=profile)
+        ),
+    )
+
+
+class Command(BaseCommand):
+    """
+    Backfills or repairs ProfileStats from the Post, Follower and
+    Approval tables.
+    """
+    help = 'Recalculate the stored profile stats.'
+
+    def handle(self, *args, **options):
+        updated = reconcile_profile_stats()
+        bump_version(Profile._meta.label_lower)
+        self.stdout.write(
+            self.style.SUCCESS(f'Reconciled stats for {updated} profiles.')
+        )
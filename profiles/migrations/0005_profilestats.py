@@ -0,0 +1,89 @@
+# Generated by Django 3.2.22 on 2026-10-17 23:16
+
+from django.db import migrations, models
+from django.db.models import F, Func, OuterRef, Subquery
+import django.db.models.deletion
+
+
+def count_rows(queryset):
+    """
+    Returns a subquery counting the rows of 'queryset', which is
+    filtered on an OuterRef.
+    """
+    return Subquery(
+        queryset.order_by()
+        .annotate(count=Func(F('pk'), function='COUNT'))
+        .values('count')
+    )
+
+
+def backfill_stats(apps, schema_editor):
+    """
+    Creates the stats row of every profile and counts its posts,
+    followers, follows and approvals.
+    """
+    Profile = apps.get_model('profiles', 'Profile')
+    ProfileStats = apps.get_model('profiles', 'ProfileStats')
+    Post = apps.get_model('posts', 'Post')
+    Follower = apps.get_model('followers', 'Follower')
+    Approval = apps.get_model('approvals', 'Approval')
+    ProfileStats.objects.bulk_create(
+        [
+            ProfileStats(profile_id=pk)
+            for pk in Profile.objects.values_list('pk', flat=True)
+        ],
+        batch_size=500,
+    )
+    profile = OuterRef('profile_id')
+    ProfileStats.objects.update(
+        posts_count=count_rows(Post.objects.filter(owner__profile=profile)),
+        followers_count=count_rows(
+            Follower.objects.filter(followed__profile=profile)
+        ),
+        following_count=count_rows(
+            Follower.objects.filter(owner__profile=profile)
+        ),
+        approval_count=count_rows(
+            Approval.objects.filter(profile=profile)
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0004_image_variants'),
+        ('posts', '0001_initial'),
+        ('followers', '0001_initial'),
+        ('approvals', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileStats',
+            fields=[
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='profiles.profile')),
+                ('posts_count', models.PositiveIntegerField(default=0)),
+                ('followers_count', models.PositiveIntegerField(default=0)),
+                ('following_count', models.PositiveIntegerField(default=0)),
+                ('approval_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='profilestats',
+            index=models.Index(fields=['posts_count'], name='stats_posts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profilestats',
+            index=models.Index(fields=['followers_count'], name='stats_followers_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profilestats',
+            index=models.Index(fields=['following_count'], name='stats_following_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profilestats',
+            index=models.Index(fields=['approval_count'], name='stats_approval_idx'),
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
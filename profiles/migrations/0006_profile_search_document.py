@@ -0,0 +1,37 @@
+# Generated by Django 3.2.22 on 2026-10-17 23:23
+
+from django.db import migrations, models
+
+
+def create_search_index(apps, schema_editor):
+    from profiles.search import get_search_backend, profile_document
+    Profile = apps.get_model('profiles', 'Profile')
+    profiles = Profile.objects.select_related('owner', 'employer')
+    for profile in profiles.iterator():
+        Profile.objects.filter(pk=profile.pk).update(
+            search_document=profile_document(profile)
+        )
+    with schema_editor.connection.cursor() as cursor:
+        get_search_backend(schema_editor.connection).create(cursor)
+
+
+def drop_search_index(apps, schema_editor):
+    from profiles.search import get_search_backend
+    with schema_editor.connection.cursor() as cursor:
+        get_search_backend(schema_editor.connection).drop(cursor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0005_profilestats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='search_document',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 3.2.22 on 2026-10-17 23:31
+
+from django.db import migrations, models
+from django.db.models import F, Func, OuterRef, Subquery
+
+
+def backfill_companies_count(apps, schema_editor):
+    """
+    Counts the companies owned by each profile's user.
+    """
+    ProfileStats = apps.get_model('profiles', 'ProfileStats')
+    Company = apps.get_model('companies', 'Company')
+    ProfileStats.objects.update(companies_count=Subquery(
+        Company.objects.filter(owner__profile=OuterRef('profile_id'))
+        .order_by()
+        .annotate(count=Func(F('pk'), function='COUNT'))
+        .values('count')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0006_profile_search_document'),
+        ('companies', '0004_company_name_location_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profilestats',
+            name='companies_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(
+            backfill_companies_count, migrations.RunPython.noop
+        ),
+    ]
@@ -1,7 +1,32 @@
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import (
+    pre_save, post_save, pre_delete, post_delete
+)
 from django.contrib.auth.models import User
 from companies.models import Company
+from craft_api.cache import bump_version
+from craft_api.derivatives import schedule_derivatives
+from craft_api.users import username_changed
+from .search import profile_document, index_profile, remove_profile
+
+
+class ProfileQuerySet(models.QuerySet):
+    """
+    QuerySet for the Profile model.
+    """
+    def with_stats(self):
+        """
+        Annotates each profile with the counts stored on its
+        ProfileStats, so they can be serialized and ordered on.
+        """
+        return self.annotate(
+            posts_count=F('stats__posts_count'),
+            followers_count=F('stats__followers_count'),
+            following_count=F('stats__following_count'),
+            approval_count=F('stats__approval_count'),
+        )
 
 
 class Profile(models.Model):
@@ -10,6 +35,9 @@ class Profile(models.Model):
     Image set to a default user icon, for new users.
     Ordering set to 'name' to enable easy searching
     when in list view.
+    'image_variants' holds the urls of the resized copies of 'image'.
+    'search_document' is the text searched by ProfileSearchFilter,
+    rebuilt on save and when the owner or employer changes.
     """
     owner = models.OneToOneField(User, on_delete=models.CASCADE)
     name = models.CharField(max_length=75, blank=True)
@@ -24,6 +52,10 @@ class Profile(models.Model):
     image = models.ImageField(
         upload_to='images/', default='../user_defualt_icon_d7nivg.png'
     )
+    image_variants = models.JSONField(default=dict, blank=True)
+    search_document = models.TextField(blank=True, editable=False)
+
+    objects = ProfileQuerySet.as_manager()
 
     class Meta:
         ordering = ['-created_on']
@@ -31,6 +63,52 @@ class Profile(models.Model):
     def __str__(self):
         return f"{self.owner}'s profile"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Records the employer a profile was loaded with, so a change
+        of employer can be told apart on save.
+        """
+        instance = super().from_db(db, field_names, values)
+        if 'employer_id' in field_names:
+            instance.loaded_employer_id = instance.employer_id
+        return instance
+
+
+class ProfileStats(models.Model):
+    """
+    ProfileStats model, related to 'profile' one to one.
+    Stored counts of the profile owner's posts, followers, followed
+    users, approvals and companies, kept current by the Post, Follower,
+    Approval and Company signals below.
+    """
+    profile = models.OneToOneField(
+        Profile, on_delete=models.CASCADE, primary_key=True,
+        related_name='stats'
+        )
+    posts_count = models.PositiveIntegerField(default=0)
+    followers_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
+    approval_count = models.PositiveIntegerField(default=0)
+    companies_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['posts_count'], name='stats_posts_idx'),
+            models.Index(
+                fields=['followers_count'], name='stats_followers_idx'
+            ),
+            models.Index(
+                fields=['following_count'], name='stats_following_idx'
+            ),
+            models.Index(
+                fields=['approval_count'], name='stats_approval_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.profile} stats"
+
 
 def create_profile(sender, instance, created, **kwargs):
     """
@@ -40,4 +118,180 @@ def create_profile(sender, instance, created, **kwargs):
         Profile.objects.create(owner=instance)
 
 
+def create_profile_stats(sender, instance, created, **kwargs):
+    """
+    Creates the profile stats instance when a profile is created.
+    """
+    if created:
+        ProfileStats.objects.create(profile=instance)
+
+
+def bump_profile_versions(profile_ids):
+    """
+    Invalidates the cached representations of the profiles.
+    """
+    for pk in profile_ids:
+        bump_version(Profile._meta.label_lower, pk)
+
+
+def profile_changed(sender, instance, **kwargs):
+    """
+    Invalidates a profile's cached representation when it is saved
+    or deleted.
+    """
+    bump_profile_versions([instance.pk])
+
+
+def refresh_search_documents(profiles):
+    """
+    Rebuilds and re-indexes the search documents of 'profiles'
+    in one bulk update, without touching their other fields.
+    """
+    profiles = list(profiles.select_related('owner', 'employer'))
+    for profile in profiles:
+        profile.search_document = profile_document(profile)
+    Profile.objects.bulk_update(
+        profiles, ['search_document'], batch_size=500
+    )
+    for profile in profiles:
+        index_profile(profile.pk, profile.search_document)
+
+
+def build_search_document(sender, instance, **kwargs):
+    """
+    Builds the profile's search document before it is saved.
+    """
+    instance.search_document = profile_document(instance)
+
+
+def update_search_index(sender, instance, **kwargs):
+    """
+    Re-indexes a profile's search document when it is saved.
+    """
+    index_profile(instance.pk, instance.search_document)
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    """
+    Removes a deleted profile from the search index.
+    """
+    remove_profile(instance.pk)
+
+
+def reindex_owner_profile(sender, instance, created, update_fields, **kwargs):
+    """
+    Rebuilds a user's profile document, and invalidates its cached
+    representation, when their username changed.
+    """
+    if created or not username_changed(instance):
+        return
+    profiles = Profile.objects.filter(owner=instance)
+    refresh_search_documents(profiles)
+    bump_profile_versions(profiles.values_list('pk', flat=True))
+
+
+def reindex_employees(sender, instance, created, **kwargs):
+    """
+    Rebuilds the documents of a company's employees when its name or
+    location changed, and invalidates their cached representations.
+    """
+    if created or not instance.name_location_changed:
+        return
+    refresh_search_documents(instance.current_employee.all())
+    bump_profile_versions(
+        instance.current_employee.values_list('pk', flat=True)
+    )
+
+
+def collect_employees(sender, instance, **kwargs):
+    """
+    Stores a company's employee ids before it is deleted, as their
+    employer is then cleared without saving the profiles.
+    """
+    instance.employee_ids = list(
+        instance.current_employee.values_list('pk', flat=True)
+    )
+
+
+def reindex_former_employees(sender, instance, **kwargs):
+    """
+    Rebuilds the documents of a deleted company's former employees,
+    and invalidates their cached representations.
+    """
+    refresh_search_documents(
+        Profile.objects.filter(pk__in=instance.employee_ids)
+    )
+    bump_profile_versions(instance.employee_ids)
+
+
+def update_stats(count_field, change, **lookup):
+    """
+    Adds 'change' to 'count_field' on the stats matching 'lookup',
+    never below zero, invalidating their profiles' cached
+    representations.
+    """
+    stats = ProfileStats.objects.filter(**lookup)
+    stats.update(**{count_field: Greatest(F(count_field) + change, 0)})
+    bump_profile_versions(stats.values_list('profile', flat=True))
+
+
+def post_created(sender, instance, created, **kwargs):
+    if created:
+        update_stats('posts_count', 1, profile__owner=instance.owner_id)
+
+
+def post_deleted(sender, instance, **kwargs):
+    update_stats('posts_count', -1, profile__owner=instance.owner_id)
+
+
+def follower_created(sender, instance, created, **kwargs):
+    if created:
+        update_stats('following_count', 1, profile__owner=instance.owner_id)
+        update_stats(
+            'followers_count', 1, profile__owner=instance.followed_id
+        )
+
+
+def follower_deleted(sender, instance, **kwargs):
+    update_stats('following_count', -1, profile__owner=instance.owner_id)
+    update_stats('followers_count', -1, profile__owner=instance.followed_id)
+
+
+def approval_created(sender, instance, created, **kwargs):
+    if created:
+        update_stats('approval_count', 1, profile=instance.profile_id)
+
+
+def approval_deleted(sender, instance, **kwargs):
+    update_stats('approval_count', -1, profile=instance.profile_id)
+
+
+def company_created(sender, instance, created, **kwargs):
+    if created:
+        update_stats('companies_count', 1, profile__owner=instance.owner_id)
+
+
+def company_deleted(sender, instance, **kwargs):
+    update_stats('companies_count', -1, profile__owner=instance.owner_id)
+
+
 post_save.connect(create_profile, sender=User)
+post_save.connect(create_profile_stats, sender=Profile)
+post_save.connect(post_created, sender='posts.Post')
+post_delete.connect(post_deleted, sender='posts.Post')
+post_save.connect(follower_created, sender='followers.Follower')
+post_delete.connect(follower_deleted, sender='followers.Follower')
+post_save.connect(approval_created, sender='approvals.Approval')
+post_delete.connect(approval_deleted, sender='approvals.Approval')
+post_save.connect(company_created, sender=Company)
+post_delete.connect(company_deleted, sender=Company)
+post_save.connect(schedule_derivatives, sender=Profile)
+pre_save.connect(build_search_document, sender=Profile)
+post_save.connect(profile_changed, sender=Profile)
+post_delete.connect(profile_changed, sender=Profile)
+post_save.connect(update_search_index, sender=Profile)
+post_delete.connect(remove_from_search_index, sender=Profile)
+post_save.connect(reindex_owner_profile, sender=User)
+post_save.connect(reindex_employees, sender=Company)
+pre_delete.connect(collect_employees, sender=Company)
+post_delete.connect(reindex_former_employees, sender=Company)
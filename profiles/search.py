@@ -0,0 +1,242 @@
+import threading
+from collections import Counter, defaultdict
+from django.db import connection, transaction
+from django.db.models import BooleanField, Case, FloatField, Value, When
+from django.db.models.expressions import RawSQL
+from craft_api.search import (
+    FullTextSearchFilter, no_matches, search_terms
+)
+
+FUZZY_MATCH_THRESHOLD = 0.5
+
+
+def profile_document(profile):
+    """
+    Returns the lower case search document of a profile: its owner's
+    username, name, job and employer's name and location.
+    """
+    employer = profile.employer
+    parts = [profile.owner.username, profile.name, profile.job]
+    if employer is not None:
+        parts += [employer.name, employer.location]
+    return ' '.join(part for part in parts if part).lower()
+
+
+def trigrams(word, pad_end=True):
+    """
+    Returns the set of trigrams in a word, padded with two spaces
+    in front so short prefixes have trigrams too.
+    The end is left open for search terms, which may be a prefix.
+    """
+    padded = f'  {word} ' if pad_end else f'  {word}'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NGramProfileSearchBackend:
+    """
+    Prefix and fuzzy search for profiles on SQLite, used in DEV mode.
+    Holds an in-process trigram index of every profile's search
+    document, loaded from the database on the first search and kept
+    current by the Profile signals once their writes commit.
+    The index is per process: writes made by another process are not
+    seen until this one restarts, so it suits the single DEV server
+    only.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """
+        Empties the index, so it is reloaded on the next search.
+        """
+        self.loaded = False
+        self.documents = {}
+        self.postings = defaultdict(set)
+
+    def create(self, cursor):
+        # The index is built in memory on the first search.
+        pass
+
+    def drop(self, cursor):
+        pass
+
+    def load(self, cursor):
+        cursor.execute(
+            "SELECT id, search_document FROM profiles_profile"
+        )
+        for profile_id, document in cursor.fetchall():
+            self.add(profile_id, document)
+        self.loaded = True
+
+    def add(self, profile_id, document):
+        self.documents[profile_id] = document
+        for word in document.split():
+            for gram in trigrams(word):
+                self.postings[gram].add(profile_id)
+
+    def discard(self, profile_id):
+        document = self.documents.pop(profile_id, '')
+        for word in document.split():
+            for gram in trigrams(word):
+                self.postings[gram].discard(profile_id)
+
+    def index(self, profile_id, document):
+        with self.lock:
+            if self.loaded:
+                self.discard(profile_id)
+                self.add(profile_id, document)
+
+    def remove(self, profile_id):
+        with self.lock:
+            self.discard(profile_id)
+
+    def match(self, term):
+        """
+        Returns {profile_id: score} for the profiles sharing at least
+        FUZZY_MATCH_THRESHOLD of the term's trigrams. A word starting
+        with the term scores an extra point.
+        """
+        grams = trigrams(term, pad_end=False)
+        hits = Counter()
+        for gram in grams:
+            hits.update(self.postings.get(gram, ()))
+        scores = {}
+        for profile_id, count in hits.items():
+            score = count / len(grams)
+            if score < FUZZY_MATCH_THRESHOLD:
+                continue
+            words = self.documents[profile_id].split()
+            if any(word.startswith(term) for word in words):
+                score += 1
+            scores[profile_id] = score
+        return scores
+
+    def scores(self, terms):
+        """
+        Returns {profile_id: score} for the profiles matching every
+        term.
+        """
+        with self.lock:
+            if not self.loaded:
+                with connection.cursor() as cursor:
+                    self.load(cursor)
+            totals = None
+            for term in terms:
+                scores = self.match(term)
+                if totals is None:
+                    totals = scores
+                else:
+                    totals = {
+                        pk: totals[pk] + score
+                        for pk, score in scores.items() if pk in totals
+                    }
+        return totals
+
+    def filter(self, queryset, terms):
+        scores = self.scores(terms)
+        if not scores:
+            return no_matches(queryset)
+        return queryset.filter(pk__in=list(scores)).annotate(
+            search_rank=Case(
+                *[
+                    When(pk=pk, then=Value(score))
+                    for pk, score in scores.items()
+                ],
+                output_field=FloatField(),
+            )
+        )
+
+
+class PostgresProfileSearchBackend:
+    """
+    Prefix and fuzzy search for profiles on PostgreSQL.
+    Serves 'search_document' substring matches and pg_trgm word
+    similarity from a trigram GIN index on the column.
+    """
+    def create(self, cursor):
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS profiles_profile_search_trgm_idx "
+            "ON profiles_profile USING gin (search_document gin_trgm_ops)"
+        )
+
+    def drop(self, cursor):
+        cursor.execute(
+            "DROP INDEX IF EXISTS profiles_profile_search_trgm_idx"
+        )
+
+    def index(self, profile_id, document):
+        # The document is stored on the profile row and indexed there.
+        pass
+
+    def remove(self, profile_id):
+        pass
+
+    def filter(self, queryset, terms):
+        document = 'profiles_profile.search_document'
+        conditions = ' AND '.join(
+            f"({document} ILIKE %s OR %s <%% {document})" for _ in terms
+        )
+        rank = ' + '.join(
+            f"word_similarity(%s, {document})" for _ in terms
+        )
+        params = []
+        for term in terms:
+            params += ['%' + term.replace('_', '\\_') + '%', term]
+        return queryset.filter(
+            RawSQL(conditions, params, output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(rank, terms, output_field=FloatField())
+        )
+
+
+ngram_backend = NGramProfileSearchBackend()
+
+
+def get_search_backend(db_connection=connection):
+    """
+    Returns the search backend for the database in use.
+    """
+    if db_connection.vendor == 'postgresql':
+        return PostgresProfileSearchBackend()
+    return ngram_backend
+
+
+def index_profile(profile_id, document):
+    """
+    Writes a profile's search document to the index once the
+    transaction commits, so rolled back writes never reach it.
+    """
+    backend = get_search_backend()
+    transaction.on_commit(lambda: backend.index(profile_id, document))
+
+
+def remove_profile(profile_id):
+    """
+    Removes a profile from the index once the transaction commits.
+    """
+    backend = get_search_backend()
+    transaction.on_commit(lambda: backend.remove(profile_id))
+
+
+def search_profiles(queryset, text):
+    """
+    Filters 'queryset' to the profiles matching every word in 'text',
+    annotated with their 'search_rank', higher for better matches.
+    Each word matches as a prefix or, allowing for typos, by shared
+    trigrams.
+    """
+    terms = [term.lower() for term in search_terms(text)]
+    if not terms:
+        return no_matches(queryset)
+    return get_search_backend().filter(queryset, terms)
+
+
+class ProfileSearchFilter(FullTextSearchFilter):
+    """
+    Filters profiles on the 'search' query parameter using the
+    profile search index.
+    """
+    def search(self, queryset, text):
+        return search_profiles(queryset, text)
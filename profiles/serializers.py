@@ -1,8 +1,27 @@
 from rest_framework import serializers
 from .models import Profile
 from companies.models import Company
-from followers.models import Follower
-from approvals.models import Approval
+from craft_api.relationships import profile_relationships
+from craft_api.serializers import ImageVariantsField
+
+
+class ProfileListSerializer(serializers.ListSerializer):
+    """
+    List serializer for the Profile model.
+    Resolves the request user's follows and approvals for every
+    profile in the list with two queries, before serializing them,
+    unless the view has removed those fields.
+    """
+    def to_representation(self, data):
+        profiles = list(data.all() if hasattr(data, 'all') else data)
+        fields = self.child.fields
+        if 'following_id' not in fields and 'approval_id' not in fields:
+            return super().to_representation(profiles)
+        self.child.relationships = profile_relationships(
+            self.context['request'].user,
+            [profile.pk for profile in profiles],
+        )
+        return super().to_representation(profiles)
 
 
 class ProfileSerializer(serializers.ModelSerializer):
@@ -19,34 +38,38 @@ class ProfileSerializer(serializers.ModelSerializer):
     following_count = serializers.ReadOnlyField()
     approval_count = serializers.ReadOnlyField()
     employer_pk = serializers.ReadOnlyField(source='employer.pk')
+    image_variants = ImageVariantsField()
 
     def get_is_owner(self, obj):
         request = self.context['request']
         return request.user == obj.owner
 
+    def get_relationship(self, obj):
+        """
+        Returns the request user's following and approval ids for the
+        profile. When serializing many profiles these are resolved for
+        the whole page at once by ProfileListSerializer.
+        """
+        if not hasattr(self, 'relationships'):
+            self.relationships = {}
+        if obj.pk not in self.relationships:
+            self.relationships.update(profile_relationships(
+                self.context['request'].user, [obj.pk]
+            ))
+        return self.relationships[obj.pk]
+
     def get_following_id(self, obj):
-        user = self.context['request'].user
-        if user.is_authenticated:
-            following = Follower.objects.filter(
-                owner=user, followed=obj.owner
-            ).first()
-            return following.id if following else None
-        return None
+        return self.get_relationship(obj)['following_id']
 
     def get_approval_id(self, obj):
-        user = self.context['request'].user
-        if user.is_authenticated:
-            approval = Approval.objects.filter(
-                owner=user, profile=obj
-            ).first()
-            return approval.id if approval else None
-        return None
+        return self.get_relationship(obj)['approval_id']
 
     class Meta:
         model = Profile
+        list_serializer_class = ProfileListSerializer
         fields = [
             'id', 'owner', 'name', 'bio', 'job',
-            'created_on', 'updated_on', 'image',
+            'created_on', 'updated_on', 'image', 'image_variants',
             'is_owner', 'employer', 'following_id',
             'approval_id', 'posts_count', 'following_count',
             'followers_count', 'approval_count', 'employer_pk',
@@ -56,13 +79,17 @@ class ProfileSerializer(serializers.ModelSerializer):
         """
         Convert profile employer field from company.pk into
         company.name and company.location in a readable string format.
+        Reads the employer loaded with the profile, so views should
+        select_related('employer').
         """
         data = super().to_representation(instance)
-        employer_pk = data.get('employer')
-        if employer_pk is not None:
+        if data.get('employer') is not None:
             try:
-                company = Company.objects.get(pk=employer_pk)
-                data['employer'] = f"{company.name} - {company.location}"
+                company = instance.employer
             except Company.DoesNotExist:
+                company = None
+            if company is None or company.pk is None:
                 data['employer'] = 'null'
+            else:
+                data['employer'] = f"{company.name} - {company.location}"
         return data
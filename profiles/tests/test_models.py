@@ -1,7 +1,15 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
 from django.test import TestCase
 from django.contrib.auth.models import User
 from companies.models import Company
-from ..models import Profile
+from posts.models import Post
+from followers.models import Follower
+from approvals.models import Approval
+from ..models import Profile, ProfileStats
 
 
 class ProfileModelTests(TestCase):
@@ -44,3 +52,155 @@ class ProfileModelTests(TestCase):
         self.assertEqual(self.user.profile.employer, company)
         # Reverse relationship using 'current_employee'
         self.assertEqual(company.current_employee.first(), self.user.profile)
+
+
+class ProfileStatsTests(TestCase):
+    """
+    Tests for the ProfileStats model and the signals which keep it
+    current.
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpassword'
+            )
+        self.other_user = User.objects.create_user(
+            username='otheruser',
+            password='testpassword'
+            )
+
+    def get_stats(self, user):
+        return ProfileStats.objects.get(profile__owner=user)
+
+    def test_stats_created_with_profile(self):
+        """
+        Checks empty stats are created along with each profile.
+        """
+        stats = self.get_stats(self.user)
+
+        self.assertEqual(stats.posts_count, 0)
+        self.assertEqual(stats.followers_count, 0)
+
+    def test_stats_follow_activity(self):
+        """
+        Checks posts, follows and approvals are counted on creation and
+        uncounted on deletion.
+        """
+        post = Post.objects.create(owner=self.user, title='Test Post')
+        follow = Follower.objects.create(
+            owner=self.other_user, followed=self.user
+            )
+        Approval.objects.create(
+            owner=self.other_user, profile=self.user.profile
+            )
+
+        stats = self.get_stats(self.user)
+        self.assertEqual(stats.posts_count, 1)
+        self.assertEqual(stats.followers_count, 1)
+        self.assertEqual(stats.approval_count, 1)
+        self.assertEqual(self.get_stats(self.other_user).following_count, 1)
+
+        post.delete()
+        follow.delete()
+        stats = self.get_stats(self.user)
+        self.assertEqual(stats.posts_count, 0)
+        self.assertEqual(stats.followers_count, 0)
+        self.assertEqual(self.get_stats(self.other_user).following_count, 0)
+
+    def test_stats_company_count(self):
+        """
+        Checks companies_count follows company creation and deletion.
+        """
+        company = Company.objects.create(owner=self.user, name='Company')
+        self.assertEqual(self.get_stats(self.user).companies_count, 1)
+
+        company.delete()
+        self.assertEqual(self.get_stats(self.user).companies_count, 0)
+
+    def test_reconcile_profile_stats_command(self):
+        """
+        Checks the reconcile_profile_stats command recreates missing
+        stats and repairs drifted counts.
+        """
+        Post.objects.create(owner=self.user, title='Test Post')
+        ProfileStats.objects.filter(profile__owner=self.user).delete()
+        ProfileStats.objects.filter(profile__owner=self.other_user).update(
+            posts_count=7
+        )
+
+        call_command('reconcile_profile_stats', stdout=StringIO())
+
+        self.assertEqual(self.get_stats(self.user).posts_count, 1)
+        self.assertEqual(self.get_stats(self.other_user).posts_count, 0)
+
+
+class ImportUsersCommandTests(TestCase):
+    """
+    Tests for the import_users bulk import command.
+    """
+    def setUp(self):
+        """
+        Set up an existing user and the employer to import staff to.
+        """
+        self.existing = User.objects.create_user(
+            username='existing', password='testpassword'
+            )
+        self.company = Company.objects.create(
+            owner=self.existing, name='Oak Workshop', location='Leeds'
+            )
+
+    def write_file(self, suffix, content):
+        """
+        Writes 'content' to a temporary file, returning its path.
+        """
+        file, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(file, 'w') as handle:
+            handle.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_import_csv_matches_signal_state(self):
+        """
+        Checks imported users get a profile, stats and search document
+        like signal created users, with hashed passwords and employers.
+        """
+        path = self.write_file('.csv', (
+            'username,password,name,job\n'
+            'joiner,secret123,Jo Iner,Joiner\n'
+            'existing,secret123,,\n'
+            'turner,,,\n'
+        ))
+        err = StringIO()
+
+        call_command(
+            'import_users', path, employer=self.company.pk, workers=2,
+            stdout=StringIO(), stderr=err,
+        )
+
+        joiner = User.objects.get(username='joiner')
+        self.assertTrue(joiner.check_password('secret123'))
+        self.assertEqual(joiner.profile.name, 'Jo Iner')
+        self.assertEqual(joiner.profile.employer, self.company)
+        self.assertEqual(
+            joiner.profile.search_document,
+            'joiner jo iner joiner oak workshop leeds'
+        )
+        self.assertEqual(joiner.profile.stats.followers_count, 0)
+        self.assertFalse(
+            User.objects.get(username='turner').has_usable_password()
+        )
+        self.assertIn('Skipping taken username existing.', err.getvalue())
+        self.assertEqual(ProfileStats.objects.count(), 3)
+
+    def test_import_jsonl_with_row_employer(self):
+        """
+        Checks JSONL rows are imported with their own employer.
+        """
+        path = self.write_file('.jsonl', json.dumps({
+            'username': 'carver', 'employer': self.company.pk
+        }) + '\n')
+
+        call_command('import_users', path, workers=1, stdout=StringIO())
+
+        profile = Profile.objects.get(owner__username='carver')
+        self.assertEqual(profile.employer, self.company)
@@ -2,9 +2,16 @@ from rest_framework.test import APITestCase
 from django.urls import reverse
 from rest_framework import status
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from ..models import Profile
 from ..views import ProfileDetail
 from ..serializers import ProfileSerializer
+from ..search import ngram_backend
+from followers.models import Follower
+from companies.models import Company
+from craft_api.tests.mixins import QueryCountMixin
 
 
 class ProfileListTest(APITestCase):
@@ -15,6 +22,26 @@ class ProfileListTest(APITestCase):
         response = self.client.get('/profiles/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_order_by_stored_followers_count(self):
+        """
+        Checks profiles are ordered by their stored followers_count.
+        """
+        users = [
+            User.objects.create_user(username=f'user{i}', password='pass')
+            for i in range(3)
+        ]
+        Follower.objects.create(owner=users[0], followed=users[2])
+        Follower.objects.create(owner=users[1], followed=users[2])
+        Follower.objects.create(owner=users[0], followed=users[1])
+
+        response = self.client.get('/profiles/?ordering=-followers_count')
+
+        self.assertEqual(
+            [profile['owner'] for profile in response.data['results']],
+            ['user2', 'user1', 'user0']
+        )
+        self.assertEqual(response.data['results'][0]['followers_count'], 2)
+
 
 class ProfileDetailTest(APITestCase):
     """
@@ -109,3 +136,301 @@ class ProfileDetailTest(APITestCase):
             profile.image,
             '../user_defualt_icon_d7nivg.png'
         )
+
+
+class ProfileQueryCountTest(QueryCountMixin, APITestCase):
+    """
+    Tests the profile list loads owners and employers in a constant
+    number of queries.
+    """
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.company_owner = User.objects.create_user(
+            username='companyowner', password='testpass'
+        )
+
+    def create_employed_profiles(self, count):
+        """
+        Creates 'count' users, each employed by a new company.
+        """
+        for _ in range(count):
+            self.create_user(employer=Company.objects.create(
+                owner=self.company_owner,
+                name=f'Company {self.user_total + 1}',
+                location='Test Location',
+            ))
+
+    def count_list_queries(self):
+        """
+        Returns the response and query count of a profile list request
+        from an empty cache.
+        """
+        cache.clear()
+        return self.count_queries('/profiles/')
+
+    def test_profile_list_query_count_is_constant(self):
+        """
+        Checks listing 8 employed profiles costs the same queries as 2,
+        and the employer string is still built.
+        """
+        self.create_employed_profiles(1)
+        _, small_page = self.count_list_queries()
+
+        self.create_employed_profiles(6)
+        response, full_page = self.count_list_queries()
+
+        self.assertEqual(small_page, full_page)
+        employers = [
+            profile['employer'] for profile in response.data['results']
+        ]
+        self.assertIn('Company 7 - Test Location', employers)
+
+    def test_logged_in_profile_list_query_count_is_constant(self):
+        """
+        Checks a logged in user's follows and approvals are resolved
+        for the whole page, costing the same queries for 8 profiles as 2.
+        """
+        viewer = User.objects.create_user(
+            username='viewer', password='testpass'
+        )
+        self.client.force_authenticate(user=viewer)
+        self.create_employed_profiles(1)
+        _, small_page = self.count_list_queries()
+
+        self.create_employed_profiles(6)
+        followed = User.objects.get(username='user3')
+        following = Follower.objects.create(owner=viewer, followed=followed)
+        response, full_page = self.count_list_queries()
+
+        self.assertEqual(small_page, full_page)
+        profiles = {
+            profile['owner']: profile for profile in response.data['results']
+        }
+        self.assertEqual(profiles['user3']['following_id'], following.id)
+        self.assertIsNone(profiles['user4']['following_id'])
+        self.assertIsNone(profiles['user3']['approval_id'])
+
+
+class ProfileSearchTest(APITestCase):
+    """
+    Testcase for the prefix and fuzzy search on the ProfileList view.
+    """
+    def setUp(self):
+        """
+        Set up test data, starting from an empty in-process index.
+        """
+        ngram_backend.clear()
+        self.company = Company.objects.create(
+            owner=User.objects.create_user(
+                username='companyowner', password='testpass'
+            ),
+            name='Oakwood Joinery',
+            location='Bristol',
+        )
+        self.woodworker = User.objects.create_user(
+            username='woodworker', password='testpass'
+        )
+        self.woodworker.profile.job = 'Carpenter'
+        self.woodworker.profile.employer = self.company
+        self.woodworker.profile.save()
+        self.potter = User.objects.create_user(
+            username='potter', password='testpass'
+        )
+        self.potter.profile.job = 'Ceramicist'
+        self.potter.profile.save()
+
+    def search(self, text):
+        """
+        Returns the owner usernames of the profiles found for 'text'.
+        """
+        response = self.client.get('/profiles/', {'search': text})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [profile['owner'] for profile in response.data['results']]
+
+    def test_search_matches_prefixes(self):
+        """
+        Checks partial words match username, job and employer.
+        """
+        self.assertEqual(self.search('woo'), ['woodworker'])
+        self.assertEqual(self.search('cer'), ['potter'])
+        self.assertEqual(self.search('oakw bris'), ['woodworker'])
+
+    def test_search_allows_typos(self):
+        """
+        Checks a misspelt word still finds the profile.
+        """
+        self.assertEqual(self.search('carpentr'), ['woodworker'])
+        self.assertEqual(self.search('ceramisist'), ['potter'])
+
+    def test_search_follows_profile_and_employer_changes(self):
+        """
+        Checks the index is kept in sync when a profile, its owner or
+        its employer changes.
+        """
+        self.search('woo')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.potter.username = 'glazier'
+            self.potter.save()
+        self.assertEqual(self.search('glaz'), ['glazier'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.company.name = 'Elm Studio'
+            self.company.save()
+        self.assertEqual(self.search('elm'), ['woodworker'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.company.delete()
+        self.assertEqual(self.search('elm'), [])
+
+    def test_search_combines_with_filters(self):
+        """
+        Checks matches beyond the first few hundred still reach the
+        other filters.
+        """
+        for i in range(510):
+            User.objects.create_user(username=f'maker{i}')
+        self.assertEqual(
+            self.client.get(
+                '/profiles/', {'search': 'maker'}
+            ).data['count'],
+            510,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.woodworker.username = 'maker-woodworker'
+            self.woodworker.save()
+        response = self.client.get('/profiles/', {
+            'search': 'maker', 'employer': self.company.pk,
+        })
+        self.assertEqual(
+            [profile['owner'] for profile in response.data['results']],
+            ['maker-woodworker'],
+        )
+
+    def test_unchanged_company_save_skips_reindex(self):
+        """
+        Checks saving a company without changing its name or location
+        does not rebuild its employees' documents.
+        """
+        company = Company.objects.get(pk=self.company.pk)
+        with self.assertNumQueries(1):
+            company.save()
+
+
+class ProfileCacheTest(APITestCase):
+    """
+    Tests the profile detail is served from the versioned cache, with
+    the viewer's own fields set per request.
+    """
+    def setUp(self):
+        """
+        Set up an employed profile and an empty cache.
+        """
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser', password='testpass'
+        )
+        self.viewer = User.objects.create_user(
+            username='viewer', password='testpass'
+        )
+        self.company = Company.objects.create(
+            owner=self.user, name='Oak Workshop', location='Leeds'
+        )
+        self.profile = self.user.profile
+        self.profile.employer = self.company
+        self.profile.save()
+        self.url = f'/profiles/{self.profile.pk}/'
+
+    def get(self):
+        """
+        Returns the response and query count of a profile detail request.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(context.captured_queries)
+
+    def test_cached_profile_skips_profile_query(self):
+        """
+        Checks a second anonymous request runs no queries.
+        """
+        _, first = self.get()
+        response, second = self.get()
+
+        self.assertEqual(second, 0)
+        self.assertLess(second, first)
+        self.assertEqual(response.data['employer'], 'Oak Workshop - Leeds')
+
+    def test_viewer_fields_overlaid_on_cached_profile(self):
+        """
+        Checks is_owner and following_id are the current viewer's.
+        """
+        self.client.force_authenticate(user=self.user)
+        self.assertTrue(self.get()[0].data['is_owner'])
+
+        self.client.force_authenticate(user=self.viewer)
+        follow = Follower.objects.create(owner=self.viewer, followed=self.user)
+        response, _ = self.get()
+
+        self.assertFalse(response.data['is_owner'])
+        self.assertEqual(response.data['following_id'], follow.id)
+
+    def test_writes_invalidate_cached_profile(self):
+        """
+        Checks follows, employer and profile changes are served once
+        they are made.
+        """
+        self.get()
+
+        Follower.objects.create(owner=self.viewer, followed=self.user)
+        self.assertEqual(self.get()[0].data['followers_count'], 1)
+
+        self.company.name = 'Elm Studio'
+        self.company.save()
+        self.assertEqual(self.get()[0].data['employer'], 'Elm Studio - Leeds')
+
+        self.profile.refresh_from_db()
+        self.profile.job = 'Carpenter'
+        self.profile.save()
+        self.assertEqual(self.get()[0].data['job'], 'Carpenter')
+
+    def test_profile_list_served_from_cache(self):
+        """
+        Checks a repeated list request only queries the page of ids
+        and the count, and writes are served once they are made.
+        """
+        self.client.get('/profiles/')
+        with CaptureQueriesContext(connection) as context:
+            self.client.get('/profiles/')
+        self.assertEqual(len(context.captured_queries), 2)
+
+        Follower.objects.create(owner=self.viewer, followed=self.user)
+        self.client.force_authenticate(user=self.viewer)
+        response = self.client.get('/profiles/')
+
+        profiles = {
+            profile['owner']: profile for profile in response.data['results']
+        }
+        self.assertEqual(profiles['testuser']['followers_count'], 1)
+        self.assertIsNotNone(profiles['testuser']['following_id'])
+        self.assertTrue(profiles['viewer']['is_owner'])
+
+    def test_cold_profile_list_resolves_relationships_once(self):
+        """
+        Checks cards missing from the cache are serialized without the
+        viewer's follows and approvals, which are read once per page.
+        """
+        self.client.force_authenticate(user=self.viewer)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get('/profiles/')
+
+        for table in ('followers_follower', 'approvals_approval'):
+            self.assertEqual(
+                len([
+                    query for query in context.captured_queries
+                    if f'FROM "{table}"' in query['sql']
+                ]),
+                1,
+            )
@@ -1,12 +1,19 @@
-from django.db.models import Count
+from django.db.models import OuterRef, Subquery
 from rest_framework import status
 from rest_framework import generics, filters
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Profile
 from .serializers import ProfileSerializer
+from .search import ProfileSearchFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from craft_api.permissions import IsOwnerOrReadOnly
+from craft_api.uploads import ImageUploadLimitMixin
+from craft_api.cache import CachedListMixin, CachedRetrieveMixin
+from craft_api.conditional import ConditionalRetrieveMixin
+from craft_api.relationships import profile_relationships
+from followers.models import Follower
+from approvals.models import Approval
 from rest_framework.views import APIView
 from django.http import Http404
 from rest_framework.generics import get_object_or_404
@@ -14,22 +21,24 @@ from craft_api.views import logout_route
 from django.contrib.auth.models import User
 
 
-class ProfileList(generics.ListAPIView):
+class ProfileList(CachedListMixin, generics.ListAPIView):
     """
     List all profiles
     No post method as profile creation is handled by django signals
     in the models.py create_profile method.
+    The profile cards are served from the cache, with the request
+    user's 'is_owner', 'following_id' and 'approval_id' set on each
+    request.
+    Searches each profile's owner username, name, job and employer
+    by prefix or with typos.
     """
     serializer_class = ProfileSerializer
-    queryset = Profile.objects.annotate(
-        posts_count=Count('owner__post', distinct=True),
-        followers_count=Count('owner__followed', distinct=True),
-        following_count=Count('owner__following', distinct=True),
-        approval_count=Count('approval__owner', distinct=True),
-    ).order_by('-created_on')
+    queryset = Profile.objects.select_related(
+        'owner', 'employer'
+    ).with_stats().order_by('-created_on')
     filter_backends = [
         filters.OrderingFilter,
-        filters.SearchFilter,
+        ProfileSearchFilter,
         DjangoFilterBackend,
     ]
     ordering_fields = [
@@ -40,31 +49,66 @@ class ProfileList(generics.ListAPIView):
         'owner__following__created_on',
         'owner__followed__created_on',
     ]
-    search_fields = [
-        'owner__username',
-        'name',
-        'job',
-        'employer__name',
-        'employer__location',
-    ]
     filterset_fields = [
         'owner__following__followed__profile',
         'owner__followed__owner__profile',
         'employer__current_employee',
         'employer',
     ]
+    viewer_fields = ('is_owner', 'following_id', 'approval_id')
+
+    def get_viewer_fields(self, items):
+        user = self.request.user
+        relationships = profile_relationships(
+            user, [item['id'] for item in items]
+        )
+        for item in items:
+            relationships[item['id']]['is_owner'] = (
+                user.is_authenticated and user.username == item['owner']
+            )
+        return relationships
 
 
-class ProfileDetail(generics.RetrieveUpdateAPIView):
+class ProfileDetail(
+        ConditionalRetrieveMixin, CachedRetrieveMixin, ImageUploadLimitMixin,
+        generics.RetrieveUpdateAPIView
+):
     """
     Allows the retrieval of a profile and the ability to
     edit it if the user is the owner.
+    Supports conditional GET requests with ETag.
+    The profile is served from the cache, with the request user's
+    'is_owner', 'following_id' and 'approval_id' set on each request.
     """
     permission_classes = [IsOwnerOrReadOnly]
     serializer_class = ProfileSerializer
-    queryset = Profile.objects.annotate(
-        posts_count=Count('owner__post', distinct=True),
-        followers_count=Count('owner__followed', distinct=True),
-        following_count=Count('owner__following', distinct=True),
-        approval_count=Count('approval__owner', distinct=True),
-    ).order_by('-created_on')
+    queryset = Profile.objects.select_related(
+        'owner', 'employer'
+    ).with_stats().order_by('-created_on')
+    etag_from_data = True
+    viewer_fields = ('is_owner', 'following_id', 'approval_id')
+
+    def get_viewer_fields(self, data):
+        """
+        Reads the request user's follow and approval of the profile
+        with one query.
+        """
+        user = self.request.user
+        if not user.is_authenticated:
+            return {
+                'is_owner': False, 'following_id': None, 'approval_id': None
+            }
+        relationship = Profile.objects.filter(pk=data['id']).annotate(
+            following_id=Subquery(Follower.objects.filter(
+                owner=user, followed=OuterRef('owner')
+            ).values('pk')[:1]),
+            approval_id=Subquery(Approval.objects.filter(
+                owner=user, profile=OuterRef('pk')
+            ).values('pk')[:1]),
+        ).values('following_id', 'approval_id').first()
+        return {
+            'is_owner': user.username == data['owner'],
+            'following_id': None,
+            'approval_id': None,
+            **(relationship or {}),
+        }
@@ -0,0 +1,50 @@
+import multiprocessing
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.contrib.auth.models import User
+from suggestions.models import refresh_suggestions
+
+
+def build_chunk(user_ids):
+    """
+    Refreshes the suggestions of each user in 'user_ids'.
+    Returns the number of suggestions stored.
+    """
+    return sum(refresh_suggestions(user_id) for user_id in user_ids)
+
+
+class Command(BaseCommand):
+    """
+    Recomputes every user's suggestions from the Follower graph and
+    Profile employers, optionally split across several processes.
+    """
+    help = 'Rebuild the precomputed people you may know suggestions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=1,
+            help='Number of worker processes to build with.',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help='Number of users handed to a worker at a time.',
+        )
+
+    def handle(self, *args, **options):
+        user_ids = list(User.objects.values_list('pk', flat=True))
+        size = options['chunk_size']
+        chunks = [
+            user_ids[i:i + size] for i in range(0, len(user_ids), size)
+        ]
+        if options['processes'] > 1:
+            # Workers are forked with the configured Django project, each
+            # opening its own database connection.
+            connections.close_all()
+            context = multiprocessing.get_context('fork')
+            with context.Pool(options['processes']) as pool:
+                total = sum(pool.map(build_chunk, chunks))
+        else:
+            total = sum(build_chunk(chunk) for chunk in chunks)
+        self.stdout.write(self.style.SUCCESS(
+            f'Built {total} suggestions for {len(user_ids)} users.'
+        ))
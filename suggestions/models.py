@@ -0,0 +1,329 @@
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+from django.db.models.signals import (
+    pre_save, post_save, pre_delete, post_delete
+)
+from django.contrib.auth.models import User
+from followers.models import Follower
+
+
+class Suggestion(models.Model):
+    """
+    Suggestion model, a precomputed 'people you may know' row.
+    Related to the User it is shown to via the 'owner' FK and to the
+    suggested User via the 'suggested' FK.
+    'mutual_count' is the number of users the owner follows who
+    follow the suggested user, 'colleague' is True when both share
+    a Profile.employer. 'score' ranks the owner's suggestions.
+    """
+    owner = models.ForeignKey(
+        User, related_name='suggestions', on_delete=models.CASCADE
+        )
+    suggested = models.ForeignKey(
+        User, related_name='+', on_delete=models.CASCADE
+        )
+    mutual_count = models.PositiveIntegerField(default=0)
+    colleague = models.BooleanField(default=False)
+    score = models.FloatField(default=0)
+
+    class Meta:
+        ordering = ['-score', 'suggested']
+        unique_together = ['owner', 'suggested']
+        indexes = [
+            models.Index(
+                fields=['owner', '-score', 'suggested'],
+                name='suggestion_owner_score_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.owner}, {self.suggested}"
+
+
+def suggestion_score(mutual_count, colleague):
+    """
+    Returns the score of a suggestion.
+    """
+    score = mutual_count * settings.SUGGESTION_MUTUAL_WEIGHT
+    if colleague:
+        score += settings.SUGGESTION_COLLEAGUE_WEIGHT
+    return score
+
+
+def compute_suggestions(user_id):
+    """
+    Returns the user's top SUGGESTION_LIMIT unsaved suggestions:
+    the users followed by the users they follow, and their colleagues
+    at the same employer, excluding anyone they already follow.
+    """
+    followed = Follower.objects.filter(owner=user_id).values('followed')
+    mutuals = Follower.objects.filter(
+        owner__in=followed
+    ).exclude(
+        followed=user_id
+    ).exclude(
+        followed__in=followed
+    ).order_by().values('followed').annotate(
+        mutual_count=Count('owner')
+    ).values_list('followed', 'mutual_count')
+    colleagues = User.objects.filter(
+        profile__employer__current_employee__owner=user_id
+    ).exclude(
+        pk=user_id
+    ).exclude(
+        pk__in=followed
+    ).values_list('pk', flat=True)
+
+    candidates = {pk: [count, False] for pk, count in mutuals}
+    for pk in colleagues:
+        candidates.setdefault(pk, [0, False])[1] = True
+    suggestions = [
+        Suggestion(
+            owner_id=user_id,
+            suggested_id=pk,
+            mutual_count=mutual_count,
+            colleague=colleague,
+            score=suggestion_score(mutual_count, colleague),
+        )
+        for pk, (mutual_count, colleague) in candidates.items()
+    ]
+    suggestions.sort(key=lambda s: (-s.score, s.suggested_id))
+    return suggestions[:settings.SUGGESTION_LIMIT]
+
+
+def refresh_suggestions(user_id):
+    """
+    Replaces the user's stored suggestions with freshly computed
+    ones. Returns the number stored.
+    """
+    suggestions = compute_suggestions(user_id)
+    with transaction.atomic():
+        Suggestion.objects.filter(owner=user_id).delete()
+        Suggestion.objects.bulk_create(suggestions)
+    return len(suggestions)
+
+
+def fan_out(queryset):
+    """
+    Returns the primary keys in 'queryset', a values_list query, or
+    None when there are more than SUGGESTION_FANOUT_LIMIT of them.
+    """
+    limit = settings.SUGGESTION_FANOUT_LIMIT
+    pks = list(queryset[:limit + 1])
+    return pks if len(pks) <= limit else None
+
+
+def trim_suggestions(owner_ids):
+    """
+    Deletes each owner's suggestions ranked below SUGGESTION_LIMIT,
+    as refresh_suggestions stores them. A trimmed suggestion later
+    gaining mutuals restarts from them, until build_suggestions
+    recounts it.
+    """
+    ranked = Suggestion.objects.filter(owner__in=owner_ids).annotate(
+        rank=Window(
+            RowNumber(),
+            partition_by=[F('owner')],
+            order_by=[F('score').desc(), F('suggested').asc()],
+        )
+    ).values_list('pk', 'rank')
+    Suggestion.objects.filter(pk__in=[
+        pk for pk, rank in ranked if rank > settings.SUGGESTION_LIMIT
+    ]).delete()
+
+
+def change_mutuals(change, **lookup):
+    """
+    Adds 'change' to the mutual count of the suggestions matching
+    'lookup', adjusting their score. Suggestions left with no score
+    are deleted.
+    """
+    suggestions = Suggestion.objects.filter(**lookup)
+    if change < 0:
+        suggestions = suggestions.filter(mutual_count__gt=0)
+    suggestions.update(
+        mutual_count=F('mutual_count') + change,
+        score=F('score') + change * settings.SUGGESTION_MUTUAL_WEIGHT,
+    )
+    if change < 0:
+        Suggestion.objects.filter(score__lte=0, **lookup).delete()
+
+
+def add_mutuals(owner_ids, suggested_ids):
+    """
+    Adds a mutual follow to each owner's suggestion of each suggested
+    user, creating the suggestions which are missing, and trims the
+    owners' suggestions.
+    """
+    Suggestion.objects.bulk_create(
+        [
+            Suggestion(owner_id=owner_id, suggested_id=suggested_id)
+            for owner_id in owner_ids
+            for suggested_id in suggested_ids
+        ],
+        ignore_conflicts=True,
+    )
+    change_mutuals(1, owner__in=owner_ids, suggested__in=suggested_ids)
+    trim_suggestions(owner_ids)
+
+
+def follow_created(sender, instance, created, **kwargs):
+    """
+    Updates the suggestions a new follow changes, without recomputing
+    them: the followed user is no longer suggested to the follower,
+    the users they follow gain a mutual for the follower, and they
+    gain a mutual for the follower's own followers. Either update is
+    left to build_suggestions when it reaches more than
+    SUGGESTION_FANOUT_LIMIT users.
+    """
+    if not created:
+        return
+    follower, followed = instance.owner_id, instance.followed_id
+    Suggestion.objects.filter(owner=follower, suggested=followed).delete()
+    already_followed = Follower.objects.filter(
+        owner=follower
+    ).values('followed')
+    suggested_ids = fan_out(Follower.objects.filter(
+        owner=followed
+    ).exclude(
+        followed=follower
+    ).exclude(
+        followed__in=already_followed
+    ).values_list('followed', flat=True))
+    if suggested_ids is not None:
+        add_mutuals([follower], suggested_ids)
+    owner_ids = fan_out(Follower.objects.filter(
+        followed=follower
+    ).exclude(
+        owner=followed
+    ).exclude(
+        owner__following__followed=followed
+    ).values_list('owner', flat=True))
+    if owner_ids is not None:
+        add_mutuals(owner_ids, [followed])
+
+
+def follow_deleted(sender, instance, **kwargs):
+    """
+    Removes a mutual follow from the suggestions it counted towards.
+    Only updates and deletes rows, so it is safe while a user is
+    deleted. Users no longer followed become suggestions again when
+    build_suggestions next runs.
+    """
+    change_mutuals(
+        -1,
+        owner=instance.owner_id,
+        suggested__in=Follower.objects.filter(
+            owner=instance.followed_id
+        ).values('followed'),
+    )
+    change_mutuals(
+        -1,
+        owner__in=Follower.objects.filter(
+            followed=instance.owner_id
+        ).values('owner'),
+        suggested=instance.followed_id,
+    )
+
+
+def collect_employer(sender, instance, **kwargs):
+    """
+    Stores the employer a profile was loaded with before it is saved,
+    as the companies signals record the new one once it is.
+    """
+    if hasattr(instance, 'loaded_employer_id'):
+        instance.previous_employer_id = instance.loaded_employer_id
+
+
+def change_colleagues(user_id, employer_id, colleague):
+    """
+    Marks or unmarks 'user_id' and the current employees of
+    'employer_id' as colleagues in each other's suggestions, adjusting
+    their scores. New colleagues not yet followed are suggested, and
+    former colleagues left with no score are removed.
+    With more than SUGGESTION_FANOUT_LIMIT employees only the user's
+    existing suggestions are updated, the rest is left to
+    build_suggestions.
+    """
+    employees = User.objects.filter(
+        profile__employer=employer_id
+    ).exclude(pk=user_id).values_list('pk', flat=True)
+    user_ids = fan_out(employees)
+    if user_ids is None:
+        pairs = Q(owner=user_id, suggested__in=employees)
+    else:
+        pairs = (
+            Q(owner=user_id, suggested__in=user_ids) |
+            Q(owner__in=user_ids, suggested=user_id)
+        )
+    weight = settings.SUGGESTION_COLLEAGUE_WEIGHT
+    Suggestion.objects.filter(pairs, colleague=not colleague).update(
+        colleague=colleague,
+        score=F('score') + (weight if colleague else -weight),
+    )
+    if not colleague:
+        Suggestion.objects.filter(pairs, score__lte=0).delete()
+        return
+    if user_ids is None:
+        return
+    followed = set(Follower.objects.filter(
+        Q(owner=user_id, followed__in=user_ids) |
+        Q(owner__in=user_ids, followed=user_id)
+    ).values_list('owner', 'followed'))
+    candidates = [(user_id, pk) for pk in user_ids]
+    candidates += [(pk, user_id) for pk in user_ids]
+    Suggestion.objects.bulk_create(
+        [
+            Suggestion(
+                owner_id=owner_id,
+                suggested_id=suggested_id,
+                colleague=True,
+                score=suggestion_score(0, True),
+            )
+            for owner_id, suggested_id in candidates
+            if (owner_id, suggested_id) not in followed
+        ],
+        ignore_conflicts=True,
+    )
+    trim_suggestions([user_id, *user_ids])
+
+
+def employer_changed(sender, instance, created, **kwargs):
+    """
+    Moves a profile's owner from their old employer's colleague
+    suggestions to their new employer's.
+    """
+    if not created and not hasattr(instance, 'previous_employer_id'):
+        return
+    previous = getattr(instance, 'previous_employer_id', None)
+    if previous == instance.employer_id:
+        return
+    if previous is not None:
+        change_colleagues(instance.owner_id, previous, False)
+    if instance.employer_id is not None:
+        change_colleagues(instance.owner_id, instance.employer_id, True)
+
+
+def company_deleted(sender, instance, **kwargs):
+    """
+    Unmarks the employees of a deleted company as colleagues before
+    their employer is set to null, which sends no Profile signals.
+    """
+    pairs = Q(
+        owner__profile__employer=instance,
+        suggested__profile__employer=instance,
+    )
+    Suggestion.objects.filter(pairs, colleague=True).update(
+        colleague=False,
+        score=F('score') - settings.SUGGESTION_COLLEAGUE_WEIGHT,
+    )
+    Suggestion.objects.filter(pairs, score__lte=0).delete()
+
+
+post_save.connect(follow_created, sender=Follower)
+post_delete.connect(follow_deleted, sender=Follower)
+pre_save.connect(collect_employer, sender='profiles.Profile')
+post_save.connect(employer_changed, sender='profiles.Profile')
+pre_delete.connect(company_deleted, sender='companies.Company')
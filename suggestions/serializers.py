@@ -0,0 +1,17 @@
+from rest_framework import serializers
+from .models import Suggestion
+
+
+class SuggestionSerializer(serializers.ModelSerializer):
+    suggested = serializers.ReadOnlyField(source='suggested.username')
+    profile_id = serializers.ReadOnlyField(source='suggested.profile.id')
+    profile_image = serializers.ReadOnlyField(
+        source='suggested.profile.image.url'
+    )
+
+    class Meta:
+        model = Suggestion
+        fields = [
+            'id', 'suggested', 'profile_id', 'profile_image',
+            'mutual_count', 'colleague', 'score',
+        ]
@@ -0,0 +1,191 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from followers.models import Follower
+from companies.models import Company
+from ..models import Suggestion, compute_suggestions, refresh_suggestions
+
+
+class SuggestionModelTest(TestCase):
+    """
+    TestCase for the Suggestion model and the signals which
+    maintain it.
+    """
+    def setUp(self):
+        """
+        Set up users where 'me' follows 'friend', who follows 'maker'.
+        """
+        self.me = User.objects.create_user(
+            username='me', password='password1'
+            )
+        self.friend = User.objects.create_user(
+            username='friend', password='password2'
+            )
+        self.maker = User.objects.create_user(
+            username='maker', password='password3'
+            )
+        Follower.objects.create(owner=self.friend, followed=self.maker)
+        Follower.objects.create(owner=self.me, followed=self.friend)
+
+    def suggestions(self, user):
+        """
+        Returns {suggested username: mutual count} for the user.
+        """
+        return {
+            s.suggested.username: s.mutual_count
+            for s in Suggestion.objects.filter(owner=user)
+        }
+
+    def test_follow_suggests_friends_of_friends(self):
+        """
+        Checks following a user suggests the users they follow.
+        """
+        self.assertEqual(self.suggestions(self.me), {'maker': 1})
+
+    def test_follow_updates_followers_suggestions(self):
+        """
+        Checks a new follow is suggested to the follower's followers,
+        and removed from them again on unfollow.
+        """
+        fan = User.objects.create_user(username='fan', password='password4')
+        Follower.objects.create(owner=fan, followed=self.me)
+        other = User.objects.create_user(username='other', password='pw')
+
+        follow = Follower.objects.create(owner=self.me, followed=other)
+        self.assertEqual(self.suggestions(fan)['other'], 1)
+
+        follow.delete()
+        self.assertNotIn('other', self.suggestions(fan))
+
+    def test_followed_users_are_not_suggested(self):
+        """
+        Checks following or unfollowing a suggestion updates it.
+        """
+        Follower.objects.create(owner=self.me, followed=self.maker)
+        self.assertEqual(self.suggestions(self.me), {})
+
+        Follower.objects.get(owner=self.me, followed=self.friend).delete()
+        self.assertEqual(self.suggestions(self.me), {})
+
+    def test_colleagues_rank_above_single_mutual(self):
+        """
+        Checks users at the same employer are suggested first.
+        """
+        company = Company.objects.create(owner=self.maker, name='Workshop')
+        colleague = User.objects.create_user(
+            username='colleague', password='password5'
+            )
+        for user in (self.me, colleague):
+            user.profile.employer = company
+            user.profile.save()
+
+        refresh_suggestions(self.me.pk)
+
+        self.assertEqual(
+            [s.suggested for s in Suggestion.objects.filter(owner=self.me)],
+            [colleague, self.maker]
+        )
+
+    def test_follows_match_full_recompute(self):
+        """
+        Checks the incremental updates made by new follows leave the
+        same suggestions as a full recompute.
+        """
+        other = User.objects.create_user(username='other', password='pw')
+        Follower.objects.create(owner=other, followed=self.maker)
+        Follower.objects.create(owner=self.me, followed=other)
+        Follower.objects.create(owner=self.maker, followed=self.me)
+
+        for user in (self.me, self.friend, self.maker, other):
+            self.assertEqual(
+                self.suggestions(user),
+                {
+                    s.suggested.username: s.mutual_count
+                    for s in compute_suggestions(user.pk)
+                },
+            )
+        self.assertEqual(self.suggestions(self.me), {'maker': 2})
+
+    def test_employer_change_updates_colleagues(self):
+        """
+        Checks joining an employer suggests its employees both ways,
+        and leaving it removes them again.
+        """
+        company = Company.objects.create(owner=self.maker, name='Workshop')
+        colleague = User.objects.create_user(
+            username='colleague', password='password5'
+            )
+        colleague.profile.employer = company
+        colleague.profile.save()
+
+        self.me.profile.employer = company
+        self.me.profile.save()
+        self.assertEqual(
+            [s.suggested for s in Suggestion.objects.filter(owner=self.me)],
+            [colleague, self.maker]
+        )
+        self.assertEqual(self.suggestions(colleague), {'me': 0})
+
+        self.me.profile.employer = None
+        self.me.profile.save()
+        self.assertEqual(self.suggestions(self.me), {'maker': 1})
+        self.assertEqual(self.suggestions(colleague), {})
+
+    def test_company_deletion_unmarks_colleagues(self):
+        """
+        Checks deleting an employer removes its employees' colleague
+        suggestions of each other.
+        """
+        company = Company.objects.create(owner=self.maker, name='Workshop')
+        for user in (self.me, self.maker):
+            user.profile.employer = company
+            user.profile.save()
+        self.assertTrue(
+            Suggestion.objects.get(owner=self.me).colleague
+        )
+
+        company.delete()
+
+        self.assertEqual(self.suggestions(self.me), {'maker': 1})
+        self.assertFalse(Suggestion.objects.get(owner=self.me).colleague)
+        self.assertEqual(self.suggestions(self.maker), {})
+
+    @override_settings(SUGGESTION_LIMIT=1)
+    def test_new_suggestions_are_trimmed_to_limit(self):
+        """
+        Checks incremental updates keep only the owner's top
+        SUGGESTION_LIMIT suggestions.
+        """
+        other = User.objects.create_user(username='other', password='pw')
+        Follower.objects.create(owner=self.friend, followed=other)
+
+        self.assertEqual(self.suggestions(self.me), {'maker': 1})
+
+    @override_settings(SUGGESTION_FANOUT_LIMIT=0)
+    def test_large_fan_out_is_left_to_build_suggestions(self):
+        """
+        Checks a follow reaching more than SUGGESTION_FANOUT_LIMIT
+        users leaves their suggestions to build_suggestions.
+        """
+        fan = User.objects.create_user(username='fan', password='password4')
+        Follower.objects.create(owner=fan, followed=self.me)
+        other = User.objects.create_user(username='other', password='pw')
+
+        Follower.objects.create(owner=self.me, followed=other)
+        self.assertEqual(self.suggestions(fan), {})
+
+        call_command('build_suggestions', stdout=StringIO())
+        self.assertEqual(self.suggestions(fan), {'friend': 1, 'other': 1})
+
+    def test_build_suggestions_command(self):
+        """
+        Checks the batch job rebuilds every user's suggestions.
+        """
+        Suggestion.objects.all().delete()
+        out = StringIO()
+
+        call_command('build_suggestions', stdout=out)
+
+        self.assertEqual(self.suggestions(self.me), {'maker': 1})
+        self.assertIn('Built 1 suggestions for 3 users.', out.getvalue())
@@ -0,0 +1,50 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from followers.models import Follower
+
+
+class SuggestionListViewTest(APITestCase):
+    """
+    Test case for the suggestions view.
+    """
+    def setUp(self):
+        """
+        Set up a user who follows 'friend', who follows three makers.
+        """
+        self.me = User.objects.create_user(
+            username='me', password='password1'
+            )
+        friend = User.objects.create_user(
+            username='friend', password='password2'
+            )
+        for name in ('maker1', 'maker2', 'maker3'):
+            maker = User.objects.create_user(username=name, password='pw')
+            Follower.objects.create(owner=friend, followed=maker)
+        Follower.objects.create(owner=self.me, followed=friend)
+
+    def test_suggestions_require_login(self):
+        """
+        Checks logged out users cannot read suggestions.
+        """
+        response = self.client.get('/suggestions/')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_suggestions_are_a_single_read(self):
+        """
+        Checks the suggestions are listed with one query, limited by
+        the 'limit' parameter.
+        """
+        self.client.force_authenticate(user=self.me)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/suggestions/', {'limit': 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertEqual(
+            [s['suggested'] for s in response.data], ['maker1', 'maker2']
+        )
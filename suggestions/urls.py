@@ -0,0 +1,6 @@
+from django.urls import path
+from suggestions import views
+
+urlpatterns = [
+    path('suggestions/', views.SuggestionList.as_view()),
+]
@@ -0,0 +1,30 @@
+from django.conf import settings
+from rest_framework import generics, permissions
+from .models import Suggestion
+from .serializers import SuggestionSerializer
+
+
+class SuggestionList(generics.ListAPIView):
+    """
+    List the logged in user's people you may know, best first.
+    Reads the suggestions precomputed by build_suggestions and kept
+    current by the Follower and Profile signals. Use 'limit' to
+    request fewer than SUGGESTION_LIMIT.
+    """
+    serializer_class = SuggestionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params['limit'])
+        except (KeyError, ValueError):
+            return settings.SUGGESTION_LIMIT
+        return min(max(limit, 1), settings.SUGGESTION_LIMIT)
+
+    def get_queryset(self):
+        return Suggestion.objects.filter(
+            owner=self.request.user
+        ).select_related(
+            'suggested__profile'
+        ).order_by('-score', 'suggested')[:self.get_limit()]
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from followers.models import Follower
+from timelines.models import TimelineEntry, backfill_timeline
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds every timeline from the Follower table, e.g. after
+    the timelines app is first deployed.
+    Runs in one transaction, so feeds are never read half rebuilt.
+    """
+    help = 'Rebuild all precomputed home timelines.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            TimelineEntry.objects.all().delete()
+            follows = Follower.objects.values_list('owner_id', 'followed_id')
+            for owner_id, followed_id in follows.iterator():
+                backfill_timeline(owner_id, followed_id)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {TimelineEntry.objects.count()} timeline entries.'
+        ))
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.db import migrations
+
+
+def mark_read_on_fetch_posts(apps, schema_editor):
+    """
+    Marks the posts of authors currently over the fan out limit as read
+    on fetch, dropping any timeline entries they were fanned out to.
+    """
+    Post = apps.get_model('posts', 'Post')
+    ProfileStats = apps.get_model('profiles', 'ProfileStats')
+    TimelineEntry = apps.get_model('timelines', 'TimelineEntry')
+    authors = ProfileStats.objects.filter(
+        followers_count__gt=settings.TIMELINE_FANOUT_LIMIT
+    ).values('profile__owner')
+    Post.objects.filter(owner__in=authors).update(fanned_out=False)
+    TimelineEntry.objects.filter(post__fanned_out=False).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timelines', '0001_initial'),
+        ('posts', '0008_post_fanned_out'),
+        ('profiles', '0007_profilestats_companies_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            mark_read_on_fetch_posts, migrations.RunPython.noop
+        ),
+    ]
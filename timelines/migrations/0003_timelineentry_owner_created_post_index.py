@@ -0,0 +1,21 @@
+# Generated by Django 3.2.22 on 2026-10-18 00:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timelines', '0002_read_on_fetch_posts'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='timelineentry',
+            name='timeline_owner_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='timelineentry',
+            index=models.Index(fields=['owner', '-created_on', '-post'], name='timeline_owner_created_idx'),
+        ),
+    ]
@@ -0,0 +1,126 @@
+from django.conf import settings
+from django.db import models
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.contrib.auth.models import User
+from posts.models import Post
+from followers.models import Follower
+from profiles.models import ProfileStats
+
+
+class TimelineEntry(models.Model):
+    """
+    TimelineEntry model, a precomputed home feed row.
+    Related to the viewing User via the 'owner' FK and to the
+    Post shown in their feed via the 'post' FK.
+    'created_on' is copied from the post so a viewer's feed is one
+    range scan over the (owner, created_on, post) index, which also
+    holds the post id the keyset pagination breaks ties with.
+    """
+    owner = models.ForeignKey(
+        User, related_name='timeline', on_delete=models.CASCADE
+        )
+    post = models.ForeignKey(Post, on_delete=models.CASCADE)
+    created_on = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_on']
+        unique_together = ['owner', 'post']
+        indexes = [
+            models.Index(
+                fields=['owner', '-created_on', '-post'],
+                name='timeline_owner_created_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.owner}, {self.post}"
+
+
+def is_fan_out_author(user_id):
+    """
+    Returns True if the user's posts are written to their followers'
+    timelines. Authors with more followers than TIMELINE_FANOUT_LIMIT
+    are read into the feed at request time instead.
+    """
+    return not ProfileStats.objects.filter(
+        profile__owner=user_id,
+        followers_count__gt=settings.TIMELINE_FANOUT_LIMIT,
+    ).exists()
+
+
+def backfill_timeline(owner_id, followed_id):
+    """
+    Copies the followed user's most recent fanned out posts into the
+    owner's timeline. Posts which were not fanned out are read into
+    the feed instead.
+    """
+    posts = Post.objects.filter(
+        owner=followed_id, fanned_out=True
+    ).order_by(
+        '-created_on'
+    ).values_list('id', 'created_on')[:settings.TIMELINE_BACKFILL_SIZE]
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(owner_id=owner_id, post_id=pk, created_on=created)
+            for pk, created in posts
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def mark_fanned_out(sender, instance, **kwargs):
+    """
+    Records whether a new post is written to timelines, so it stays
+    in its readers' feeds if its author later crosses the fan out
+    limit either way.
+    """
+    if instance.pk is None:
+        instance.fanned_out = is_fan_out_author(instance.owner_id)
+
+
+def fan_out_post(sender, instance, created, **kwargs):
+    """
+    Writes a new post into the timeline of each of its author's
+    followers.
+    """
+    if not created or not instance.fanned_out:
+        return
+    follower_ids = Follower.objects.filter(
+        followed=instance.owner_id
+    ).values_list('owner_id', flat=True)
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(
+                owner_id=owner_id,
+                post=instance,
+                created_on=instance.created_on,
+            )
+            for owner_id in follower_ids.iterator()
+        ],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+def follow_backfill(sender, instance, created, **kwargs):
+    """
+    Backfills the new follower's timeline with the followed
+    user's recent posts.
+    """
+    if created:
+        backfill_timeline(instance.owner_id, instance.followed_id)
+
+
+def unfollow_trim(sender, instance, **kwargs):
+    """
+    Removes the unfollowed user's posts from the follower's timeline.
+    """
+    TimelineEntry.objects.filter(
+        owner=instance.owner_id, post__owner=instance.followed_id
+    ).delete()
+
+
+pre_save.connect(mark_fanned_out, sender=Post)
+post_save.connect(fan_out_post, sender=Post)
+post_save.connect(follow_backfill, sender=Follower)
+post_delete.connect(unfollow_trim, sender=Follower)
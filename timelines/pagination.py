@@ -0,0 +1,44 @@
+from posts.models import Post
+from followers.models import Follower
+from craft_api.pagination import KeysetCursorPagination
+from .models import TimelineEntry
+
+
+class TimelinePagination(KeysetCursorPagination):
+    """
+    Keyset cursor pagination for the home feed.
+    Each page merges a range scan of the viewer's timeline entries
+    with a range scan of the followed authors' posts which were not
+    fanned out, both ordered by (created_on, post id), and then loads
+    the page's posts from the view's queryset.
+    """
+    def get_page_rows(self, queryset, ordering, position, limit):
+        user = self.request.user
+        entry_ordering = [
+            field.replace('id', 'post_id') if field.lstrip('-') == 'id'
+            else field
+            for field in ordering
+        ]
+        entries = TimelineEntry.objects.filter(owner=user).order_by(
+            *entry_ordering
+        )
+        read_on_fetch = Post.objects.filter(
+            owner__in=Follower.objects.filter(owner=user).values('followed'),
+            fanned_out=False,
+        ).order_by(*ordering)
+        if position is not None:
+            entries = self.filter_after(entries, entry_ordering, position)
+            read_on_fetch = self.filter_after(
+                read_on_fetch, ordering, position
+            )
+
+        # Both orderings run in the same direction on every field.
+        rows = sorted(
+            [
+                *entries.values_list('created_on', 'post_id')[:limit],
+                *read_on_fetch.values_list('created_on', 'id')[:limit],
+            ],
+            reverse=ordering[0].startswith('-'),
+        )[:limit]
+        posts = queryset.in_bulk([pk for _, pk in rows])
+        return [posts[pk] for _, pk in rows if pk in posts]
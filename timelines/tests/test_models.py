@@ -0,0 +1,103 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from posts.models import Post
+from followers.models import Follower
+from ..models import TimelineEntry
+
+
+class TimelineEntryModelTest(TestCase):
+    """
+    TestCase for the TimelineEntry model and the signals which
+    maintain it.
+    """
+    def setUp(self):
+        """
+        Set up test object instances.
+        """
+        self.author = User.objects.create_user(
+            username='author', password='password1'
+            )
+        self.reader = User.objects.create_user(
+            username='reader', password='password2'
+            )
+
+    def timeline_post_ids(self, user):
+        """
+        Returns the ids of the posts in the user's timeline.
+        """
+        return list(
+            TimelineEntry.objects.filter(owner=user)
+            .values_list('post_id', flat=True)
+        )
+
+    def test_new_post_fanned_out_to_followers(self):
+        """
+        Checks a new post is written to each follower's timeline.
+        """
+        Follower.objects.create(owner=self.reader, followed=self.author)
+        post = Post.objects.create(owner=self.author, title='Test Post')
+
+        self.assertEqual(self.timeline_post_ids(self.reader), [post.id])
+        self.assertEqual(self.timeline_post_ids(self.author), [])
+
+    def test_follow_backfills_recent_posts(self):
+        """
+        Checks following a user copies their existing posts into the
+        follower's timeline.
+        """
+        post = Post.objects.create(owner=self.author, title='Test Post')
+        Follower.objects.create(owner=self.reader, followed=self.author)
+
+        self.assertEqual(self.timeline_post_ids(self.reader), [post.id])
+
+    def test_unfollow_trims_timeline(self):
+        """
+        Checks unfollowing a user removes their posts from the
+        follower's timeline.
+        """
+        follow = Follower.objects.create(
+            owner=self.reader, followed=self.author
+            )
+        Post.objects.create(owner=self.author, title='Test Post')
+        follow.delete()
+
+        self.assertEqual(self.timeline_post_ids(self.reader), [])
+
+    @override_settings(TIMELINE_FANOUT_LIMIT=0)
+    def test_widely_followed_author_not_fanned_out(self):
+        """
+        Checks authors over the fan out limit are not written to their
+        followers' timelines.
+        """
+        Follower.objects.create(owner=self.reader, followed=self.author)
+        Post.objects.create(owner=self.author, title='Test Post')
+
+        self.assertEqual(self.timeline_post_ids(self.reader), [])
+
+    def test_post_records_whether_it_was_fanned_out(self):
+        """
+        Checks posts are marked as read on fetch only while their
+        author is over the fan out limit.
+        """
+        with self.settings(TIMELINE_FANOUT_LIMIT=0):
+            Follower.objects.create(owner=self.reader, followed=self.author)
+            read_on_fetch = Post.objects.create(owner=self.author, title='1')
+        fanned_out = Post.objects.create(owner=self.author, title='2')
+
+        self.assertFalse(read_on_fetch.fanned_out)
+        self.assertTrue(fanned_out.fanned_out)
+        self.assertEqual(self.timeline_post_ids(self.reader), [fanned_out.id])
+
+    def test_rebuild_timelines_command(self):
+        """
+        Checks the rebuild_timelines command restores missing entries.
+        """
+        Follower.objects.create(owner=self.reader, followed=self.author)
+        post = Post.objects.create(owner=self.author, title='Test Post')
+        TimelineEntry.objects.all().delete()
+
+        call_command('rebuild_timelines', stdout=StringIO())
+
+        self.assertEqual(self.timeline_post_ids(self.reader), [post.id])
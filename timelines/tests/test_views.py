@@ -0,0 +1,108 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.test import override_settings
+from django.utils import timezone
+from django.contrib.auth.models import User
+from posts.models import Post
+from followers.models import Follower
+from ..models import TimelineEntry
+
+
+class TimelineListViewTest(APITestCase):
+    """
+    Test case for the feed view.
+    """
+    def setUp(self):
+        """
+        Set up test objects.
+        """
+        self.author = User.objects.create_user(
+            username='author', password='password1'
+            )
+        self.reader = User.objects.create_user(
+            username='reader', password='password2'
+            )
+        self.stranger = User.objects.create_user(
+            username='stranger', password='password3'
+            )
+        Follower.objects.create(owner=self.reader, followed=self.author)
+        self.post = Post.objects.create(owner=self.author, title='Followed')
+        Post.objects.create(owner=self.stranger, title='Not followed')
+
+    def test_feed_requires_login(self):
+        """
+        Checks logged out users cannot read a feed.
+        """
+        response = self.client.get('/feed/')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_feed_lists_followed_posts(self):
+        """
+        Checks the feed only contains posts from followed users.
+        """
+        self.client.force_authenticate(user=self.reader)
+        response = self.client.get('/feed/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [post['id'] for post in response.data['results']],
+            [self.post.id]
+        )
+
+    @override_settings(TIMELINE_FANOUT_LIMIT=0)
+    def test_feed_reads_widely_followed_authors(self):
+        """
+        Checks posts from authors over the fan out limit are still
+        included in the feed.
+        """
+        post = Post.objects.create(owner=self.author, title='Read on fetch')
+
+        self.client.force_authenticate(user=self.reader)
+        response = self.client.get('/feed/')
+
+        self.assertEqual(
+            [post['id'] for post in response.data['results']],
+            [post.id, self.post.id]
+        )
+
+    def test_feed_keeps_posts_after_author_drops_below_limit(self):
+        """
+        Checks a post made while its author was over the fan out limit
+        stays in the feed once they are back under it.
+        """
+        with self.settings(TIMELINE_FANOUT_LIMIT=0):
+            post = Post.objects.create(owner=self.author, title='Popular')
+
+        self.client.force_authenticate(user=self.reader)
+        response = self.client.get('/feed/')
+
+        self.assertEqual(
+            [post['id'] for post in response.data['results']],
+            [post.id, self.post.id]
+        )
+
+    def test_feed_cursor_merges_both_sources(self):
+        """
+        Checks following the 'next' links walks timeline and read on
+        fetch posts sharing a timestamp once each, newest first.
+        """
+        for i in range(12):
+            with self.settings(TIMELINE_FANOUT_LIMIT=i % 2 * 1000):
+                Post.objects.create(owner=self.author, title=f'Post {i}')
+        now = timezone.now()
+        Post.objects.update(created_on=now)
+        TimelineEntry.objects.update(created_on=now)
+
+        self.client.force_authenticate(user=self.reader)
+        response = self.client.get('/feed/')
+        post_ids = [post['id'] for post in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            post_ids += [post['id'] for post in response.data['results']]
+
+        expected = list(
+            Post.objects.filter(owner=self.author)
+            .order_by('-created_on', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(post_ids, expected)
@@ -0,0 +1,21 @@
+from rest_framework import generics, permissions
+from posts.models import Post
+from posts.serializers import PostSerializer
+from .pagination import TimelinePagination
+
+
+class TimelineList(generics.ListAPIView):
+    """
+    List the posts of the users the logged in user follows,
+    newest first, with cursor pagination.
+    Reads the user's precomputed timeline, plus the posts of followed
+    authors which were too widely followed to be fanned out on write.
+    """
+    serializer_class = PostSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TimelinePagination
+
+    def get_queryset(self):
+        return Post.objects.with_owner_profile().with_like_id(
+            self.request.user
+        )